@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark the check_log_vs_food_bank comparison engines.
+
+Generates a synthetic food bank and N years of daily logs, parses the logs
+once, then times the Decimal (--exact) and float (default) engines over the
+same parsed entries and checks that both report identical rows.
+
+Usage:
+    python3 benchmarks/bench_check_log_vs_food_bank.py [--years 5] [--dishes 300] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from generators import generate_food_bank, generate_logs  # noqa: E402
+from check_log_vs_food_bank import check_entries  # noqa: E402
+from food_bank_index import FoodBankIndex  # noqa: E402
+
+
+# Parsing is timed separately and is not what this benchmark compares
+LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def run_engine(parsed, food_bank, exact):
+    vectors = {}
+    discrepancies, manual = [], []
+    for log_file, data in parsed:
+        rows, items = check_entries(log_file, data, food_bank, exact, vectors)
+        discrepancies.extend(rows)
+        manual.extend(items)
+    return discrepancies, manual
+
+
+def best_of(repeat, fn):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=float, default=5, help="Years of daily logs to generate (default: 5)")
+    parser.add_argument("--dishes", type=int, default=300, help="Food-bank dishes to generate (default: 300)")
+    parser.add_argument("--items-per-day", type=int, default=12, help="Logged items per day (default: 12)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per engine; best is reported (default: 3)")
+    args = parser.parse_args()
+
+    days = int(args.years * 365.25)
+    with tempfile.TemporaryDirectory(prefix="bench-check-log-") as tmp:
+        tmp_path = Path(tmp)
+        print(f"Generating {args.dishes} dishes and {days} days of logs...")
+        dishes = generate_food_bank(tmp_path / "food-data-bank", args.dishes)
+        log_files = generate_logs(tmp_path / "logs", days, dishes, items_per_day=args.items_per_day)
+
+        food_bank = FoodBankIndex(tmp_path / "food-data-bank", use_cache=False)
+
+        start = time.perf_counter()
+        parsed = [(path, yaml.load(path.read_text(), Loader=LOADER)) for path in log_files]
+        parse_s = time.perf_counter() - start
+        items = sum(len(entry["items"]) for _, data in parsed for entry in data["entries"])
+
+        exact_s, exact_result = best_of(args.repeat, lambda: run_engine(parsed, food_bank, True))
+        fast_s, fast_result = best_of(args.repeat, lambda: run_engine(parsed, food_bank, False))
+
+    if fast_result != exact_result:
+        print("Error: float and Decimal engines reported different rows", file=sys.stderr)
+        return 1
+
+    print(f"Logs: {len(log_files)} files, {items} items, {len(exact_result[0])} discrepancies")
+    print(f"{'phase':<22} {'seconds':>10} {'items/s':>12}")
+    print(f"{'YAML parse':<22} {parse_s:>10.3f} {items / parse_s:>12,.0f}")
+    print(f"{'compare (Decimal)':<22} {exact_s:>10.3f} {items / exact_s:>12,.0f}")
+    print(f"{'compare (float)':<22} {fast_s:>10.3f} {items / fast_s:>12,.0f}")
+    print(f"Speedup: {exact_s / fast_s:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
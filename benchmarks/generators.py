@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic data for benchmarks.
+
+- generate_food_bank(): N dish files laid out like data/food-data-bank/
+  (<category_type>/<folder>/<dish_id>.md, schema_version 2, all 52 nutrients
+  in per_portion, energy and macro splits coherent enough to validate)
+- generate_logs(): M consecutive days of logs laid out like data/logs/
+  (YYYY-MM/DD.yaml, see data/logs/SCHEMA.md) referencing those dishes
+
+The same seed always produces byte-identical files, so timings from
+different runs and machines compare like for like.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from log_store import NUTRIENT_FIELDS  # noqa: E402
+
+# libyaml makes generating multi-year datasets practical; output is identical
+DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+SCHEMA_NUTRIENTS = [field for field in NUTRIENT_FIELDS if not field.startswith("alcohol_")]
+
+CATEGORY_FOLDERS = [
+    ("venues", "bench-cafe"),
+    ("venues", "bench-kitchen"),
+    ("venues", "bench-bistro"),
+    ("packaged", "bench-brand"),
+    ("generic", "ingredients"),
+]
+
+# Typical per-portion magnitude for each unit suffix
+UNIT_SCALE = {"kcal": 400.0, "g": 10.0, "mg": 100.0, "ug": 50.0}
+
+MEAL_HOURS = [8, 12, 16, 19, 21]
+
+
+def _micronutrients(rng: random.Random) -> dict:
+    values = {}
+    for field in SCHEMA_NUTRIENTS:
+        scale = UNIT_SCALE[field.rsplit("_", 1)[1]]
+        # ~15% of nutrients are genuinely zero in real entries
+        values[field] = 0 if rng.random() < 0.15 else round(rng.uniform(0.01, 2.0) * scale, 2)
+    return values
+
+
+def _per_portion(rng: random.Random) -> dict:
+    """All 52 schema nutrients, with macros that pass validate_data_bank.check_block."""
+    values = _micronutrients(rng)
+
+    protein = round(rng.uniform(1, 40), 1)
+    fat = round(rng.uniform(1, 30), 1)
+    carbs_available = round(rng.uniform(1, 80), 1)
+    fiber = round(rng.uniform(0.5, 10), 1)
+    polyols = 0.0
+    soluble = round(fiber * 0.3, 1)
+    values.update({
+        "protein_g": protein,
+        "fat_g": fat,
+        "sat_fat_g": round(fat * 0.37, 1),
+        "mufa_g": round(fat * 0.41, 1),
+        "pufa_g": round(fat * 0.2, 1),
+        "trans_fat_g": round(fat * 0.01, 2),
+        "omega3_ala_g": round(fat * 0.02, 2),
+        "omega3_epa_mg": round(fat * 2, 1),
+        "omega3_dha_mg": round(fat * 3, 1),
+        "omega6_la_g": round(fat * 0.12, 2),
+        "carbs_available_g": carbs_available,
+        "sugar_g": round(carbs_available * rng.uniform(0, 0.5), 1),
+        "fiber_total_g": fiber,
+        "fiber_soluble_g": soluble,
+        "fiber_insoluble_g": round(fiber - soluble, 1),
+        "polyols_g": polyols,
+        "carbs_total_g": round(carbs_available + fiber + polyols, 1),
+        "energy_kcal": round(4 * protein + 9 * fat + 4 * carbs_available + 2 * fiber, 0),
+    })
+    return {field: values[field] for field in SCHEMA_NUTRIENTS}
+
+
+def generate_food_bank(root: Path, n_dishes: int, seed: int = 0) -> List[dict]:
+    """Write n_dishes dish files under root; return their parsed YAML payloads."""
+    rng = random.Random(seed)
+    dishes = []
+    for i in range(n_dishes):
+        category_type, folder = CATEGORY_FOLDERS[i % len(CATEGORY_FOLDERS)]
+        dish_id = f"bench_dish_{i:05d}_v1"
+        data = {
+            "id": dish_id,
+            "schema_version": 2,
+            "version": 1,
+            "last_verified": date(2025, 1, 1),
+            "source": {"venue": folder, "menu_page": None, "evidence": ["synthetic"]},
+            "aliases": None,
+            "category": "main" if category_type == "venues" else "ingredient",
+            "portion": {
+                "description": "synthetic portion",
+                "est_weight_g": rng.choice([30, 50, 100, 150, 250, 400]),
+                "notes": None,
+            },
+            "assumptions": {"salt_scheme": "normal", "oil_type": None, "prep": None},
+            "per_portion": _per_portion(rng),
+            "derived": {"salt_g_from_sodium": "= per_portion.sodium_mg * 2.5 / 1000"},
+            "quality": {"confidence": "medium", "gaps": None},
+            "notes": ["Synthetic benchmark dish"],
+            "change_log": [],
+        }
+        path = root / category_type / folder / f"{dish_id}.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        body = yaml.dump(data, Dumper=DUMPER, sort_keys=False, allow_unicode=True)
+        path.write_text(f"## Bench Dish {i} ({folder})\n\n```yaml\n{body}```\n", encoding="utf-8")
+        dishes.append(data)
+    return dishes
+
+
+def _log_item(rng: random.Random, dish: Optional[dict], zero_rate: float) -> dict:
+    if dish is None:
+        # Ad-hoc item without a food_bank_id
+        nutrition = {field: round(value * 0.5, 2) for field, value in _micronutrients(rng).items()}
+        return {
+            "name": f"Ad-hoc item {rng.randrange(10**6)}",
+            "food_bank_id": None,
+            "quantity": 1,
+            "unit": "portion",
+            "nutrition": nutrition,
+        }
+
+    if rng.random() < 0.3:
+        quantity, unit = rng.choice([25, 60, 120, 200]), "g"
+        factor = quantity / dish["portion"]["est_weight_g"]
+    else:
+        quantity, unit = rng.choice([1, 1, 1, 0.5, 2]), "portion"
+        factor = quantity
+    nutrition = {field: round(value * factor, 4) for field, value in dish["per_portion"].items()}
+    # A small share of logged items carry zeroed nutrients (discrepancies)
+    for field in SCHEMA_NUTRIENTS:
+        if rng.random() < zero_rate:
+            nutrition[field] = 0
+    return {
+        "name": f"Bench Dish {dish['id']}",
+        "food_bank_id": dish["id"],
+        "quantity": quantity,
+        "unit": unit,
+        "nutrition": nutrition,
+    }
+
+
+def generate_logs(
+    logs_dir: Path,
+    days: int,
+    dishes: List[dict],
+    start: date = date(2021, 1, 1),
+    items_per_day: int = 12,
+    seed: int = 0,
+    zero_rate: float = 0.005,
+) -> List[Path]:
+    """Write `days` consecutive daily logs under logs_dir; return their paths."""
+    rng = random.Random(seed)
+    paths = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        entries = []
+        remaining = items_per_day
+        for hour in MEAL_HOURS:
+            if remaining <= 0:
+                break
+            count = min(remaining, rng.randint(1, 4))
+            remaining -= count
+            timestamp = datetime(day.year, day.month, day.day, hour, rng.randrange(60), tzinfo=timezone.utc)
+            # Distinct dishes per entry, as repeated servings are logged via quantity
+            items = [
+                _log_item(rng, None if rng.random() < 0.05 else dish, zero_rate)
+                for dish in rng.sample(dishes, count)
+            ]
+            entries.append({"timestamp": timestamp.isoformat(), "items": items})
+
+        data = {
+            "date": day,
+            "day_type": "training" if rng.random() < 0.4 else "rest",
+            "entries": entries,
+        }
+        path = logs_dir / f"{day.year:04d}-{day.month:02d}" / f"{day.day:02d}.yaml"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(yaml.dump(data, Dumper=DUMPER, sort_keys=False, allow_unicode=True), encoding="utf-8")
+        paths.append(path)
+    return paths
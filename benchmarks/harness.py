@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Timing and memory harness for the benchmark suite.
+
+Each case is measured twice over:
+- wall time: best of `repeat` untraced runs (time.perf_counter)
+- peak memory: one extra run under tracemalloc (peak Python allocations)
+
+Results are compared against benchmarks/baselines.json, keyed by dataset
+size and case name. A case regresses when it is slower than
+`time_tolerance` x baseline (and by more than MIN_SECONDS_DELTA) or
+allocates more than `memory_tolerance` x baseline. Timings are
+machine-dependent; refresh the baselines with --update-baselines when
+moving to different hardware.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+BASELINES_PATH = Path(__file__).resolve().parent / "baselines.json"
+
+TIME_TOLERANCE = 1.5
+MEMORY_TOLERANCE = 1.25
+# Millisecond-scale cases are too noisy for a ratio alone
+MIN_SECONDS_DELTA = 0.05
+
+
+@dataclass
+class Measurement:
+    name: str
+    seconds: float
+    peak_kb: float
+
+
+@dataclass
+class Regression:
+    name: str
+    metric: str
+    baseline: float
+    measured: float
+
+    @property
+    def ratio(self) -> float:
+        return self.measured / self.baseline if self.baseline else float("inf")
+
+
+def measure(name: str, fn: Callable[[], object], repeat: int = 3,
+            setup: Optional[Callable[[], None]] = None) -> Measurement:
+    """Time fn() (best of `repeat`) and record its peak traced allocation.
+
+    setup, if given, runs before every call and is not timed (e.g. to reset
+    an output directory or drop a cache).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    if setup:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Measurement(name, best, peak / 1024)
+
+
+def load_baselines(path: Path = BASELINES_PATH) -> Dict[str, Dict[str, dict]]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_baselines(baselines: Dict[str, Dict[str, dict]], path: Path = BASELINES_PATH) -> None:
+    path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def record_baselines(baselines: Dict[str, Dict[str, dict]], size: str,
+                     measurements: List[Measurement]) -> Dict[str, Dict[str, dict]]:
+    """Return baselines with the given size's entries replaced by measurements."""
+    updated = dict(baselines)
+    updated[size] = {
+        m.name: {"seconds": round(m.seconds, 4), "peak_kb": round(m.peak_kb, 1)}
+        for m in measurements
+    }
+    return updated
+
+
+def find_regressions(measurements: List[Measurement], baseline: Dict[str, dict],
+                     time_tolerance: float = TIME_TOLERANCE,
+                     memory_tolerance: float = MEMORY_TOLERANCE) -> List[Regression]:
+    """Compare measurements against one size's baselines; cases without a baseline are skipped."""
+    regressions = []
+    for m in measurements:
+        expected = baseline.get(m.name)
+        if not expected:
+            continue
+        if (m.seconds > expected["seconds"] * time_tolerance
+                and m.seconds - expected["seconds"] > MIN_SECONDS_DELTA):
+            regressions.append(Regression(m.name, "seconds", expected["seconds"], m.seconds))
+        if m.peak_kb > expected["peak_kb"] * memory_tolerance:
+            regressions.append(Regression(m.name, "peak_kb", expected["peak_kb"], m.peak_kb))
+    return regressions
+
+
+def format_table(measurements: List[Measurement], baseline: Dict[str, dict]) -> str:
+    lines = [f"{'case':<34} {'seconds':>9} {'vs base':>8} {'peak KiB':>11} {'vs base':>8}"]
+    for m in measurements:
+        expected = baseline.get(m.name)
+        time_ratio = f"{m.seconds / expected['seconds']:.2f}x" if expected and expected["seconds"] else "-"
+        mem_ratio = f"{m.peak_kb / expected['peak_kb']:.2f}x" if expected and expected["peak_kb"] else "-"
+        lines.append(f"{m.name:<34} {m.seconds:>9.3f} {time_ratio:>8} {m.peak_kb:>11,.0f} {mem_ratio:>8}")
+    return "\n".join(lines)
+
+
+def to_json(size: str, measurements: List[Measurement], regressions: List[Regression]) -> str:
+    return json.dumps({
+        "size": size,
+        "measurements": [asdict(m) for m in measurements],
+        "regressions": [dict(asdict(r), ratio=round(r.ratio, 3)) for r in regressions],
+    }, indent=2)
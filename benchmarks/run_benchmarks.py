@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the data-bank and log-processing entry points.
+
+Generates a deterministic synthetic food bank and daily logs (see
+generators.py), then times the core of each script the way its main()
+drives it, on the same dataset:
+
+- validate_data_bank: cold scan + check_block over every dish, and the
+  same with a warm compiled index
+- generate_index: full rebuild, and an --incremental run after one dish
+  file changes
+- monthly_analysis: analyze_month + generate_markdown_report for every
+  month in the dataset
+- export_to_healthkit_csv: per-item rows, per-day totals and both CSVs
+- merge_food_logs: parse and merge three overlapping branch versions of
+  every daily log
+- search_food_bank: load the persisted search index and look up every
+  dish by a misspelled word of its id
+
+Results are compared against baselines.json (see harness.py); the exit
+code is 1 when any case regresses.
+
+Usage:
+    python3 benchmarks/run_benchmarks.py [--size small|medium|large] [--only NAME]
+    python3 benchmarks/run_benchmarks.py --size medium --update-baselines
+    python3 benchmarks/run_benchmarks.py --json > results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from generators import DUMPER, generate_food_bank, generate_logs  # noqa: E402
+from harness import (  # noqa: E402
+    find_regressions,
+    format_table,
+    load_baselines,
+    measure,
+    record_baselines,
+    save_baselines,
+    to_json,
+)
+
+import export_to_healthkit_csv  # noqa: E402
+import generate_index  # noqa: E402
+import merge_food_logs  # noqa: E402
+import monthly_analysis  # noqa: E402
+import search_food_bank  # noqa: E402
+import validate_data_bank  # noqa: E402
+from food_bank_index import FoodBankIndex, default_cache_path  # noqa: E402
+from log_store import log_date_for  # noqa: E402
+
+# Dataset sizes: (dishes, days of logs)
+SIZES = {
+    "small": (100, 31),
+    "medium": (500, 365),
+    "large": (2000, 5 * 365),
+}
+
+MERGE_BRANCHES = 3
+
+
+class Dataset:
+    """Paths of one generated dataset inside a scratch directory."""
+
+    def __init__(self, root: Path, n_dishes: int, days: int):
+        self.root = root
+        self.bank_dir = root / "food-data-bank"
+        self.logs_dir = root / "logs"
+        self.output_dir = root / "out"
+        self.dishes = generate_food_bank(self.bank_dir, n_dishes)
+        self.log_files = generate_logs(self.logs_dir, days, self.dishes)
+        self.output_dir.mkdir()
+
+    @property
+    def months(self) -> List[Tuple[int, int]]:
+        return sorted({(int(p.parent.name[:4]), int(p.parent.name[5:])) for p in self.log_files})
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the progress output the scripts print while they work."""
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+
+# --- validate_data_bank ---------------------------------------------------
+
+def validate_all(ds: Dataset, use_cache: bool):
+    def run():
+        blocks = validate_data_bank.scan_data_bank(ds.bank_dir, use_cache=use_cache)
+        return [validate_data_bank.check_block(y, filepath) for filepath, y in blocks]
+    return run
+
+
+# --- generate_index -------------------------------------------------------
+
+def index_cache_path(ds: Dataset) -> Path:
+    return default_cache_path(ds.bank_dir).with_name(generate_index.INDEX_CACHE_NAME)
+
+
+def index_full(ds: Dataset):
+    index_path = ds.root / "food-data-bank-index.md"
+
+    def run():
+        with quiet():
+            dishes, _ = generate_index.scan_data_bank(ds.bank_dir, use_cache=False)
+            generate_index.generate_index_file(dishes, index_path)
+    return run
+
+
+def index_incremental(ds: Dataset):
+    index_path = ds.root / "food-data-bank-index.md"
+    touched = sorted(ds.bank_dir.rglob("*.md"))[0]
+    original = touched.read_text(encoding="utf-8")
+
+    def setup():
+        # Bring the cache and index up to date, then change one dish
+        touched.write_text(original, encoding="utf-8")
+        index = FoodBankIndex(ds.bank_dir, cache_path=index_cache_path(ds))
+        with quiet():
+            generate_index.generate_index_file(generate_index.dishes_from_index(index)[0], index_path)
+        touched.write_text(original.replace("synthetic portion", "synthetic portion (edited)"), encoding="utf-8")
+        stat = touched.stat()
+        os.utime(touched, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def run():
+        index = FoodBankIndex(ds.bank_dir, cache_path=index_cache_path(ds))
+        dishes, _ = generate_index.dishes_from_index(index)
+        changes = index.changes
+        with quiet():
+            generate_index.update_index_file(
+                dishes, index_path,
+                generate_index.changed_categories_for(changes.added + changes.removed + changes.modified),
+            )
+    return run, setup
+
+
+# --- monthly_analysis -----------------------------------------------------
+
+def monthly_reports(ds: Dataset):
+    def run():
+        saved = monthly_analysis.LOGS_DIR
+        monthly_analysis.LOGS_DIR = ds.logs_dir
+        try:
+            with quiet():
+                rollup = monthly_analysis.DailyRollup(ds.logs_dir)
+                profile = monthly_analysis.load_health_profile()
+                for year, month in ds.months:
+                    monthly_analysis.generate_markdown_report(
+                        monthly_analysis.analyze_month(year, month, rollup, profile))
+        finally:
+            monthly_analysis.LOGS_DIR = saved
+    return run
+
+
+# --- export_to_healthkit_csv ----------------------------------------------
+
+def healthkit_export(ds: Dataset):
+    def run():
+        log_files = export_to_healthkit_csv.locate_log_files(
+            ds.logs_dir, log_date_for(ds.log_files[0]), log_date_for(ds.log_files[-1])
+        )
+        with export_to_healthkit_csv.StreamingExport(
+            ds.output_dir / "per_item_nutrition.csv", ds.output_dir / "per_day_nutrition.csv"
+        ) as export:
+            for log_file in log_files:
+                export.add_log(log_date_for(log_file), export_to_healthkit_csv.process_log_file(log_file))
+    return run
+
+
+# --- merge_food_logs ------------------------------------------------------
+
+def branch_versions(ds: Dataset) -> List[Tuple[str, Dict[str, str]]]:
+    """Split every daily log across MERGE_BRANCHES branches.
+
+    Each branch gets every MERGE_BRANCHES-th entry plus the day's first
+    entry, so all branches overlap and the duplicate-timestamp path runs.
+    """
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    versions = []
+    for log_file in ds.log_files:
+        data = yaml.load(log_file.read_text(encoding="utf-8"), Loader=loader)
+        data["date"] = str(data["date"])
+        entries = data["entries"]
+        texts = {}
+        for b in range(MERGE_BRANCHES):
+            part = [entries[0]] + [e for i, e in enumerate(entries) if i and i % MERGE_BRANCHES == b]
+            texts[f"origin/bench-{b}"] = yaml.dump(dict(data, entries=part), Dumper=DUMPER, sort_keys=False)
+        versions.append((str(log_file.relative_to(ds.root)), texts))
+    return versions
+
+
+def merge_all(ds: Dataset):
+    versions = branch_versions(ds)
+
+    def run():
+        with quiet():
+            for file_path, texts in versions:
+                files_by_branch = {branch: yaml.safe_load(text) for branch, text in texts.items()}
+                merge_food_logs.merge_log_files(files_by_branch, file_path)
+    return run
+
+
+# --- search_food_bank -----------------------------------------------------
+
+def search_queries(ds: Dataset):
+    # Drop one letter from the longest word of each id so fuzzy matching runs
+    queries = []
+    for dish in ds.dishes:
+        word = max(dish["id"].split("_"), key=len)
+        queries.append(word[:1] + word[2:] if len(word) > 3 else word)
+
+    def run():
+        index = search_food_bank.load_search_index(ds.bank_dir)
+        for query in queries:
+            index.search(query)
+    return run, lambda: search_food_bank.load_search_index(ds.bank_dir)
+
+
+# --- driver ---------------------------------------------------------------
+
+def build_cases(ds: Dataset) -> List[Tuple[str, Callable, Callable]]:
+    """(name, fn, setup) for every case; setup may be None."""
+    incremental, incremental_setup = index_incremental(ds)
+    search, search_setup = search_queries(ds)
+    return [
+        ("validate_data_bank/cold", validate_all(ds, use_cache=False), None),
+        ("validate_data_bank/warm", validate_all(ds, use_cache=True), lambda: FoodBankIndex(ds.bank_dir)),
+        ("generate_index/full", index_full(ds), None),
+        ("generate_index/incremental", incremental, incremental_setup),
+        ("monthly_analysis/all_months", monthly_reports(ds), None),
+        ("export_to_healthkit_csv/all", healthkit_export(ds), None),
+        ("merge_food_logs/3_branches", merge_all(ds), None),
+        ("search_food_bank/warm_queries", search, search_setup),
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=sorted(SIZES), default="small", help="Dataset size (default: small)")
+    parser.add_argument("--only", action="append", default=[], metavar="NAME",
+                        help="Run only cases whose name starts with NAME (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case; best is kept (default: 3)")
+    parser.add_argument("--update-baselines", action="store_true", help="Store these results as the new baselines")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON instead of a table")
+    args = parser.parse_args()
+
+    n_dishes, days = SIZES[args.size]
+    baselines = load_baselines()
+    baseline = baselines.get(args.size, {})
+
+    with tempfile.TemporaryDirectory(prefix="nutrition-bench-") as tmp:
+        print(f"Generating {n_dishes} dishes and {days} days of logs...", file=sys.stderr)
+        ds = Dataset(Path(tmp), n_dishes, days)
+
+        measurements = []
+        for name, fn, setup in build_cases(ds):
+            if args.only and not any(name.startswith(prefix) for prefix in args.only):
+                continue
+            print(f"  {name}", file=sys.stderr)
+            measurements.append(measure(name, fn, repeat=args.repeat, setup=setup))
+
+    regressions = find_regressions(measurements, baseline)
+
+    if args.json:
+        print(to_json(args.size, measurements, regressions))
+    else:
+        print(format_table(measurements, baseline))
+
+    if args.update_baselines:
+        if args.only:
+            merged = dict(baseline)
+            merged.update(record_baselines({}, args.size, measurements)[args.size])
+            baselines[args.size] = merged
+        else:
+            baselines = record_baselines(baselines, args.size, measurements)
+        save_baselines(baselines)
+        print(f"Baselines updated for size '{args.size}'", file=sys.stderr)
+        return 0
+
+    if regressions:
+        print("\nRegressions:", file=sys.stderr)
+        for r in regressions:
+            print(f"  {r.name}: {r.metric} {r.measured:,.3f} vs baseline {r.baseline:,.3f} ({r.ratio:.2f}x)",
+                  file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
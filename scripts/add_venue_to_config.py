@@ -13,6 +13,8 @@ import re
 import tempfile
 import shutil
 
+import profiling
+
 
 def validate_folder_name(folder_name):
     """Validate folder name is safe and follows conventions."""
@@ -140,7 +142,9 @@ Examples:
     ap.add_argument("--type", default="",
                     help="Type/category (for packaged products: sports_nutrition, dairy, etc.)")
 
+    profiling.add_profile_argument(ap)
     args = ap.parse_args()
+    profiling.setup("add_venue_to_config", args.profile)
 
     add_venue(
         args.category_type,
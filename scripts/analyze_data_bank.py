@@ -4,11 +4,14 @@ Analyze food-data-bank.md to extract all dishes with their venues.
 This helps us understand the structure before migration.
 """
 
+import argparse
 import re
 import yaml
 from pathlib import Path
 from collections import defaultdict
 
+import profiling
+
 
 def parse_yaml_blocks(text):
     """Extract all YAML blocks from the markdown file."""
@@ -56,6 +59,11 @@ def analyze_venues(blocks):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="List the dishes in food-data-bank.md by venue")
+    profiling.add_profile_argument(parser)
+    args = parser.parse_args()
+    profiling.setup("analyze_data_bank", args.profile)
+
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
     data_bank_path = project_root / 'data' / 'food-data-bank.md'
@@ -17,12 +17,12 @@ from __future__ import annotations
 
 import argparse
 import math
-import re
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Sequence
 
-import yaml
+import profiling
+from food_bank_index import FoodBankIndex
 
 EXPECTED_FIELDS: Sequence[str] = [
     # Macros & Energy
@@ -105,14 +105,6 @@ class AtwaterIssue:
     delta: float
 
 
-def extract_yaml_block(path: Path) -> dict:
-    text = path.read_text(encoding='utf-8')
-    match = re.search(r"```yaml\s*(.*?)```", text, flags=re.S)
-    if not match:
-        raise ValueError(f"No yaml block in {path}")
-    return yaml.safe_load(match.group(1))
-
-
 def is_number(value) -> bool:
     if isinstance(value, (int, float)):
         return math.isfinite(value)
@@ -145,28 +137,21 @@ def compute_atwater(per: Dict[str, float], derived: Dict[str, float] | None = No
     )
 
 
-def audit_food_bank(root: Path, tolerance: float = 5.0):
+def audit_food_bank(root: Path, tolerance: float = 5.0, use_cache: bool = True):
     missing_reports: List[MissingFields] = []
     atwater_reports: List[AtwaterIssue] = []
     skipped_files = 0
 
-    for md_file in sorted(root.rglob("*.md")):
-        try:
-            data = extract_yaml_block(md_file)
-        except (ValueError, yaml.YAMLError) as exc:
-            print(f"[WARN] Skipping {md_file}: YAML parsing failed - {exc}")
-            skipped_files += 1
-            continue
-        except FileNotFoundError:
-            print(f"[WARN] Skipping {md_file}: File not found")
+    index = FoodBankIndex(root, use_cache=use_cache)
+    for record in index.records:
+        md_file = record.path
+        if record.error:
+            print(f"[WARN] Skipping {md_file}: YAML parsing failed - {record.error}")
             skipped_files += 1
             continue
-        except PermissionError:
-            print(f"[ERROR] Skipping {md_file}: Permission denied")
-            skipped_files += 1
-            continue
-        except Exception as exc:
-            print(f"[ERROR] Unexpected error in {md_file}: {type(exc).__name__}: {exc}")
+        data = record.data
+        if not isinstance(data, dict):
+            print(f"[WARN] Skipping {md_file}: YAML block is not a mapping")
             skipped_files += 1
             continue
 
@@ -246,11 +231,20 @@ def main():
         default=5.0,
         help="Allowed kcal difference between recorded and computed energy.",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse every food-bank file instead of reusing the compiled index.",
+    )
+    profiling.add_profile_argument(parser)
     args = parser.parse_args()
+    profiling.setup("audit_food_bank", args.profile)
 
-    missing, atwater = audit_food_bank(args.root, args.tolerance)
-    print(render_missing(missing))
-    print(render_atwater(atwater))
+    with profiling.phase("compute"):
+        missing, atwater = audit_food_bank(args.root, args.tolerance, use_cache=not args.no_cache)
+    with profiling.phase("render"):
+        print(render_missing(missing))
+        print(render_atwater(atwater))
 
 
 if __name__ == "__main__":
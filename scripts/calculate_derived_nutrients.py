@@ -28,6 +28,8 @@ from typing import Tuple, Optional
 
 import yaml
 
+import profiling
+
 
 def calculate_chloride(sodium_mg: float) -> float:
     """
@@ -273,7 +275,9 @@ def main():
     parser.add_argument('--file', type=Path,
                         help='Process single file instead of entire food bank')
 
+    profiling.add_profile_argument(parser)
     args = parser.parse_args()
+    profiling.setup("calculate_derived_nutrients", args.profile)
 
     # Determine files to process
     if args.file:
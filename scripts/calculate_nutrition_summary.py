@@ -16,6 +16,9 @@ from pathlib import Path
 from collections import defaultdict
 from datetime import datetime, timedelta
 
+import profiling
+from daily_rollup import DailyRollup
+
 
 def load_health_profile_targets():
     """Load target values from health-profile.yaml."""
@@ -71,8 +74,15 @@ parser.add_argument(
     action='store_true',
     help='Exclude today from analysis (useful when current day is incomplete)'
 )
+parser.add_argument(
+    '--no-cache',
+    action='store_true',
+    help='Re-parse every log file instead of reusing the daily rollup'
+)
+profiling.add_profile_argument(parser)
 
 args = parser.parse_args()
+profiling.setup('calculate_nutrition_summary', args.profile)
 num_days_to_analyze = args.days
 
 # Validate range (1-365 days)
@@ -94,99 +104,34 @@ else:
     cutoff_date = today
     include_today_status = True
 
-# Find all log files
-log_dir = Path("data/logs")
-log_files_with_dates = []
-
-for year_month_dir in sorted(log_dir.iterdir()):
-    if not year_month_dir.is_dir():
-        continue
-
-    for log_file in year_month_dir.glob("*.yaml"):
-        # Parse date from file structure: data/logs/YYYY-MM/DD.yaml
-        try:
-            year_month = year_month_dir.name  # e.g., "2025-10"
-            day = log_file.stem  # e.g., "30"
-            file_date = datetime.strptime(f"{year_month}-{day}", "%Y-%m-%d").date()
-
-            # Include up to cutoff date (today or yesterday, depending on flag)
-            if file_date <= cutoff_date:
-                log_files_with_dates.append((file_date, log_file))
-        except ValueError:
-            continue  # Skip files that don't match expected format
+# Load the per-day rollup (only log files changed since the last run are re-parsed)
+rollup = DailyRollup(Path("data/logs"), use_cache=not args.no_cache)
 
-# Sort by date (most recent first) and take last X days
-log_files_with_dates.sort(reverse=True)
-log_files_to_process = log_files_with_dates[:num_days_to_analyze]
+# Take the last X days up to the cutoff date
+days_to_process = rollup.between(end=cutoff_date)[-num_days_to_analyze:]
 
-# Sort chronologically for processing
-log_files_to_process.sort()
-
-if not log_files_to_process:
+if not days_to_process:
     print("No log files found to process.")
     sys.exit(1)
 
 # Initialize totals dictionary
 totals = defaultdict(float)
-counts = defaultdict(int)  # Track non-null counts for averaging
 day_types = []  # Track day types for accurate target calculation
 dates_processed = []
 
-# Process each log file
-for file_date, log_file in log_files_to_process:
-    try:
-        with open(log_file, 'r') as f:
-            data = yaml.safe_load(f)
-
-        # Validate YAML structure
-        if not isinstance(data, dict):
-            print(f"Warning: Skipping {log_file}: Invalid YAML structure (expected dict, got {type(data).__name__})", file=sys.stderr)
-            continue
-
-        # Track day type and date
-        day_types.append(data.get('day_type', 'rest'))
-        dates_processed.append(file_date)
-
-        # Process each entry
-        entries = data.get('entries', [])
-        if not isinstance(entries, list):
-            print(f"Warning: Skipping entries in {log_file}: 'entries' must be a list (got {type(entries).__name__})", file=sys.stderr)
-            continue
-
-        for entry in entries:
-            if not isinstance(entry, dict):
-                print(f"Warning: Skipping invalid entry in {log_file}: expected dict, got {type(entry).__name__}", file=sys.stderr)
-                continue
-
-            # Process each item in the entry
-            items = entry.get('items', [])
-            if not isinstance(items, list):
-                print(f"Warning: Skipping items in entry from {log_file}: 'items' must be a list", file=sys.stderr)
-                continue
-
-            for item in items:
-                if not isinstance(item, dict):
-                    print(f"Warning: Skipping invalid item in {log_file}: expected dict, got {type(item).__name__}", file=sys.stderr)
-                    continue
-
-                nutrition = item.get('nutrition', {})
-                if not isinstance(nutrition, dict):
-                    print(f"Warning: Skipping invalid nutrition data in {log_file}: expected dict, got {type(nutrition).__name__}", file=sys.stderr)
-                    continue
-
-                # Sum up all nutrition values
-                for key, value in nutrition.items():
-                    if value is not None:
-                        totals[key] += value
-                        counts[key] += 1
-
-    except yaml.YAMLError as e:
-        print(f"Warning: Failed to parse {log_file}: {e}", file=sys.stderr)
-        continue
-    except Exception as e:
-        print(f"Warning: Error processing {log_file}: {e}", file=sys.stderr)
+# Sum each day's rolled-up totals
+for day in days_to_process:
+    if day.error:
+        print(f"Warning: Skipping {day.path}: {day.error}", file=sys.stderr)
         continue
 
+    # Track day type and date
+    day_types.append(day.day_type or 'rest')
+    dates_processed.append(day.date)
+
+    for key, value in day.totals.items():
+        totals[key] += value
+
 # Check if any valid data was processed
 if not dates_processed:
     print("Error: No valid log data found to process after validation.", file=sys.stderr)
@@ -12,15 +12,22 @@ Features:
 from __future__ import annotations
 
 import argparse
-import re
-from collections import defaultdict
-from dataclasses import dataclass
+import json
+import os
+import sys
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from decimal import Decimal, getcontext
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence
+from typing import Deque, Dict, Iterator, List, Optional, Sequence
 
 import yaml
 
+import profiling
+from food_bank_index import FoodBankIndex
+from log_store import LogStore
+
 getcontext().prec = 28
 
 EXPECTED_FIELDS: Sequence[str] = [
@@ -135,51 +142,6 @@ class ManualItem:
     notes: Optional[str]
 
 
-class FoodBankIndex:
-    """Lazy loader + index for food-bank entries."""
-
-    def __init__(self, root: Path) -> None:
-        self.root = root
-        self._index: Dict[str, Path] = {}
-        self._cache: Dict[str, dict] = {}
-        self._build_index()
-
-    def _build_index(self) -> None:
-        for path in self.root.rglob("*.md"):
-            entry_id = self._extract_id(path)
-            if entry_id:
-                self._index[entry_id] = path
-
-    @staticmethod
-    def _extract_id(path: Path) -> Optional[str]:
-        inside_block = False
-        with path.open("r") as handle:
-            for line in handle:
-                stripped = line.strip()
-                if stripped.startswith("```yaml"):
-                    inside_block = True
-                    continue
-                if inside_block and stripped.startswith("```"):
-                    break
-                if inside_block and stripped.startswith("id:"):
-                    return stripped.split(":", 1)[1].strip()
-        return None
-
-    def get(self, entry_id: str) -> dict:
-        if entry_id in self._cache:
-            return self._cache[entry_id]
-        path = self._index.get(entry_id)
-        if not path:
-            raise KeyError(f"Food bank entry '{entry_id}' not found.")
-        text = path.read_text()
-        match = re.search(r"```yaml\s*(.*?)```", text, re.S)
-        if not match:
-            raise ValueError(f"No YAML payload found in {path}.")
-        data = yaml.safe_load(match.group(1))
-        self._cache[entry_id] = data
-        return data
-
-
 def decimal_value(raw: Optional[float]) -> Decimal:
     if raw is None:
         return Decimal("0")
@@ -197,70 +159,125 @@ def scale_factor(quantity: Decimal, unit: str, portion_weight: Optional[float])
     return quantity
 
 
-def find_discrepancies(
-    logs_dir: Path, food_bank: FoodBankIndex
+# Float fast path: skip bank values below the threshold, shrunk by a relative
+# 1e-9 so values that are exactly DISCREPANCY_THRESHOLD in Decimal (and may
+# round just under it in binary floating point) are still reported. The two
+# engines can only disagree on values within that band of the threshold.
+FLOAT_THRESHOLD = float(DISCREPANCY_THRESHOLD) * (1 - 1e-9)
+
+# food_bank_id -> [(field, per-portion value)] for the non-zero checked fields
+BankVectors = Dict[str, List[tuple]]
+
+
+def float_value(raw) -> float:
+    if raw is None:
+        return 0.0
+    return float(raw)
+
+
+def float_scale_factor(quantity: float, unit: str, portion_weight: Optional[float]) -> float:
+    if unit in MASS_UNITS:
+        if not portion_weight:
+            raise ValueError("Portion weight missing for gram-based unit.")
+        portion = float(portion_weight)
+        if portion == 0:
+            raise ValueError("Portion weight cannot be zero for gram-based unit.")
+        return quantity / portion
+    return quantity
+
+
+def bank_vector(per_portion: dict) -> List[tuple]:
+    """Per-portion (field, value) pairs worth comparing; zero fields can never be flagged."""
+    vector = []
+    for field in EXPECTED_FIELDS:
+        if field in OPTIONAL_FIELDS:
+            continue
+        value = float_value(per_portion.get(field))
+        if value != 0:
+            vector.append((field, value))
+    return vector
+
+
+def check_entries(
+    log_file: Path,
+    data: dict,
+    food_bank: FoodBankIndex,
+    exact: bool = False,
+    vectors: Optional[BankVectors] = None,
 ) -> tuple[List[Discrepancy], List[ManualItem]]:
+    """Check the parsed entries of one log file against the food bank.
+
+    The default engine compares plain floats against FLOAT_THRESHOLD and
+    only builds Decimals for the (rare) rows it reports, so the printed
+    values match exact mode. exact=True runs every comparison in Decimal.
+    """
     discrepancy_rows: List[Discrepancy] = []
     manual_rows: List[ManualItem] = []
-
-    log_files = sorted(p for p in logs_dir.rglob("*.yaml") if p.name != "SCHEMA.md")
-    for log_file in log_files:
-        data = yaml.safe_load(log_file.read_text())
-        entries = data.get("entries") or []
-        for entry in entries:
-            timestamp = entry.get("timestamp", "unknown")
-            entry_notes = entry.get("notes")
-            for item in entry.get("items", []) or []:
-                name = item.get("name", "unknown")
-                nutrition = item.get("nutrition") or {}
-                quantity_raw = item.get("quantity", 0)
+    if vectors is None:
+        vectors = {}
+
+    entries = data.get("entries") or []
+    for entry in entries:
+        timestamp = entry.get("timestamp", "unknown")
+        entry_notes = entry.get("notes")
+        for item in entry.get("items", []) or []:
+            name = item.get("name", "unknown")
+            nutrition = item.get("nutrition") or {}
+            quantity_raw = item.get("quantity", 0)
+            try:
+                quantity = Decimal(str(quantity_raw))
+            except (ValueError, TypeError, ArithmeticError):
+                quantity = Decimal("0")
+            unit = str(item.get("unit", "")).lower()
+            food_id = item.get("food_bank_id")
+            if food_id:
                 try:
-                    quantity = Decimal(str(quantity_raw))
-                except (ValueError, TypeError, ArithmeticError):
-                    quantity = Decimal("0")
-                unit = str(item.get("unit", "")).lower()
-                food_id = item.get("food_bank_id")
-                if food_id:
-                    try:
-                        fb_entry = food_bank.get(food_id)
-                    except (KeyError, ValueError, FileNotFoundError) as exc:
-                        discrepancy_rows.append(
-                            Discrepancy(
-                                log_file,
-                                timestamp,
-                                name,
-                                "food_bank_lookup",
-                                "n/a",
-                                f"Missing entry: {exc}",
-                            )
+                    fb_entry = food_bank.get(food_id)
+                except (KeyError, ValueError, FileNotFoundError) as exc:
+                    discrepancy_rows.append(
+                        Discrepancy(
+                            log_file,
+                            timestamp,
+                            name,
+                            "food_bank_lookup",
+                            "n/a",
+                            f"Missing entry: {exc}",
                         )
-                        continue
-                    portion = fb_entry.get("portion", {})
-                    per_portion = fb_entry.get("per_portion", {})
-                    portion_weight = portion.get("est_weight_g")
-                    try:
+                    )
+                    continue
+                portion = fb_entry.get("portion", {})
+                per_portion = fb_entry.get("per_portion", {})
+                portion_weight = portion.get("est_weight_g")
+                try:
+                    if exact:
                         factor = scale_factor(quantity, unit, portion_weight)
-                    except ValueError as exc:
-                        discrepancy_rows.append(
-                            Discrepancy(
-                                log_file,
-                                timestamp,
-                                name,
-                                "scale_factor",
-                                str(quantity_raw),
-                                str(exc),
-                            )
+                    else:
+                        float_factor = float_scale_factor(float(quantity), unit, portion_weight)
+                except ValueError as exc:
+                    discrepancy_rows.append(
+                        Discrepancy(
+                            log_file,
+                            timestamp,
+                            name,
+                            "scale_factor",
+                            str(quantity_raw),
+                            str(exc),
                         )
-                        continue
-                    for field in EXPECTED_FIELDS:
-                        if field in OPTIONAL_FIELDS:
+                    )
+                    continue
+                if not exact:
+                    vector = vectors.get(food_id)
+                    if vector is None:
+                        vector = vectors[food_id] = bank_vector(per_portion)
+                    factor = None
+                    for field, bank_float in vector:
+                        if abs(bank_float * float_factor) < FLOAT_THRESHOLD:
                             continue
                         log_raw = nutrition.get(field)
-                        log_val = decimal_value(log_raw)
-                        bank_val = decimal_value(per_portion.get(field)) * factor
-                        if bank_val.copy_abs() < DISCREPANCY_THRESHOLD:
-                            continue
-                        if log_raw is None or log_val == 0:
+                        if log_raw is None or float(log_raw) == 0:
+                            if factor is None:
+                                factor = scale_factor(quantity, unit, portion_weight)
+                            bank_val = decimal_value(per_portion.get(field)) * factor
                             discrepancy_rows.append(
                                 Discrepancy(
                                     log_file,
@@ -271,24 +288,135 @@ def find_discrepancies(
                                     f"{bank_val.normalize()}",
                                 )
                             )
-                else:
+                    continue
+                for field in EXPECTED_FIELDS:
+                    if field in OPTIONAL_FIELDS:
+                        continue
+                    log_raw = nutrition.get(field)
+                    log_val = decimal_value(log_raw)
+                    bank_val = decimal_value(per_portion.get(field)) * factor
+                    if bank_val.copy_abs() < DISCREPANCY_THRESHOLD:
+                        continue
+                    if log_raw is None or log_val == 0:
+                        discrepancy_rows.append(
+                            Discrepancy(
+                                log_file,
+                                timestamp,
+                                name,
+                                field,
+                                str(log_raw if log_raw is not None else "missing"),
+                                f"{bank_val.normalize()}",
+                            )
+                        )
+            else:
+                if exact:
                     zero_fields = [
                         field
                         for field in EXPECTED_FIELDS
                         if field not in OPTIONAL_FIELDS
                         and decimal_value(nutrition.get(field)).is_zero()
                     ]
-                    manual_rows.append(
-                        ManualItem(
-                            file=log_file,
-                            timestamp=timestamp,
-                            name=name,
-                            quantity=str(quantity_raw),
-                            unit=item.get("unit", ""),
-                            zero_fields=zero_fields,
-                            notes=entry_notes,
-                        )
+                else:
+                    zero_fields = [
+                        field
+                        for field in EXPECTED_FIELDS
+                        if field not in OPTIONAL_FIELDS
+                        and float_value(nutrition.get(field)) == 0
+                    ]
+                manual_rows.append(
+                    ManualItem(
+                        file=log_file,
+                        timestamp=timestamp,
+                        name=name,
+                        quantity=str(quantity_raw),
+                        unit=item.get("unit", ""),
+                        zero_fields=zero_fields,
+                        notes=entry_notes,
                     )
+                )
+    return discrepancy_rows, manual_rows
+
+
+def check_log_file(
+    log_file: Path,
+    food_bank: FoodBankIndex,
+    exact: bool = False,
+    vectors: Optional[BankVectors] = None,
+) -> tuple[List[Discrepancy], List[ManualItem]]:
+    """Check a single log file against the food bank."""
+    text = log_file.read_text()
+    profiling.record_read(log_file)
+    with profiling.phase("yaml_parse"):
+        data = yaml.safe_load(text)
+    with profiling.phase("compute"):
+        return check_entries(log_file, data, food_bank, exact, vectors)
+
+
+def list_log_files(logs_dir: Path) -> List[Path]:
+    with profiling.phase("discovery"):
+        return sorted(p for p in logs_dir.rglob("*.yaml") if p.name != "SCHEMA.md")
+
+
+# Per-worker state, installed once by the pool initializer
+_worker_food_bank: Optional[FoodBankIndex] = None
+_worker_exact = False
+_worker_vectors: BankVectors = {}
+
+
+def _init_worker(food_bank: FoodBankIndex, exact: bool) -> None:
+    global _worker_food_bank, _worker_exact
+    _worker_food_bank = food_bank
+    _worker_exact = exact
+
+
+def _check_in_worker(log_file: Path) -> tuple[List[Discrepancy], List[ManualItem]]:
+    return check_log_file(log_file, _worker_food_bank, _worker_exact, _worker_vectors)
+
+
+def iter_discrepancies(
+    log_files: Sequence[Path], food_bank: FoodBankIndex, jobs: int = 1, exact: bool = False
+) -> Iterator[tuple[List[Discrepancy], List[ManualItem]]]:
+    """Yield per-file results in log-file order.
+
+    With jobs > 1 the files are sharded across a process pool. At most a
+    few files per worker are in flight at once, so memory stays bounded no
+    matter how long the log history is, and results are yielded as soon as
+    every earlier file has finished.
+    """
+    if jobs <= 1:
+        vectors: BankVectors = {}
+        for log_file in log_files:
+            yield check_log_file(log_file, food_bank, exact, vectors)
+        return
+
+    window = jobs * 4
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(food_bank, exact)
+    ) as executor:
+        pending: Deque = deque()
+        for log_file in log_files:
+            pending.append(executor.submit(_check_in_worker, log_file))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def find_discrepancies(
+    logs_dir: Path,
+    food_bank: FoodBankIndex,
+    log_files: Optional[List[Path]] = None,
+    jobs: int = 1,
+    exact: bool = False,
+) -> tuple[List[Discrepancy], List[ManualItem]]:
+    discrepancy_rows: List[Discrepancy] = []
+    manual_rows: List[ManualItem] = []
+
+    if log_files is None:
+        log_files = list_log_files(logs_dir)
+    for discrepancies, manual in iter_discrepancies(log_files, food_bank, jobs, exact):
+        discrepancy_rows.extend(discrepancies)
+        manual_rows.extend(manual)
     return discrepancy_rows, manual_rows
 
 
@@ -307,6 +435,16 @@ def render_table(headers: Sequence[str], rows: Sequence[Sequence[str]]) -> str:
     return "\n".join(output)
 
 
+def stream_jsonl(results: Iterator[tuple[List[Discrepancy], List[ManualItem]]]) -> None:
+    """Print each row as a JSON object as soon as its log file is checked."""
+    for discrepancies, manual_items in results:
+        for row in discrepancies:
+            print(json.dumps({"kind": "discrepancy", **asdict(row), "file": str(row.file)}, default=str))
+        for item in manual_items:
+            print(json.dumps({"kind": "manual", **asdict(item), "file": str(item.file)}, default=str))
+        sys.stdout.flush()
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Check nutrition logs for zero-value discrepancies."
@@ -321,51 +459,95 @@ def main() -> None:
         default="data/food-data-bank",
         help="Directory containing food bank entries (default: data/food-data-bank).",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse every food-bank and log file instead of reusing the cached indexes.",
+    )
+    parser.add_argument(
+        "--changed-dish",
+        action="append",
+        default=[],
+        metavar="ID",
+        help="Only check logs that reference this food_bank_id (repeatable).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for checking log files (0 = one per CPU; default: 1).",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["table", "jsonl"],
+        default="table",
+        help="Output format; jsonl streams one row per line as files are checked (default: table).",
+    )
+    parser.add_argument(
+        "--exact",
+        action="store_true",
+        help="Compare every nutrient with Decimal arithmetic instead of the float fast path.",
+    )
+    profiling.add_profile_argument(parser)
     args = parser.parse_args()
+    profiling.setup("check_log_vs_food_bank", args.profile)
 
     logs_dir = Path(args.logs_dir)
     food_bank_dir = Path(args.food_bank_dir)
 
-    food_bank = FoodBankIndex(food_bank_dir)
-    discrepancies, manual_items = find_discrepancies(logs_dir, food_bank)
-
-    discrepancies_rows = [
-        (
-            row.file.name,
-            row.timestamp,
-            row.name,
-            row.nutrient,
-            row.log_value,
-            row.expected_value,
-        )
-        for row in discrepancies
-    ]
-    manual_rows = [
-        (
-            item.file.name,
-            item.timestamp,
-            item.name,
-            f"{item.quantity} {item.unit}".strip(),
-            ", ".join(item.zero_fields) or "—",
-            item.notes or "",
+    food_bank = FoodBankIndex(food_bank_dir, use_cache=not args.no_cache)
+    log_files = None
+    if args.changed_dish:
+        store = LogStore(logs_dir, use_cache=not args.no_cache)
+        log_files = store.files_referencing(args.changed_dish)
+    if log_files is None:
+        log_files = list_log_files(logs_dir)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    if args.format == "jsonl":
+        stream_jsonl(iter_discrepancies(log_files, food_bank, jobs, args.exact))
+        return
+
+    discrepancies, manual_items = find_discrepancies(logs_dir, food_bank, log_files, jobs, args.exact)
+
+    with profiling.phase("render"):
+        discrepancies_rows = [
+            (
+                row.file.name,
+                row.timestamp,
+                row.name,
+                row.nutrient,
+                row.log_value,
+                row.expected_value,
+            )
+            for row in discrepancies
+        ]
+        manual_rows = [
+            (
+                item.file.name,
+                item.timestamp,
+                item.name,
+                f"{item.quantity} {item.unit}".strip(),
+                ", ".join(item.zero_fields) or "—",
+                item.notes or "",
+            )
+            for item in manual_items
+        ]
+
+        print("=== Food-bank vs Log Zero Discrepancies ===")
+        print(
+            render_table(
+                ["log_file", "timestamp", "item", "nutrient", "log_value", "food_bank_value"],
+                discrepancies_rows,
+            )
         )
-        for item in manual_items
-    ]
-
-    print("=== Food-bank vs Log Zero Discrepancies ===")
-    print(
-        render_table(
-            ["log_file", "timestamp", "item", "nutrient", "log_value", "food_bank_value"],
-            discrepancies_rows,
+        print("=== Items Without food_bank_id (0-valued nutrients) ===")
+        print(
+            render_table(
+                ["log_file", "timestamp", "item", "qty/unit", "zero_fields", "entry_notes"],
+                manual_rows,
+            )
         )
-    )
-    print("=== Items Without food_bank_id (0-valued nutrients) ===")
-    print(
-        render_table(
-            ["log_file", "timestamp", "item", "qty/unit", "zero_fields", "entry_notes"],
-            manual_rows,
-        )
-    )
 
 
 if __name__ == "__main__":
@@ -11,12 +11,16 @@ Usage:
 
 import yaml
 import sys
+import calendar
 import argparse
+from datetime import date
 from pathlib import Path
-from collections import defaultdict
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import statistics
 
+import profiling
+from daily_rollup import Aggregate, DailyRollup
+
 # Project root
 PROJECT_ROOT = Path(__file__).parent.parent
 LOGS_DIR = PROJECT_ROOT / "data" / "logs"
@@ -64,42 +68,14 @@ def load_health_profile() -> Dict:
         return {'targets': {}}
 
 
-def parse_daily_log(log_file: Path) -> Optional[Dict]:
-    """Parse a single daily log file and return totals."""
-    with open(log_file, 'r') as f:
-        data = yaml.safe_load(f)
-
-    if not isinstance(data, dict):
-        return None
-
-    # Calculate daily totals
-    daily_totals = defaultdict(float)
-
-    for entry in data.get('entries', []):
-        if not isinstance(entry, dict):
-            continue
-
-        for item in entry.get('items', []):
-            if not isinstance(item, dict):
-                continue
-
-            nutrition = item.get('nutrition', {})
-            if not isinstance(nutrition, dict):
-                continue
-
-            for nutrient, value in nutrition.items():
-                if value is not None and isinstance(value, (int, float)):
-                    daily_totals[nutrient] += value
+def calculate_statistics(values: List[float],
+                         aggregates: Optional[Tuple[Aggregate, Aggregate]] = None) -> Optional[Dict]:
+    """Calculate statistics for a list of values.
 
-    return {
-        'date': data.get('date'),
-        'day_type': data.get('day_type', 'rest'),
-        'totals': dict(daily_totals)
-    }
-
-
-def calculate_statistics(values: List[float]) -> Optional[Dict]:
-    """Calculate statistics for a list of values."""
+    aggregates, if given, are the rollup's (all days, non-zero days)
+    partials over the same days; mean, stdev, min, max and count then come
+    from the non-zero partial sums and only the median looks at values.
+    """
     if not values or len(values) < 2:
         return None
 
@@ -108,6 +84,17 @@ def calculate_statistics(values: List[float]) -> Optional[Dict]:
     if len(non_zero_values) < 2:
         return None
 
+    if aggregates is not None and aggregates[0].count == len(values):
+        non_zero = aggregates[1]
+        return {
+            'mean': non_zero.mean,
+            'median': statistics.median(non_zero_values),
+            'stdev': non_zero.stdev,
+            'min': non_zero.min,
+            'max': non_zero.max,
+            'count': non_zero.count
+        }
+
     return {
         'mean': statistics.mean(non_zero_values),
         'median': statistics.median(non_zero_values),
@@ -205,24 +192,34 @@ def get_outlier_indicator(value: float, stats: Optional[Dict], targets: Dict, nu
     return '✓'
 
 
-def load_daily_data(year: int, month: int, num_days: Optional[int] = None) -> List[Dict]:
-    """Load daily logs for a given month or last N days."""
+def load_daily_data(year: int, month: int, num_days: Optional[int] = None,
+                    use_cache: bool = True, rollup: Optional[DailyRollup] = None) -> List[Dict]:
+    """Load daily logs for a given month or last N days.
+
+    Per-day totals come from the daily rollup, so only log files that
+    changed since the last run are re-parsed.
+    """
     month_dir = LOGS_DIR / f"{year:04d}-{month:02d}"
 
     if not month_dir.exists():
         return []
 
+    if rollup is None:
+        rollup = DailyRollup(LOGS_DIR, use_cache=use_cache)
+    first_day = date(year, month, 1)
+    last_day = date(year, month, calendar.monthrange(year, month)[1])
+
     daily_data = []
-    log_files = sorted(month_dir.glob("*.yaml"))
-
-    for log_file in log_files:
-        try:
-            data = parse_daily_log(log_file)
-            if data:
-                daily_data.append(data)
-        except Exception as e:
-            print(f"Warning: Error parsing {log_file}: {e}", file=sys.stderr)
+    for day in rollup.between(first_day, last_day):
+        if day.error:
+            print(f"Warning: Error parsing {day.path}: {day.error}", file=sys.stderr)
             continue
+        daily_data.append({
+            'date': day.yaml_date,
+            'log_date': day.date,
+            'day_type': day.day_type or 'rest',
+            'totals': dict(day.totals)
+        })
 
     # If num_days specified, take last N days
     if num_days and len(daily_data) > num_days:
@@ -299,8 +296,14 @@ def get_nutrient_label(nutrient: str, max_length: int = 12) -> str:
 
 
 def print_comparison_table(daily_data: List[Dict], profile: Dict,
-                           focus_nutrients: Optional[List[str]] = None):
-    """Print daily comparison table with outlier detection."""
+                           focus_nutrients: Optional[List[str]] = None,
+                           aggregates: Optional[Dict[str, Tuple[Aggregate, Aggregate]]] = None):
+    """Print daily comparison table with outlier detection.
+
+    aggregates are the rollup's partials over the same days (see
+    DailyRollup.aggregate); without them statistics are computed from the
+    daily values.
+    """
     if not daily_data:
         print("No data available.")
         return
@@ -311,7 +314,7 @@ def print_comparison_table(daily_data: List[Dict], profile: Dict,
     all_stats = {}
     for nutrient in ALL_NUTRIENTS:
         values = [day['totals'].get(nutrient, 0) for day in daily_data]
-        all_stats[nutrient] = calculate_statistics(values)
+        all_stats[nutrient] = calculate_statistics(values, (aggregates or {}).get(nutrient))
 
     # Determine which nutrients to display
     if focus_nutrients is None:
@@ -468,8 +471,11 @@ Examples:
     parser.add_argument('--days', type=int, help='Limit to last N days')
     parser.add_argument('--nutrients', help='Comma-separated list of nutrients to display')
     parser.add_argument('--all', action='store_true', help='Show all 52 tracked nutrients')
+    parser.add_argument('--no-cache', action='store_true', help='Re-parse every log file instead of reusing the daily rollup')
+    profiling.add_profile_argument(parser)
 
     args = parser.parse_args()
+    profiling.setup('daily_comparison', args.profile)
 
     # Parse year-month
     try:
@@ -487,7 +493,8 @@ Examples:
         sys.exit(1)
 
     # Load data
-    daily_data = load_daily_data(year, month, args.days)
+    rollup = DailyRollup(LOGS_DIR, use_cache=not args.no_cache)
+    daily_data = load_daily_data(year, month, args.days, rollup=rollup)
 
     if not daily_data:
         print(f"No data found for {year:04d}-{month:02d}", file=sys.stderr)
@@ -515,8 +522,13 @@ Examples:
     # Load user profile
     profile = load_health_profile()
 
+    # Range partials over exactly the loaded days
+    with profiling.phase('compute'):
+        aggregates = rollup.aggregate(daily_data[0]['log_date'], daily_data[-1]['log_date'], ALL_NUTRIENTS)
+
     # Print comparison table
-    print_comparison_table(daily_data, profile, focus_nutrients)
+    with profiling.phase('render'):
+        print_comparison_table(daily_data, profile, focus_nutrients, aggregates)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Per-day rollup of the daily logs in data/logs/YYYY-MM/DD.yaml.
+
+Each log file is reduced to one small record:
+
+- totals for every schema nutrient logged that day
+- entry and item counts
+- first and last meal timestamp
+- date and day_type as written in the file
+- a meal outline (entry timestamp, item names and energy) for the
+  timing, food-frequency and alcohol reports
+
+The records are cached in data/.cache/logs-daily.pickle, keyed like the
+food-bank index by (size, mtime, content hash): files whose stat is
+unchanged are reused as-is, touched-but-identical files only cost a hash,
+and only edited or new days are parsed. Scripts that work on whole days
+(calculate_nutrition_summary, daily_comparison, monthly_analysis) read the
+rollup instead of walking every item of every log; log_store only keeps
+the food_bank_id reverse index.
+
+On top of the days, the same artifact keeps week (ISO), month and year
+partials for every nutrient: count, sum, sum of squares, min and max over
+all logged days, plus the same over the days where the nutrient was
+non-zero. Years are merged from their months. Only the periods containing
+a changed day are recomputed, and a range query (DailyRollup.aggregate)
+combines whole years, months and weeks with at most a few loose days at
+either end, so multi-year statistics cost a handful of merges.
+
+Usage:
+    python3 scripts/daily_rollup.py [--logs-dir data/logs] [--from YYYY-MM-DD] [--to YYYY-MM-DD]
+"""
+
+from __future__ import annotations
+
+import argparse
+import calendar
+import hashlib
+import math
+import sys
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import yaml
+
+import profiling
+from food_bank_index import read_artifact, write_artifact
+from log_store import DEFAULT_LOGS_DIR, NUTRIENT_FIELDS, discover_log_files
+
+# Bump whenever the pickled record layout changes so stale rollups are rebuilt.
+CACHE_VERSION = 2
+
+# Period keys: ("Y", year), ("M", year, month), ("W", iso_year, iso_week), ("D", date)
+PeriodKey = tuple
+# Per nutrient: (all days, non-zero days) as Aggregate.astuple() pairs
+PeriodPartials = Dict[str, Tuple[tuple, tuple]]
+
+
+def default_cache_path(logs_dir: Path) -> Path:
+    """Return the rollup path for a logs directory (a .cache dir next to it)."""
+    return logs_dir.parent / ".cache" / f"{logs_dir.name}-daily.pickle"
+
+
+@dataclass
+class DayRollup:
+    """Whole-day summary of one daily log file."""
+
+    path: Path
+    date: date
+    mtime_ns: int
+    size: int
+    sha256: str
+    yaml_date: object = None
+    day_type: Optional[str] = None
+    num_entries: int = 0
+    num_items: int = 0
+    first_meal: Optional[str] = None
+    last_meal: Optional[str] = None
+    # Nutrient -> total, for nutrients that appeared with a numeric value
+    totals: Dict[str, float] = field(default_factory=dict)
+    # (entry timestamp as written, [(item name, energy_kcal as written)])
+    meals: List[Tuple[object, List[Tuple[str, object]]]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+class Aggregate:
+    """Mergeable count/sum/sum-of-squares/min/max of one nutrient over some days."""
+
+    __slots__ = ("count", "total", "sumsq", "min", "max")
+
+    def __init__(self, count: int = 0, total: float = 0.0, sumsq: float = 0.0,
+                 min: float = math.inf, max: float = -math.inf) -> None:
+        self.count = count
+        self.total = total
+        self.sumsq = sumsq
+        self.min = min
+        self.max = max
+
+    @classmethod
+    def of(cls, values: Sequence[float]) -> "Aggregate":
+        if not values:
+            return cls()
+        return cls(len(values), sum(values), sum(v * v for v in values), min(values), max(values))
+
+    def merge(self, other: "Aggregate") -> "Aggregate":
+        """Fold other into this aggregate (in place) and return it."""
+        if other.count:
+            self.count += other.count
+            self.total += other.total
+            self.sumsq += other.sumsq
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        return self
+
+    def astuple(self) -> tuple:
+        return (self.count, self.total, self.sumsq, self.min, self.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation (0 for fewer than two days)."""
+        if self.count < 2:
+            return 0.0
+        variance = (self.sumsq - self.total * self.total / self.count) / (self.count - 1)
+        return math.sqrt(variance) if variance > 0 else 0.0
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Aggregate) and self.astuple() == other.astuple()
+
+    def __repr__(self) -> str:
+        return f"Aggregate(count={self.count}, total={self.total}, sumsq={self.sumsq}, min={self.min}, max={self.max})"
+
+
+def period_keys(day: date) -> List[PeriodKey]:
+    """The week, month and year partials a day contributes to."""
+    iso_year, iso_week, _ = day.isocalendar()
+    return [("W", iso_year, iso_week), ("M", day.year, day.month), ("Y", day.year)]
+
+
+def period_bounds(key: PeriodKey) -> Tuple[date, date]:
+    """First and last calendar day of a period."""
+    kind = key[0]
+    if kind == "Y":
+        return date(key[1], 1, 1), date(key[1], 12, 31)
+    if kind == "M":
+        return date(key[1], key[2], 1), date(key[1], key[2], calendar.monthrange(key[1], key[2])[1])
+    if kind == "W":
+        monday = date.fromisocalendar(key[1], key[2], 1)
+        return monday, monday + timedelta(days=6)
+    return key[1], key[1]
+
+
+def cover(start: date, end: date) -> Iterator[PeriodKey]:
+    """Split start..end into the fewest whole years, months, weeks and loose days."""
+    cursor = start
+    while cursor <= end:
+        year_end = date(cursor.year, 12, 31)
+        month_end = date(cursor.year, cursor.month, calendar.monthrange(cursor.year, cursor.month)[1])
+        if cursor.month == 1 and cursor.day == 1 and year_end <= end:
+            yield ("Y", cursor.year)
+            cursor = year_end + timedelta(days=1)
+        elif cursor.day == 1 and month_end <= end:
+            yield ("M", cursor.year, cursor.month)
+            cursor = month_end + timedelta(days=1)
+        elif cursor.weekday() == 0 and cursor + timedelta(days=6) <= end:
+            iso_year, iso_week, _ = cursor.isocalendar()
+            yield ("W", iso_year, iso_week)
+            cursor += timedelta(days=7)
+        else:
+            yield ("D", cursor)
+            cursor += timedelta(days=1)
+
+
+def day_partials(days: Iterable[DayRollup]) -> Optional[PeriodPartials]:
+    """Per-nutrient (all, non-zero) partials over days, or None if none are readable."""
+    days = [day for day in days if not day.error]
+    if not days:
+        return None
+    partials = {}
+    for nutrient in NUTRIENT_FIELDS:
+        values = [day.totals.get(nutrient, 0.0) for day in days]
+        partials[nutrient] = (
+            Aggregate.of(values).astuple(),
+            Aggregate.of([v for v in values if v > 0]).astuple(),
+        )
+    return partials
+
+
+def _meal_time(timestamp) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(str(timestamp).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def rollup_log(path: Path, log_date: date, st, raw: bytes, sha256: Optional[str] = None) -> DayRollup:
+    """Reduce one log file's content to a DayRollup (never raises for bad content)."""
+    day = DayRollup(path, log_date, st.st_mtime_ns, st.st_size, sha256 or hashlib.sha256(raw).hexdigest())
+
+    try:
+        with profiling.phase("yaml_parse"):
+            data = yaml.safe_load(raw)
+    except yaml.YAMLError as exc:
+        day.error = f"Failed to parse: {exc}"
+        return day
+
+    if not isinstance(data, dict):
+        day.error = f"Invalid YAML structure (expected dict, got {type(data).__name__})"
+        return day
+
+    day.yaml_date = data.get("date")
+    day.day_type = data.get("day_type")
+    entries = data.get("entries") or []
+    if not isinstance(entries, list):
+        day.error = f"'entries' must be a list (got {type(entries).__name__})"
+        return day
+    day.num_entries = len(entries)
+
+    totals: Dict[str, float] = {}
+    meal_times = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        timestamp = entry.get("timestamp", "")
+        items = entry.get("items") or []
+        if not isinstance(items, list):
+            items = []
+
+        outline = []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            nutrition = item.get("nutrition") or {}
+            if not isinstance(nutrition, dict):
+                nutrition = {}
+            day.num_items += 1
+            outline.append((str(item.get("name", "") or ""), nutrition.get("energy_kcal", 0)))
+            for nutrient in NUTRIENT_FIELDS:
+                value = nutrition.get(nutrient)
+                if isinstance(value, (int, float)):
+                    totals[nutrient] = totals.get(nutrient, 0) + float(value)
+
+        day.meals.append((timestamp, outline))
+        parsed = _meal_time(timestamp)
+        if parsed is not None:
+            meal_times.append((parsed, str(timestamp)))
+
+    day.totals = {nutrient: totals[nutrient] for nutrient in NUTRIENT_FIELDS if nutrient in totals}
+    if meal_times:
+        day.first_meal = min(meal_times)[1]
+        day.last_meal = max(meal_times)[1]
+    return day
+
+
+class DailyRollup:
+    """Date-ordered per-day records for every daily log."""
+
+    def __init__(
+        self,
+        logs_dir: Path = DEFAULT_LOGS_DIR,
+        cache_path: Optional[Path] = None,
+        use_cache: bool = True,
+    ) -> None:
+        # Resolved so relative and absolute callers share one cache
+        self.logs_dir = Path(logs_dir).resolve()
+        self.cache_path = cache_path or default_cache_path(self.logs_dir)
+        self.use_cache = use_cache
+        self.days: List[DayRollup] = []
+        self.parsed: List[Path] = []
+        self.periods: Dict[PeriodKey, PeriodPartials] = {}
+        with profiling.phase("discovery"):
+            self._load()
+
+    def _load(self) -> None:
+        payload = read_artifact(self.cache_path, CACHE_VERSION) if self.use_cache else None
+        cached: Dict[str, DayRollup] = {}
+        if payload and payload.get("logs_dir") == str(self.logs_dir):
+            cached = {str(fields["path"]): DayRollup(**fields) for fields in payload["days"]}
+            self.periods = payload["periods"]
+        else:
+            payload = None
+
+        dirty = payload is None
+        stale: Set[date] = set()
+        for log_date, path in discover_log_files(self.logs_dir):
+            previous = cached.pop(str(path), None)
+            try:
+                st = path.stat()
+                if previous and previous.mtime_ns == st.st_mtime_ns and previous.size == st.st_size:
+                    self.days.append(previous)
+                    continue
+                raw = path.read_bytes()
+            except OSError as exc:
+                # Unreadable or deleted since discovery: reported like malformed YAML,
+                # with a stat that never matches so the file is retried next run
+                dirty = True
+                stale.add(log_date)
+                self.days.append(DayRollup(path, log_date, 0, -1, "", error=f"Failed to parse: {exc}"))
+                continue
+
+            dirty = True
+            stale.add(log_date)
+            profiling.record_read(path, len(raw))
+            digest = hashlib.sha256(raw).hexdigest()
+            if previous and previous.sha256 == digest:
+                # Touched but unchanged (checkout, rebase): keep the rollup, refresh the stat
+                previous.mtime_ns, previous.size = st.st_mtime_ns, st.st_size
+                self.days.append(previous)
+                stale.discard(log_date)
+                continue
+
+            self.days.append(rollup_log(path, log_date, st, raw, digest))
+            self.parsed.append(path)
+        if cached:
+            dirty = True
+            stale.update(day.date for day in cached.values())
+
+        self._dates = [day.date for day in self.days]
+        self._by_date = {day.date: day for day in self.days}
+        with profiling.phase("compute"):
+            if payload is None:
+                self._rebuild_periods({key for day in self.days for key in period_keys(day.date)})
+            elif stale:
+                self._rebuild_periods({key for log_date in stale for key in period_keys(log_date)})
+
+        if self.use_cache and dirty:
+            try:
+                with profiling.phase("write"):
+                    write_artifact(
+                        self.cache_path,
+                        {
+                            "version": CACHE_VERSION,
+                            "logs_dir": str(self.logs_dir),
+                            "days": [vars(day) for day in self.days],
+                            "periods": self.periods,
+                        },
+                    )
+            except OSError as exc:
+                print(f"Warning: Could not write daily rollup {self.cache_path}: {exc}", file=sys.stderr)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    @property
+    def errors(self) -> List[Tuple[Path, str]]:
+        """(path, message) for every log file that could not be read."""
+        return [(day.path, day.error) for day in self.days if day.error]
+
+    def between(self, start: Optional[date] = None, end: Optional[date] = None) -> List[DayRollup]:
+        """Return the days dated start..end inclusive, in date order."""
+        lo = 0 if start is None else bisect_left(self._dates, start)
+        hi = len(self.days) if end is None else bisect_right(self._dates, end)
+        return self.days[lo:hi]
+
+    def _rebuild_periods(self, keys: Set[PeriodKey]) -> None:
+        """Recompute week and month partials from days, then years from months."""
+        for key in sorted(k for k in keys if k[0] != "Y"):
+            partials = day_partials(self.between(*period_bounds(key)))
+            if partials is None:
+                self.periods.pop(key, None)
+            else:
+                self.periods[key] = partials
+
+        for key in sorted(k for k in keys if k[0] == "Y"):
+            months = [self.periods[m] for m in (("M", key[1], month) for month in range(1, 13)) if m in self.periods]
+            if not months:
+                self.periods.pop(key, None)
+                continue
+            self.periods[key] = {
+                nutrient: tuple(
+                    _merge_tuples(month[nutrient][variant] for month in months) for variant in (0, 1)
+                )
+                for nutrient in NUTRIENT_FIELDS
+            }
+
+    def _partials(self, key: PeriodKey) -> Optional[PeriodPartials]:
+        if key[0] == "D":
+            day = self._by_date.get(key[1])
+            return day_partials([day]) if day else None
+        return self.periods.get(key)
+
+    def aggregate(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        nutrients: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Tuple[Aggregate, Aggregate]]:
+        """Return nutrient -> (all days, non-zero days) aggregates for start..end inclusive.
+
+        Days whose log could not be read are left out, as in the day list.
+        """
+        fields = list(nutrients or NUTRIENT_FIELDS)
+        result = {nutrient: (Aggregate(), Aggregate()) for nutrient in fields}
+        days = self.between(start, end)
+        if not days:
+            return result
+
+        for key in cover(max(start or days[0].date, days[0].date), min(end or days[-1].date, days[-1].date)):
+            partials = self._partials(key)
+            if partials is None:
+                continue
+            for nutrient in fields:
+                everyday, nonzero = partials[nutrient]
+                result[nutrient][0].merge(Aggregate(*everyday))
+                result[nutrient][1].merge(Aggregate(*nonzero))
+        return result
+
+
+def _merge_tuples(partials: Iterable[tuple]) -> tuple:
+    merged = Aggregate()
+    for partial in partials:
+        merged.merge(Aggregate(*partial))
+    return merged.astuple()
+
+
+def _parse_date(value: str) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid date '{value}'. Use YYYY-MM-DD.")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Update the per-day log rollup and print it.")
+    parser.add_argument("--logs-dir", type=Path, default=DEFAULT_LOGS_DIR, help="Logs directory (default: data/logs)")
+    parser.add_argument("--from", dest="start", type=_parse_date, help="First log date to include (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", type=_parse_date, help="Last log date to include (YYYY-MM-DD)")
+    parser.add_argument("--no-cache", action="store_true", help="Parse every log file instead of reusing the rollup")
+    profiling.add_profile_argument(parser)
+    args = parser.parse_args()
+    profiling.setup("daily_rollup", args.profile)
+
+    if not args.logs_dir.exists():
+        print(f"Error: Could not find {args.logs_dir}", file=sys.stderr)
+        return 1
+
+    rollup = DailyRollup(args.logs_dir, use_cache=not args.no_cache)
+    for path, error in rollup.errors:
+        print(f"Warning: Skipping {path}: {error}", file=sys.stderr)
+
+    days = rollup.between(args.start, args.end)
+    print(f"✓ {len(rollup)} days ({len(rollup.parsed)} re-parsed), {len(days)} in range")
+    for day in days:
+        if day.error:
+            continue
+        window = f"{day.first_meal[11:16]}-{day.last_meal[11:16]}" if day.first_meal else "-"
+        print(
+            f"  {day.date}  {day.day_type or '-':<8} {day.num_entries:>3} entries  {window:<11}"
+            f" {day.totals.get('energy_kcal', 0):>7.0f} kcal  {day.totals.get('protein_g', 0):>6.1f} g protein"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,23 +5,45 @@ Export nutrition log data to Apple HealthKit CSV format.
 Creates two CSV files:
 1. per_item_nutrition.csv - Every logged item with its nutrition
 2. per_day_nutrition.csv - Daily totals aggregated from per-item data
+
+Log files are streamed in date order: item rows are written as each log is
+processed, while day totals are kept in memory and written, sorted, when
+the export ends (a later log may hold a backdated entry). Memory grows with
+the number of days exported, not with the number of items.
+
+With --incremental, a state file next to the CSVs records each exported
+log's content hash and row count plus a watermark (the last exported log
+date). Later runs re-parse only new or edited logs and copy the rows of the
+others from the previous CSV; when nothing changed the files are left alone.
 """
 
 import argparse
+import contextlib
 import csv
+import hashlib
+import itertools
+import json
 import logging
+import os
 import sys
+import tempfile
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 import yaml
 
+import profiling
+from log_store import log_date_for
+
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 MAX_DAYS = 3650  # ~10 years
 MAX_LOG_FILE_BYTES = 10 * 1024 * 1024  # 10 MB
 INTERNAL_DATE_KEY = '_log_date'
+# Incremental export state, kept next to the CSVs it describes
+STATE_FILENAME = '.healthkit-export-state.json'
+STATE_VERSION = 1
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 LOGGER = logging.getLogger("healthkit_export")
@@ -117,6 +139,15 @@ def parse_args() -> argparse.Namespace:
         default=PROJECT_ROOT / "exports",
         help="Directory where CSV files will be written (default: %(default)s).",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Reuse rows of logs unchanged since the previous export (tracked in "
+            f"{STATE_FILENAME} in the output directory) and only re-parse new or edited logs."
+        ),
+    )
+    profiling.add_profile_argument(parser)
 
     args = parser.parse_args()
 
@@ -237,8 +268,9 @@ def load_log_yaml(log_path: Path) -> Dict[str, Any]:
             f"{log_path} is {size_bytes:,} bytes which exceeds the {MAX_LOG_FILE_BYTES:,} byte limit."
         )
 
-    with open(log_path, 'r', encoding='utf-8') as f:
+    with open(log_path, 'r', encoding='utf-8') as f, profiling.phase("yaml_parse"):
         data = yaml.safe_load(f)
+    profiling.record_read(log_path, size_bytes)
 
     if data is None:
         raise ValueError(f"{log_path} is empty or contains only comments.")
@@ -371,6 +403,54 @@ def process_log_file(log_path: Path) -> List[Dict[str, Any]]:
     return items_data
 
 
+def _empty_day_total(day: str) -> Dict[str, Any]:
+    total: Dict[str, Any] = {
+        'timestamp': day,
+        'food name': f'Daily Total - {day}',
+        'food id': ''
+    }
+    # Initialize all nutrition fields to 0
+    for col in get_healthkit_columns():
+        if col not in ['timestamp', 'food name', 'food id']:
+            total[col] = 0
+    return total
+
+
+class DayTotals:
+    """
+    Running per-day totals, keyed by each item's entry date.
+
+    The entry date can differ from the date of the log file an item came
+    from (e.g. a snack just after midnight, or a backdated entry), so totals
+    are kept for every day until all items have been added. That is one
+    small row per day, about 3,650 for a decade of logs.
+    """
+
+    def __init__(self) -> None:
+        self.days: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, item: Dict[str, Any]) -> None:
+        day = item.get(INTERNAL_DATE_KEY)
+        if not isinstance(day, str):
+            raise ValueError("Per-item data missing internal date key.")
+
+        total = self.days.get(day)
+        if total is None:
+            total = self.days[day] = _empty_day_total(day)
+
+        # Sum up all nutrition fields
+        for key, value in item.items():
+            if key in NON_NUMERIC_KEYS:
+                continue
+            if key not in total:
+                total[key] = 0
+            total[key] += value
+
+    def sorted(self) -> List[Dict[str, Any]]:
+        """Return the totals in date order."""
+        return [self.days[day] for day in sorted(self.days)]
+
+
 def create_per_day_totals(per_item_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Aggregate per-item data into per-day totals.
@@ -381,41 +461,241 @@ def create_per_day_totals(per_item_data: List[Dict[str, Any]]) -> List[Dict[str,
     Returns:
         List of per-day aggregated records
     """
-    daily_totals = {}
-
+    totals = DayTotals()
     for item in per_item_data:
-        date = item.get(INTERNAL_DATE_KEY)
-        if not isinstance(date, str):
-            raise ValueError("Per-item data missing internal date key.")
+        totals.add(item)
+    return totals.sorted()
+
+
+class StreamingExport:
+    """
+    Write both CSVs while log files are processed.
+
+    Per-item rows are written as soon as a log file is processed. Per-day
+    totals are accumulated in memory and written, sorted by date, when the
+    export finishes, since any later log may hold a backdated entry. Log
+    files must be added in date order. Memory grows with the number of days
+    exported, not with the number of items.
+
+    Both files are written to temporary files and only replace the previous
+    export when the context exits cleanly.
+    """
+
+    def __init__(self, per_item_csv: Path, per_day_csv: Path) -> None:
+        self.paths = (per_item_csv, per_day_csv)
+        self.item_rows = 0
+        self.day_rows = 0
+        self._totals = DayTotals()
+        self._stack = contextlib.ExitStack()
+        self._files: List[Tuple[Any, Path]] = []
+        self._writers: List[csv.DictWriter] = []
+        self._last_log_date: Optional[date] = None
+        self.blocks: List[Tuple[Optional[date], int]] = []  # (log date, item rows) in file order
+
+    def __enter__(self) -> "StreamingExport":
+        columns = get_healthkit_columns()
+        try:
+            for path in self.paths:
+                fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+                handle = self._stack.enter_context(os.fdopen(fd, 'w', encoding='utf-8', newline=''))
+                self._files.append((handle, Path(tmp_name)))
+                writer = csv.DictWriter(handle, fieldnames=columns, extrasaction='ignore')
+                writer.writeheader()
+                self._writers.append(writer)
+        except BaseException:
+            self._discard()
+            raise
+        return self
+
+    def add_log(self, log_date: Optional[date], items: List[Dict[str, Any]]) -> None:
+        """Write one log file's items and add them to the day totals."""
+        if log_date is not None and self._last_log_date is not None and log_date < self._last_log_date:
+            raise ValueError(f"Log for {log_date} added after the log for {self._last_log_date}.")
+
+        item_writer, _ = self._writers
+        with profiling.phase("write"):
+            item_writer.writerows(items)
+        self.item_rows += len(items)
+        self.blocks.append((log_date, len(items)))
+        for item in items:
+            self._totals.add(item)
+
+        if log_date is not None:
+            self._last_log_date = log_date
+
+    def _write_totals(self, totals: List[Dict[str, Any]]) -> None:
+        _, day_writer = self._writers
+        with profiling.phase("write"):
+            day_writer.writerows(totals)
+        self.day_rows += len(totals)
+
+    def _discard(self) -> None:
+        self._stack.close()
+        for _, tmp_path in self._files:
+            tmp_path.unlink(missing_ok=True)
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self._discard()
+            return
+        try:
+            self._write_totals(self._totals.sorted())
+            self._stack.close()
+        except BaseException:
+            self._discard()
+            raise
+        for (_, tmp_path), path in zip(self._files, self.paths):
+            os.replace(tmp_path, path)
+            set_file_permissions(path)
+            profiling.record_write(path)
 
-        if date not in daily_totals:
-            # Initialize with zeros
-            daily_totals[date] = {
-                'timestamp': date,
-                'food name': f'Daily Total - {date}',
-                'food id': ''
+
+def file_sha256(path: Path) -> str:
+    """Content hash of a log file, used to detect edits between exports."""
+    raw = path.read_bytes()
+    profiling.record_read(path, len(raw))
+    return hashlib.sha256(raw).hexdigest()
+
+
+def load_export_state(output_dir: Path) -> Optional[Dict[str, Any]]:
+    """
+    Load the state of the previous export, or None if it cannot be trusted.
+
+    The state lists every exported log as [date, sha256, item rows] in the
+    order its rows appear in per_item_nutrition.csv. It is ignored when the
+    columns changed or the CSV was modified after the export.
+    """
+    state_path = output_dir / STATE_FILENAME
+    per_item_csv = output_dir / 'per_item_nutrition.csv'
+    try:
+        state = json.loads(state_path.read_text(encoding='utf-8'))
+        if (state.get('version') != STATE_VERSION
+                or state.get('columns') != get_healthkit_columns()
+                or state.get('per_item_size') != per_item_csv.stat().st_size
+                or not (output_dir / 'per_day_nutrition.csv').is_file()):
+            return None
+        state['logs'] = [(date.fromisoformat(day), sha, int(rows)) for day, sha, rows in state['logs']]
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return None
+    return state
+
+
+def save_export_state(output_dir: Path, logs: List[Tuple[date, str, int]]) -> None:
+    """Atomically record what the CSVs in output_dir now contain."""
+    state = {
+        'version': STATE_VERSION,
+        'watermark': logs[-1][0].isoformat() if logs else None,
+        'columns': get_healthkit_columns(),
+        'per_item_size': (output_dir / 'per_item_nutrition.csv').stat().st_size,
+        'logs': [[day.isoformat(), sha, rows] for day, sha, rows in logs],
+    }
+    state_path = output_dir / STATE_FILENAME
+    temp_file = state_path.with_suffix('.json.tmp')
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    temp_file.replace(state_path)
+    set_file_permissions(state_path)
+
+
+def _parse_number(text: str) -> Any:
+    # Values were written with str(), so int/float round-trip exactly
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def read_exported_items(per_item_csv: Path) -> Iterator[Dict[str, Any]]:
+    """Yield rows of a previous per-item export in the form process_log_file returns."""
+    with open(per_item_csv, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            item: Dict[str, Any] = {
+                'timestamp': row['timestamp'],
+                'food name': row['food name'],
+                'food id': row['food id'],
+                INTERNAL_DATE_KEY: row['timestamp'][:10],
             }
-            # Initialize all nutrition fields to 0
-            for col in get_healthkit_columns():
-                if col not in ['timestamp', 'food name', 'food id']:
-                    daily_totals[date][col] = 0
+            for column in NUTRIENT_COLUMNS:
+                item[column.header] = _parse_number(row[column.header])
+            yield item
+    profiling.record_read(per_item_csv)
 
-        # Sum up all nutrition fields
-        for key, value in item.items():
-            if key in NON_NUMERIC_KEYS:
+
+def export_log_files(
+    log_files: List[Path],
+    output_dir: Path,
+    *,
+    incremental: bool = False,
+    logs_dir: Optional[Path] = None,
+) -> Tuple[Optional[StreamingExport], int]:
+    """
+    Export log files (in date order) to both CSVs in output_dir.
+
+    In incremental mode, rows of logs unchanged since the previous export
+    are copied from the previous CSV instead of re-parsing the YAML, and
+    nothing is written when no log changed. Either way the CSVs come out
+    identical to a full export, and the state for the next run is saved.
+
+    Returns:
+        (finished export or None if already up to date, number of logs parsed)
+
+    Raises:
+        ValueError: "<log file>: <problem>" for a log that cannot be exported
+    """
+    with profiling.phase("discovery"):
+        hashes = [file_sha256(log_file) for log_file in log_files]
+        log_dates = [log_date_for(log_file) for log_file in log_files]
+
+    state = load_export_state(output_dir) if incremental else None
+    previous = state['logs'] if state else []
+    if incremental:
+        if state is None:
+            print("No usable previous export state; exporting the full range")
+        else:
+            print(f"Previous export watermark: {state['watermark']}")
+            if [(day, sha) for day, sha, _ in previous] == list(zip(log_dates, hashes)):
+                return None, 0
+
+    # Stream log files into both CSVs; only the per-day totals are held in memory
+    per_item_csv = output_dir / 'per_item_nutrition.csv'
+    per_day_csv = output_dir / 'per_day_nutrition.csv'
+    reprocessed = 0
+    with StreamingExport(per_item_csv, per_day_csv) as export, \
+            contextlib.closing(read_exported_items(per_item_csv)) as old_rows:
+        position = 0
+        for log_file, log_date, sha in zip(log_files, log_dates, hashes):
+            # Previous rows are read lazily, one log's block at a time; blocks
+            # of logs that changed or left the range are dropped
+            old_block: Optional[List[Dict[str, Any]]] = None
+            while position < len(previous) and previous[position][0] <= log_date:
+                old_date, old_sha, old_count = previous[position]
+                block = list(itertools.islice(old_rows, old_count))
+                if old_date == log_date and old_sha == sha:
+                    old_block = block
+                position += 1
+            if old_block is not None:
+                export.add_log(log_date, old_block)
                 continue
-            if key not in daily_totals[date]:
-                daily_totals[date][key] = 0
-            daily_totals[date][key] += value
 
-    # Convert to sorted list
-    return [daily_totals[date] for date in sorted(daily_totals.keys())]
+            print(f"Processing: {log_file.relative_to(logs_dir) if logs_dir else log_file}")
+            reprocessed += 1
+            try:
+                with profiling.phase("compute"):
+                    export.add_log(log_date, process_log_file(log_file))
+            except ValueError as exc:
+                raise ValueError(f"{log_file}: {exc}") from exc
+
+    save_export_state(output_dir, [
+        (log_date, sha, rows) for (log_date, rows), sha in zip(export.blocks, hashes)
+    ])
+    return export, reprocessed
 
 
 def main():
     """Main execution function."""
 
     args = parse_args()
+    profiling.setup("export_to_healthkit_csv", args.profile)
     try:
         start_date, end_date = resolve_date_range(args)
     except ValueError as exc:
@@ -436,7 +716,8 @@ def main():
     print(f"Output directory: {output_dir}")
 
     try:
-        log_files = locate_log_files(logs_dir, start_date, end_date)
+        with profiling.phase("discovery"):
+            log_files = locate_log_files(logs_dir, start_date, end_date)
     except ValueError as exc:
         print(f"Error: {exc}")
         sys.exit(2)
@@ -447,46 +728,27 @@ def main():
 
     print(f"Found {len(log_files)} log file(s)")
 
-    # Process all log files
-    all_items = []
-    for log_file in log_files:
-        print(f"Processing: {log_file.relative_to(logs_dir)}")
-        try:
-            items = process_log_file(log_file)
-        except ValueError as exc:
-            print(f"Error while processing {log_file}: {exc}")
-            sys.exit(2)
-        all_items.extend(items)
-
-    print(f"Extracted {len(all_items)} items total")
+    try:
+        export, reprocessed = export_log_files(log_files, output_dir, incremental=args.incremental,
+                                               logs_dir=logs_dir)
+    except ValueError as exc:
+        print(f"Error while processing {exc}")
+        sys.exit(2)
 
-    # Get column headers
-    columns = get_healthkit_columns()
+    if export is None:
+        print("\n✅ Export already up to date; no log changed.")
+        return
 
-    # Write per-item CSV
-    per_item_csv = output_dir / 'per_item_nutrition.csv'
-    with open(per_item_csv, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
-        writer.writeheader()
-        writer.writerows(all_items)
-    set_file_permissions(per_item_csv)
+    per_item_csv, per_day_csv = export.paths
+    if args.incremental:
+        print(f"Re-processed {reprocessed} of {len(log_files)} log file(s)")
+    print(f"Extracted {export.item_rows} items total")
 
     print(f"✓ Created: {per_item_csv}")
-    print(f"  {len(all_items)} rows")
-
-    # Create per-day totals
-    daily_totals = create_per_day_totals(all_items)
-
-    # Write per-day CSV
-    per_day_csv = output_dir / 'per_day_nutrition.csv'
-    with open(per_day_csv, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
-        writer.writeheader()
-        writer.writerows(daily_totals)
-    set_file_permissions(per_day_csv)
+    print(f"  {export.item_rows} rows")
 
     print(f"✓ Created: {per_day_csv}")
-    print(f"  {len(daily_totals)} rows")
+    print(f"  {export.day_rows} rows")
 
     print("\n✅ Export complete!")
     print(f"\nFiles created:")
@@ -32,6 +32,8 @@ import sys
 from pathlib import Path
 from typing import List, Tuple
 
+import profiling
+
 
 def fix_change_log_indentation(content: str) -> Tuple[str, int]:
     """
@@ -164,7 +166,9 @@ def main():
         help='Process only this specific file'
     )
 
+    profiling.add_profile_argument(parser)
     args = parser.parse_args()
+    profiling.setup("fix_change_log_indentation", args.profile)
 
     # Get files to process
     if args.file:
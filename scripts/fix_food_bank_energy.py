@@ -20,6 +20,8 @@ from typing import Dict
 
 import yaml
 
+import profiling
+
 
 def extract_yaml_block(path: Path) -> dict:
     text = path.read_text(encoding='utf-8')
@@ -101,7 +103,9 @@ def main():
         default=5.0,
         help="Minimum kcal delta required to trigger an update.",
     )
+    profiling.add_profile_argument(parser)
     args = parser.parse_args()
+    profiling.setup("fix_food_bank_energy", args.profile)
 
     updated = 0
     skipped = 0
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Compiled food-bank index shared by the food-bank and log scripts.
+
+Every dish file in data/food-data-bank/ is parsed once and the results are
+packed into a single artifact (data/.cache/food-data-bank.pickle by default):
+
+- id -> path, mtime, size
+- the dish header (## Name)
+- the parsed YAML payload (per_portion, portion, derived, ...)
+- the parse error, for files that could not be read
+
+Records are keyed by (path, size, mtime, content hash). On later runs only
+files whose size or mtime moved are re-read; of those, only files whose
+content hash actually changed are re-parsed, and files that disappeared are
+evicted. A run after touching one dish therefore costs a directory walk, a
+stat per file and a single YAML parse. The set of added/removed/modified
+paths is exposed as FoodBankIndex.changes for incremental consumers.
+
+The artifact is a local build product: it lives in a gitignored .cache
+directory next to the food bank and is rebuilt whenever it is missing, stale
+or written by a different CACHE_VERSION.
+
+Usage:
+    python3 scripts/food_bank_index.py [--root data/food-data-bank] [--rebuild]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import yaml
+
+import profiling
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_ROOT = PROJECT_ROOT / "data" / "food-data-bank"
+
+# Bump whenever the pickled layout changes so stale artifacts are rebuilt.
+CACHE_VERSION = 2
+
+# Non-dish markdown files that live alongside dishes
+SKIP_FILES = {"README.md", "RESEARCH.md", "index.md"}
+
+
+@dataclass
+class DishRecord:
+    """One dish file as seen by the compiled index."""
+
+    path: Path
+    mtime_ns: int
+    size: int
+    sha256: str
+    name: Optional[str]
+    data: Optional[dict]
+    error: Optional[str] = None
+
+    @property
+    def entry_id(self) -> Optional[str]:
+        if isinstance(self.data, dict):
+            return self.data.get("id")
+        return None
+
+
+def default_cache_path(root: Path) -> Path:
+    """Return the artifact path for a food-bank root (a .cache dir next to it)."""
+    return root.parent / ".cache" / f"{root.name}.pickle"
+
+
+def split_dish_markdown(text: str) -> Tuple[Optional[str], Optional[str]]:
+    """Split a dish file into its (## header, YAML block) parts.
+
+    Either part is None when absent.
+    """
+    name = None
+    for line in text.split("\n"):
+        if line.startswith("## "):
+            name = line[3:].strip()
+            break
+
+    start = text.find("```yaml")
+    if start == -1:
+        return name, None
+    start += len("```yaml")
+    end = text.find("```", start)
+    if end == -1:
+        return name, None
+    return name, text[start:end].strip()
+
+
+def parse_dish_text(text: str) -> Tuple[Optional[str], Optional[dict], Optional[str]]:
+    """Parse dish markdown into (name, data, error)."""
+    name, yaml_text = split_dish_markdown(text)
+    if yaml_text is None:
+        return name, None, "No YAML block found"
+    try:
+        with profiling.phase("yaml_parse"):
+            data = yaml.safe_load(yaml_text)
+    except yaml.YAMLError as exc:
+        return name, None, f"YAML parse error: {exc}"
+    return name, data, None
+
+
+def discover_dish_files(root: Path) -> List[Path]:
+    """Return all dish markdown files under root, sorted by path."""
+    return [p for p in sorted(root.rglob("*.md")) if p.name not in SKIP_FILES]
+
+
+@dataclass
+class IndexChanges:
+    """Paths that differ from the previously compiled artifact."""
+
+    added: List[Path] = field(default_factory=list)
+    removed: List[Path] = field(default_factory=list)
+    modified: List[Path] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+
+def _record_from_bytes(path: Path, st: os.stat_result, raw: bytes) -> DishRecord:
+    digest = hashlib.sha256(raw).hexdigest()
+    try:
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        return DishRecord(path, st.st_mtime_ns, st.st_size, digest, None, None, f"Read error: {exc}")
+    name, data, error = parse_dish_text(text)
+    return DishRecord(path, st.st_mtime_ns, st.st_size, digest, name, data, error)
+
+
+def _unreadable_record(path: Path, exc: OSError) -> DishRecord:
+    # mtime/size never match a real stat, so the file is retried on the next run
+    return DishRecord(path, 0, -1, "", None, None, f"Read error: {exc}")
+
+
+def parse_dish_file(path: Path) -> DishRecord:
+    """Parse a single dish file into a DishRecord (never raises; errors go in record.error)."""
+    try:
+        st = path.stat()
+        raw = path.read_bytes()
+    except OSError as exc:
+        return _unreadable_record(path, exc)
+    profiling.record_read(path, len(raw))
+    return _record_from_bytes(path, st, raw)
+
+
+def write_artifact(cache_path: Path, payload: dict) -> None:
+    """Atomically write a pickled cache artifact (temp file + rename)."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, cache_path)
+        profiling.record_write(cache_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def read_artifact(cache_path: Path, version: int = CACHE_VERSION) -> Optional[dict]:
+    """Load a pickled cache artifact, or None if missing, corrupt or another version."""
+    try:
+        with open(cache_path, "rb") as handle:
+            payload = pickle.load(handle)
+            profiling.record_read(cache_path, handle.tell())
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != version:
+        return None
+    return payload
+
+
+class FoodBankIndex:
+    """Id -> dish lookup backed by the compiled food-bank artifact.
+
+    from_cache is True when nothing had to be re-parsed; changes lists the
+    paths that were added, removed or modified since the previous artifact.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        cache_path: Optional[Path] = None,
+        use_cache: bool = True,
+    ) -> None:
+        self.root = Path(root)
+        self.cache_path = cache_path or default_cache_path(self.root)
+        self.use_cache = use_cache
+        self.records: List[DishRecord] = []
+        self._by_id: Dict[str, DishRecord] = {}
+        self.changes = IndexChanges()
+        self.from_cache = False
+        with profiling.phase("discovery"):
+            self._load()
+
+    def _load(self) -> None:
+        payload = read_artifact(self.cache_path) if self.use_cache else None
+        cached: Dict[str, DishRecord] = {}
+        if payload and payload.get("root") == str(self.root):
+            cached = {fields["path"].as_posix(): DishRecord(**fields) for fields in payload["records"]}
+
+        changes = IndexChanges()
+        dirty = payload is None or payload.get("root") != str(self.root)
+        records = []
+        for path in discover_dish_files(self.root):
+            previous = cached.pop(path.as_posix(), None)
+            try:
+                st = path.stat()
+                if previous and previous.mtime_ns == st.st_mtime_ns and previous.size == st.st_size:
+                    records.append(previous)
+                    continue
+                raw = path.read_bytes()
+            except OSError as exc:
+                # Unreadable or deleted since discovery: reported like a parse error
+                records.append(_unreadable_record(path, exc))
+                (changes.modified if previous else changes.added).append(path)
+                dirty = True
+                continue
+
+            profiling.record_read(path, len(raw))
+            if previous and previous.sha256 == hashlib.sha256(raw).hexdigest():
+                # Touched but unchanged (checkout, rebase): keep the parse, refresh the stat
+                previous.mtime_ns, previous.size = st.st_mtime_ns, st.st_size
+                records.append(previous)
+                dirty = True
+                continue
+
+            records.append(_record_from_bytes(path, st, raw))
+            (changes.modified if previous else changes.added).append(path)
+            dirty = True
+
+        # Anything left in the old artifact no longer exists on disk
+        changes.removed = sorted(record.path for record in cached.values())
+        if changes.removed:
+            dirty = True
+
+        self.records = records
+        self.changes = changes
+        self.from_cache = payload is not None and not changes
+
+        if self.use_cache and dirty:
+            try:
+                with profiling.phase("write"):
+                    write_artifact(
+                        self.cache_path,
+                        {
+                            "version": CACHE_VERSION,
+                            "root": str(self.root),
+                            "records": [vars(record) for record in self.records],
+                        },
+                    )
+            except OSError as exc:
+                print(f"Warning: Could not write food-bank cache {self.cache_path}: {exc}", file=sys.stderr)
+
+        for record in self.records:
+            entry_id = record.entry_id
+            if entry_id:
+                self._by_id[entry_id] = record
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, entry_id: str) -> bool:
+        return entry_id in self._by_id
+
+    def dishes(self) -> Iterator[DishRecord]:
+        """Yield records whose YAML parsed to a mapping with an 'id'."""
+        for record in self.records:
+            if isinstance(record.data, dict) and "id" in record.data:
+                yield record
+
+    def path_for(self, entry_id: str) -> Path:
+        record = self._by_id.get(entry_id)
+        if record is None:
+            raise KeyError(f"Food bank entry '{entry_id}' not found.")
+        return record.path
+
+    def get(self, entry_id: str) -> dict:
+        record = self._by_id.get(entry_id)
+        if record is None:
+            raise KeyError(f"Food bank entry '{entry_id}' not found.")
+        return record.data
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compile the food-bank index artifact.")
+    parser.add_argument("--root", type=Path, default=DEFAULT_ROOT, help="Food-bank root (default: data/food-data-bank)")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore any existing artifact and recompile")
+    profiling.add_profile_argument(parser)
+    args = parser.parse_args()
+    profiling.setup("food_bank_index", args.profile)
+
+    if not args.root.exists():
+        print(f"Error: Could not find {args.root}", file=sys.stderr)
+        return 1
+
+    if args.rebuild:
+        try:
+            default_cache_path(args.root).unlink()
+        except FileNotFoundError:
+            pass
+
+    index = FoodBankIndex(args.root)
+    changes = index.changes
+    failed = sum(1 for record in index.records if record.error)
+    print(f"✓ Indexed {len(index.records)} dish files ({len(index)} ids, {failed} unparseable)")
+    print(f"✓ Re-parsed {len(changes.added) + len(changes.modified)}, evicted {len(changes.removed)}")
+    print(f"✓ Artifact: {index.cache_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
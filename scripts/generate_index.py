@@ -8,13 +8,18 @@ an index file organized by venue/category folders.
 The index is auto-generated and should not be manually edited.
 """
 
+import re
 import sys
 import yaml
+import argparse
 import subprocess
 from pathlib import Path
 from datetime import datetime, timezone
 from collections import defaultdict
 
+import profiling
+from food_bank_index import FoodBankIndex, default_cache_path, parse_dish_file as read_dish_record
+
 
 def slugify_anchor(text):
     """Convert dish header to markdown anchor format.
@@ -23,7 +28,6 @@ def slugify_anchor(text):
         "Sweet Potato Wedges (Simple Health Kitchen)" -> "sweet-potato-wedges-simple-health-kitchen"
         "Pistachios, 30 g" -> "pistachios-30-g"
     """
-    import re
     anchor = text.lower()
     anchor = re.sub(r'[^\w\s-]', '', anchor)
     anchor = re.sub(r'[-\s]+', '-', anchor)
@@ -31,30 +35,21 @@ def slugify_anchor(text):
     return anchor
 
 
-def parse_dish_file(filepath):
-    """Parse a dish file and extract metadata.
+def dish_from_record(record):
+    """Build index metadata from a compiled food-bank record.
 
     Returns: dict with 'name', 'id', 'filepath', 'category_path' or None on error
     """
-    content = filepath.read_text(encoding='utf-8')
-    lines = content.split('\n')
-
-    # Extract header (## Dish Name)
-    dish_name = None
-    for line in lines:
-        if line.startswith('## '):
-            dish_name = line[3:].strip()
-            break
+    filepath = record.path
 
-    if not dish_name:
+    # Files without a header (## Dish Name) are not dishes
+    if not record.name:
         return None
 
-    # Extract YAML block
     try:
-        yaml_start = content.index('```yaml') + 7
-        yaml_end = content.index('```', yaml_start)
-        yaml_content = content[yaml_start:yaml_end].strip()
-        data = yaml.safe_load(yaml_content)
+        if record.error:
+            raise ValueError(record.error)
+        data = record.data
 
         # Get category path (e.g., "venues/simple-health-kitchen")
         try:
@@ -66,7 +61,7 @@ def parse_dish_file(filepath):
             return None
 
         return {
-            'name': dish_name,
+            'name': record.name,
             'id': data.get('id', 'unknown'),
             'filepath': filepath,
             'category_path': category_path,
@@ -84,30 +79,55 @@ def parse_dish_file(filepath):
         return None
 
 
-def scan_data_bank(data_bank_dir):
-    """Scan the food-data-bank directory and extract all dishes.
+def parse_dish_file(filepath):
+    """Parse a dish file and extract metadata.
+
+    Returns: dict with 'name', 'id', 'filepath', 'category_path' or None on error
+    """
+    return dish_from_record(read_dish_record(filepath))
+
+
+def dishes_from_index(index):
+    """Extract dish metadata from a compiled FoodBankIndex.
 
     Returns: tuple of (list of dish metadata dicts, list of failed file paths)
     """
     dishes = []
     failed_files = []
 
-    # Find all .md files recursively
-    for filepath in sorted(data_bank_dir.rglob('*.md')):
-        # Skip README and RESEARCH files
-        if filepath.name in ['README.md', 'RESEARCH.md', 'index.md']:
-            continue
-
-        dish_data = parse_dish_file(filepath)
+    for record in index.records:
+        dish_data = dish_from_record(record)
         if dish_data:
             dishes.append(dish_data)
         else:
             # Track files that failed to parse
-            failed_files.append(filepath)
+            failed_files.append(record.path)
 
     return dishes, failed_files
 
 
+def scan_data_bank(data_bank_dir, use_cache=True):
+    """Scan the food-data-bank directory and extract all dishes.
+
+    Dish files are read through the shared compiled index, so unchanged
+    files are not re-parsed between runs.
+
+    Returns: tuple of (list of dish metadata dicts, list of failed file paths)
+    """
+    return dishes_from_index(FoodBankIndex(data_bank_dir, use_cache=use_cache))
+
+
+def changed_categories_for(paths):
+    """Map changed dish file paths to the set of category paths they touch."""
+    categories = set()
+    for filepath in paths:
+        try:
+            categories.add(category_path_for(Path(filepath)))
+        except (ValueError, IndexError):
+            continue
+    return categories
+
+
 def organize_by_category(dishes):
     """Organize dishes by their category path.
 
@@ -190,28 +210,39 @@ def get_git_metadata():
         return None
 
 
-def generate_index_file(dishes, output_path):
-    """Generate the index markdown file with rich metadata."""
+# Dedicated artifact so FoodBankIndex.changes reflects what changed since the
+# index file was last written (other scripts refresh the shared artifact).
+INDEX_CACHE_NAME = 'food-data-bank-index.pickle'
+
+INDEX_FOOTER = "---\n\n*Index generated automatically by scanning the food-data-bank directory structure.*\n"
+
+# Matches the start of a category section and captures its category path
+SECTION_RE = re.compile(r'^## .*\n\n\*Location: `data/food-data-bank/(.+)/`\*$', re.MULTILINE)
+
+
+def category_path_for(filepath):
+    """Return the category path (e.g. "venues/simple-health-kitchen") of a dish file."""
+    return str(filepath.relative_to(filepath.parents[2]).parent)
+
+
+def category_sort_key(cat_path):
+    """Sort categories: venues first, then packaged, then generic."""
+    if cat_path.startswith('venues/'):
+        return (0, cat_path)
+    elif cat_path.startswith('packaged/'):
+        return (1, cat_path)
+    else:
+        return (2, cat_path)
+
+
+def render_header(dishes, sorted_categories):
+    """Render the front matter and overview that precede the category sections."""
     # Get current timestamp
     timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
 
     # Get git metadata
     git_meta = get_git_metadata()
 
-    # Organize by category
-    by_category = organize_by_category(dishes)
-
-    # Sort categories: venues first, then packaged, then generic
-    def category_sort_key(cat_path):
-        if cat_path.startswith('venues/'):
-            return (0, cat_path)
-        elif cat_path.startswith('packaged/'):
-            return (1, cat_path)
-        else:
-            return (2, cat_path)
-
-    sorted_categories = sorted(by_category.keys(), key=category_sort_key)
-
     # Build metadata section
     metadata_lines = [
         "---",
@@ -257,33 +288,119 @@ Total dishes: {len(dishes)}
 ---
 
 """
+    return content
+
+
+def render_category_section(category_path, category_dishes, output_path):
+    """Render one category section of the index."""
+    category_name = format_category_name(category_path)
+
+    content = f"## {category_name}\n\n"
+    content += f"*Location: `data/food-data-bank/{category_path}/`*\n\n"
+    content += f"**{len(category_dishes)} dishes:**\n\n"
+
+    for dish in sorted(category_dishes, key=lambda d: d['name'].lower()):
+        # Format: - [Dish Name](path/to/file.md) {#dish_id}
+        rel_path = dish['filepath'].relative_to(output_path.parent)
+        content += f"- [{dish['name']}]({rel_path}) {{#{dish['id']}}}\n"
+
+    content += "\n"
+    return content
 
-    # Add each category section
-    for category_path in sorted_categories:
-        category_dishes = by_category[category_path]
-        category_name = format_category_name(category_path)
 
-        content += f"## {category_name}\n\n"
-        content += f"*Location: `data/food-data-bank/{category_path}/`*\n\n"
-        content += f"**{len(category_dishes)} dishes:**\n\n"
+def split_index_sections(content):
+    """Split an existing index into its category sections.
 
-        for dish in sorted(category_dishes, key=lambda d: d['name'].lower()):
-            # Format: - [Dish Name](path/to/file.md) {#dish_id}
-            rel_path = dish['filepath'].relative_to(output_path.parent)
-            content += f"- [{dish['name']}]({rel_path}) {{#{dish['id']}}}\n"
+    Returns: dict mapping category_path -> section text, or None if the
+    file does not look like a generated index
+    """
+    if not content.endswith(INDEX_FOOTER):
+        return None
+    body_end = len(content) - len(INDEX_FOOTER)
+
+    matches = list(SECTION_RE.finditer(content, 0, body_end))
+    sections = {}
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else body_end
+        sections[match.group(1)] = content[match.start():end]
+    return sections
+
+
+def generate_index_file(dishes, output_path):
+    """Generate the index markdown file with rich metadata."""
+    with profiling.phase("render"):
+        # Organize by category
+        by_category = organize_by_category(dishes)
+        sorted_categories = sorted(by_category.keys(), key=category_sort_key)
+
+        content = render_header(dishes, sorted_categories)
 
-        content += "\n"
+        # Add each category section
+        for category_path in sorted_categories:
+            content += render_category_section(category_path, by_category[category_path], output_path)
 
-    content += "---\n\n"
-    content += "*Index generated automatically by scanning the food-data-bank directory structure.*\n"
+        content += INDEX_FOOTER
 
-    output_path.write_text(content, encoding='utf-8')
+    with profiling.phase("write"):
+        output_path.write_text(content, encoding='utf-8')
+    profiling.record_write(output_path)
 
     print(f"✓ Generated index with {len(dishes)} dishes")
     print(f"✓ Written to: {output_path}")
 
 
+def update_index_file(dishes, output_path, changed_categories):
+    """Rewrite only the given category sections of an existing index.
+
+    Sections for every other category are copied byte-for-byte from the
+    current file; only the header (timestamp, counts) is re-rendered.
+    Falls back to a full rebuild when there is no usable index yet.
+    """
+    sections = None
+    if output_path.exists():
+        existing = output_path.read_text(encoding='utf-8')
+        profiling.record_read(output_path)
+        sections = split_index_sections(existing)
+    if sections is None:
+        generate_index_file(dishes, output_path)
+        return
+
+    with profiling.phase("render"):
+        by_category = organize_by_category(dishes)
+        sorted_categories = sorted(by_category.keys(), key=category_sort_key)
+
+        updated = 0
+        for category_path in sorted_categories:
+            if category_path in changed_categories or category_path not in sections:
+                sections[category_path] = render_category_section(
+                    category_path, by_category[category_path], output_path
+                )
+                updated += 1
+
+        content = render_header(dishes, sorted_categories)
+        content += ''.join(sections[category_path] for category_path in sorted_categories)
+        content += INDEX_FOOTER
+
+    with profiling.phase("write"):
+        output_path.write_text(content, encoding='utf-8')
+    profiling.record_write(output_path)
+
+    removed = len(set(sections) - set(by_category))
+    print(f"✓ Updated index with {len(dishes)} dishes ({updated} categories rewritten, {removed} removed)")
+    print(f"✓ Written to: {output_path}")
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Generate the food-data-bank index.")
+    parser.add_argument("--no-cache", action="store_true", help="Parse every dish file instead of reusing the compiled index")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Rewrite only the category sections whose dish files changed since the last run")
+    parser.add_argument("--changed", nargs="*", default=[], metavar="PATH",
+                        help="Extra dish files to treat as changed in --incremental mode (e.g. from git diff)")
+    profiling.add_profile_argument(parser)
+    args = parser.parse_args()
+    profiling.setup("generate_index", args.profile)
+
     # Determine paths relative to script location
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
@@ -295,13 +412,24 @@ def main():
         return 1
 
     print(f"Scanning: {data_bank_dir}")
-    dishes, failed_files = scan_data_bank(data_bank_dir)
+    index = FoodBankIndex(
+        data_bank_dir,
+        cache_path=default_cache_path(data_bank_dir).with_name(INDEX_CACHE_NAME),
+        use_cache=not args.no_cache,
+    )
+    with profiling.phase("compute"):
+        dishes, failed_files = dishes_from_index(index)
 
     if not dishes:
         print("Warning: No dishes found in data bank!")
         return 1
 
-    generate_index_file(dishes, index_path)
+    if args.incremental:
+        changes = index.changes
+        changed_paths = changes.added + changes.removed + changes.modified + [Path(p) for p in args.changed]
+        update_index_file(dishes, index_path, changed_categories_for(changed_paths))
+    else:
+        generate_index_file(dishes, index_path)
 
     # Report any files that failed to parse
     if failed_files:
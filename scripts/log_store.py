@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Reverse index from food_bank_id to the daily logs in data/logs/YYYY-MM/DD.yaml.
+
+Every logged item becomes one row holding its name, food_bank_id and
+(log file, entry, item) position, so the logs that reference a food-bank
+entry are found without walking every log (check_log_vs_food_bank
+--changed-dish, update_logs_from_food_bank). Per-day and per-period
+nutrient totals live in daily_rollup; this module also provides the log
+discovery and NUTRIENT_FIELDS both share.
+
+The index is materialized incrementally: each log file is parsed into a
+segment that is cached in data/.cache/logs.pickle and reused for as long as
+the file's size and mtime are unchanged. Only new or edited days are parsed,
+so logs written by update_logs_from_food_bank or merge_food_logs are picked
+up on the next load.
+
+Usage:
+    python3 scripts/log_store.py [--logs-dir data/logs] [--food-bank-id ID ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import yaml
+
+import profiling
+from food_bank_index import read_artifact, write_artifact
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_LOGS_DIR = PROJECT_ROOT / "data" / "logs"
+
+# Bump whenever the pickled segment layout changes so stale stores are rebuilt.
+CACHE_VERSION = 2
+
+# The 52 schema nutrients plus the optional alcohol fields, in schema order.
+NUTRIENT_FIELDS: Sequence[str] = (
+    # Macros & energy
+    "energy_kcal", "protein_g", "fat_g", "sat_fat_g", "mufa_g", "pufa_g",
+    "trans_fat_g", "cholesterol_mg",
+    # Carbohydrates
+    "carbs_total_g", "carbs_available_g", "sugar_g", "fiber_total_g",
+    "fiber_soluble_g", "fiber_insoluble_g", "polyols_g",
+    # Essential minerals
+    "sodium_mg", "potassium_mg", "calcium_mg", "magnesium_mg",
+    "phosphorus_mg", "chloride_mg", "sulfur_g",
+    # Trace minerals
+    "iron_mg", "zinc_mg", "copper_mg", "manganese_mg", "selenium_ug",
+    "iodine_ug", "chromium_ug", "molybdenum_ug",
+    # Fat-soluble vitamins
+    "vitamin_a_ug", "vitamin_d_ug", "vitamin_e_mg", "vitamin_k_ug",
+    # B vitamins
+    "vitamin_b1_mg", "vitamin_b2_mg", "vitamin_b3_mg", "vitamin_b5_mg",
+    "vitamin_b6_mg", "vitamin_b7_ug", "vitamin_b9_ug", "vitamin_b12_ug",
+    "choline_mg",
+    # Water-soluble vitamins
+    "vitamin_c_mg",
+    # Fatty acids
+    "omega3_epa_mg", "omega3_dha_mg", "omega3_ala_g", "omega6_la_g",
+    # Ultra-trace minerals
+    "boron_mg", "silicon_mg", "vanadium_ug", "nickel_ug",
+    # Alcohol (optional)
+    "alcohol_g", "alcohol_energy_kcal",
+)
+
+
+def default_cache_path(logs_dir: Path) -> Path:
+    """Return the store path for a logs directory (a .cache dir next to it)."""
+    return logs_dir.parent / ".cache" / f"{logs_dir.name}.pickle"
+
+
+def log_date_for(path: Path) -> Optional[date]:
+    """Date of a log file from its YYYY-MM/DD.yaml location, or None."""
+    try:
+        return datetime.strptime(f"{path.parent.name}-{path.stem}", "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def discover_log_files(logs_dir: Path) -> List[Tuple[date, Path]]:
+    """Return (date, path) for every YYYY-MM/DD.yaml log, in date order."""
+    found = []
+    for path in logs_dir.glob("*/*.yaml"):
+        log_date = log_date_for(path)
+        if log_date is not None:
+            found.append((log_date, path))
+    found.sort()
+    return found
+
+
+@dataclass
+class LogSegment:
+    """The rows contributed by one daily log file."""
+
+    path: Path
+    date: date
+    mtime_ns: int
+    size: int
+    names: List[str] = field(default_factory=list)
+    food_bank_ids: List[Optional[str]] = field(default_factory=list)
+    entry_index: List[int] = field(default_factory=list)
+    item_index: List[int] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def parse_log_segment(path: Path, log_date: date) -> LogSegment:
+    """Parse one log file into a LogSegment (never raises; errors go in segment.error)."""
+    segment = LogSegment(path, log_date, 0, -1)
+
+    try:
+        st = path.stat()
+        with open(path, "r") as f, profiling.phase("yaml_parse"):
+            data = yaml.safe_load(f)
+    except OSError as exc:
+        # Unreadable or deleted since discovery; mtime/size never match a real
+        # stat, so the file is retried on the next run
+        segment.error = f"Failed to parse: {exc}"
+        return segment
+    except yaml.YAMLError as exc:
+        segment.mtime_ns, segment.size = st.st_mtime_ns, st.st_size
+        segment.error = f"Failed to parse: {exc}"
+        return segment
+    segment.mtime_ns, segment.size = st.st_mtime_ns, st.st_size
+    profiling.record_read(path, st.st_size)
+
+    if not isinstance(data, dict):
+        segment.error = f"Invalid YAML structure (expected dict, got {type(data).__name__})"
+        return segment
+
+    entries = data.get("entries") or []
+    if not isinstance(entries, list):
+        segment.error = f"'entries' must be a list (got {type(entries).__name__})"
+        return segment
+
+    for entry_idx, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            continue
+        items = entry.get("items") or []
+        if not isinstance(items, list):
+            continue
+        for item_idx, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            segment.names.append(str(item.get("name", "") or ""))
+            segment.food_bank_ids.append(item.get("food_bank_id") or None)
+            segment.entry_index.append(entry_idx)
+            segment.item_index.append(item_idx)
+
+    return segment
+
+
+class LogStore:
+    """Item-per-row view over all daily logs, indexed by food_bank_id."""
+
+    def __init__(
+        self,
+        logs_dir: Path = DEFAULT_LOGS_DIR,
+        cache_path: Optional[Path] = None,
+        use_cache: bool = True,
+    ) -> None:
+        # Resolved so relative and absolute callers share one cache
+        self.logs_dir = Path(logs_dir).resolve()
+        self.cache_path = cache_path or default_cache_path(self.logs_dir)
+        self.use_cache = use_cache
+        self.segments: List[LogSegment] = []
+        self.parsed: List[Path] = []
+        with profiling.phase("discovery"):
+            self._load()
+        with profiling.phase("compute"):
+            self._materialize()
+
+    def _load(self) -> None:
+        payload = read_artifact(self.cache_path, CACHE_VERSION) if self.use_cache else None
+        cached: Dict[str, LogSegment] = {}
+        if payload and payload.get("logs_dir") == str(self.logs_dir):
+            cached = {str(fields["path"]): LogSegment(**fields) for fields in payload["segments"]}
+
+        dirty = payload is None
+        for log_date, path in discover_log_files(self.logs_dir):
+            segment = cached.pop(str(path), None)
+            try:
+                st = path.stat()
+            except OSError:
+                st = None  # parse_log_segment reports it
+            if segment is None or st is None or segment.mtime_ns != st.st_mtime_ns or segment.size != st.st_size:
+                segment = parse_log_segment(path, log_date)
+                self.parsed.append(path)
+                dirty = True
+            self.segments.append(segment)
+        if cached:
+            dirty = True
+
+        if self.use_cache and dirty:
+            try:
+                with profiling.phase("write"):
+                    write_artifact(
+                        self.cache_path,
+                        {
+                            "version": CACHE_VERSION,
+                            "logs_dir": str(self.logs_dir),
+                            "segments": [vars(segment) for segment in self.segments],
+                        },
+                    )
+            except OSError as exc:
+                print(f"Warning: Could not write log store cache {self.cache_path}: {exc}", file=sys.stderr)
+
+    def _materialize(self) -> None:
+        """Concatenate per-file segments into whole-index rows."""
+        self.names: List[str] = []
+        self.food_bank_ids: List[Optional[str]] = []
+        self.entry_index: List[int] = []
+        self.item_index: List[int] = []
+        self.file_index: List[int] = []
+
+        for file_idx, segment in enumerate(self.segments):
+            self.names.extend(segment.names)
+            self.food_bank_ids.extend(segment.food_bank_ids)
+            self.entry_index.extend(segment.entry_index)
+            self.item_index.extend(segment.item_index)
+            self.file_index.extend([file_idx] * len(segment))
+
+        self._reverse: Optional[Dict[str, List[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _reverse_index(self) -> Dict[str, List[int]]:
+        """food_bank_id -> row numbers, built on first use from the cached segments."""
+        if self._reverse is None:
+            reverse: Dict[str, List[int]] = {}
+            for row, food_id in enumerate(self.food_bank_ids):
+                if food_id:
+                    reverse.setdefault(food_id, []).append(row)
+            self._reverse = reverse
+        return self._reverse
+
+    def occurrences(self, food_bank_id: str) -> List[Tuple[Path, int, int]]:
+        """Return (log file, entry index, item index) for every item logged with food_bank_id."""
+        return [
+            (self.segments[self.file_index[row]].path, self.entry_index[row], self.item_index[row])
+            for row in self._reverse_index().get(food_bank_id, [])
+        ]
+
+    def files_referencing(self, food_bank_ids: Iterable[str]) -> List[Path]:
+        """Return the log files (in date order) that log any of food_bank_ids."""
+        reverse = self._reverse_index()
+        file_idxs = {self.file_index[row] for food_id in food_bank_ids for row in reverse.get(food_id, [])}
+        return [self.segments[idx].path for idx in sorted(file_idxs)]
+
+    @property
+    def errors(self) -> List[Tuple[Path, str]]:
+        """(path, message) for every log file that could not be read."""
+        return [(segment.path, segment.error) for segment in self.segments if segment.error]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the food_bank_id -> log reverse index.")
+    parser.add_argument("--logs-dir", type=Path, default=DEFAULT_LOGS_DIR, help="Logs directory (default: data/logs)")
+    parser.add_argument("--food-bank-id", dest="food_bank_ids", action="append", default=[], metavar="ID",
+                        help="List the logged items with this food_bank_id (repeatable)")
+    parser.add_argument("--no-cache", action="store_true", help="Parse every log file instead of reusing the index")
+    profiling.add_profile_argument(parser)
+    args = parser.parse_args()
+    profiling.setup("log_store", args.profile)
+
+    if not args.logs_dir.exists():
+        print(f"Error: Could not find {args.logs_dir}", file=sys.stderr)
+        return 1
+
+    store = LogStore(args.logs_dir, use_cache=not args.no_cache)
+    for path, error in store.errors:
+        print(f"Warning: Skipping {path}: {error}", file=sys.stderr)
+
+    print(f"✓ {len(store.segments)} log files, {len(store)} items ({len(store.parsed)} files re-parsed)")
+    with profiling.phase("compute"):
+        for food_bank_id in args.food_bank_ids:
+            occurrences = store.occurrences(food_bank_id)
+            print(f"✓ {food_bank_id}: {len(occurrences)} items")
+            for path, entry, item in occurrences:
+                print(f"  {path.relative_to(store.logs_dir)} entry {entry} item {item}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,8 +6,19 @@ This script discovers claude/* branches, extracts food log files, merges them
 intelligently (concatenating entries by timestamp), and outputs the merged files
 to the daily-logs working tree for the GitHub Actions workflow to commit.
 
+Progress is kept in .github/workflows/processed-branches.json: the branch
+head SHA last processed and the blob SHA of every log file merged from it.
+Branches whose head has not moved are skipped outright; on branches that
+moved, files whose blob was already merged are not re-extracted, re-parsed
+or re-validated.
+
+With --jobs N, git reads fan out over N threads (each with its own
+`git cat-file --batch` process) and YAML parsing plus schema validation
+over N worker processes. Results are always merged in branch order, so
+the output does not depend on N.
+
 Usage:
-    python scripts/merge_food_logs.py
+    python scripts/merge_food_logs.py [--jobs N] [--profile]
 
 Exit codes:
     0 - Success (files merged successfully)
@@ -15,15 +26,24 @@ Exit codes:
     2 - Errors (YAML parse failures, validation errors)
 """
 
+import argparse
+import hashlib
+import heapq
+import itertools
+import os
 import subprocess
 import sys
+import threading
 import yaml
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from collections import defaultdict
 import json
 
+import profiling
+
 class MergeConflict(Exception):
     """Raised when a merge conflict requires manual resolution."""
     pass
@@ -91,17 +111,22 @@ def discover_claude_branches(remote: str) -> List[Tuple[str, str]]:
     print(f"   Found {len(branches)} claude/* branches")
     return branches
 
-def get_log_files_from_branch(branch: str, remote: str) -> Dict[str, str]:
+def get_log_files_from_branch(branch: str, remote: str,
+                              reader: Optional['GitObjectReader'] = None) -> Dict[str, str]:
     """
     Get all food log files from a branch.
 
     Args:
         branch: Branch name (e.g., 'claude/...')
         remote: Git remote name (e.g., 'origin')
+        reader: Batch reader to walk the tree with instead of `git ls-tree`
 
     Returns:
         Dict mapping file paths to blob SHAs
     """
+    if reader is not None:
+        return reader.log_files(f'{remote}/{branch}')
+
     try:
         output = run_git_command([
             'git', 'ls-tree', '-r', f'{remote}/{branch}', 'data/logs/'
@@ -128,7 +153,8 @@ def get_log_files_from_branch(branch: str, remote: str) -> Dict[str, str]:
 
     return log_files
 
-def extract_file_content(branch: str, file_path: str, remote: str) -> str:
+def extract_file_content(branch: str, file_path: str, remote: str,
+                         reader: Optional['GitObjectReader'] = None, blob_sha: Optional[str] = None) -> str:
     """
     Extract file content from a branch using git show.
 
@@ -136,16 +162,224 @@ def extract_file_content(branch: str, file_path: str, remote: str) -> str:
         branch: Branch name (e.g., 'claude/...')
         file_path: Path to file in repo
         remote: Git remote name (e.g., 'origin')
+        reader: Batch reader to fetch the blob through instead of `git show`
+        blob_sha: Blob SHA from the tree listing (lets the reader skip path lookup)
     """
+    if reader is not None:
+        obj = reader.read(blob_sha or f'{remote}/{branch}:{file_path}')
+        if obj is None or obj[1] != 'blob':
+            print(f"⚠️  Failed to extract {file_path} from {branch}", file=sys.stderr)
+            raise KeyError(f"{branch}:{file_path} not found")
+        return obj[2].decode('utf-8').strip()
+
     try:
         content = run_git_command([
             'git', 'show', f'{remote}/{branch}:{file_path}'
         ])
+        profiling.record_read(f'{remote}/{branch}:{file_path}', len(content.encode('utf-8')))
         return content
     except subprocess.CalledProcessError:
         print(f"⚠️  Failed to extract {file_path} from {branch}", file=sys.stderr)
         raise
 
+class GitObjectReader:
+    """
+    Read many git objects through one long-lived `git cat-file --batch` process.
+
+    Listing a branch's logs walks the data/logs/ tree objects and file
+    contents are fetched by blob SHA, so aggregating N branches costs one
+    subprocess instead of one `git ls-tree` per branch plus one `git show`
+    per (branch, file).
+    """
+
+    def __init__(self):
+        self._proc = subprocess.Popen(
+            ['git', 'cat-file', '--batch'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._proc.poll() is None:
+            self._proc.stdin.close()
+            self._proc.wait()
+        self._proc.stdout.close()
+        self._proc.stderr.close()
+
+    def read(self, spec: str) -> Optional[Tuple[str, str, bytes]]:
+        """
+        Look up one object by SHA or revision spec (e.g. 'origin/x:path').
+
+        Returns:
+            (sha, type, content), or None if the object does not exist
+        """
+        if '\n' in spec:
+            raise ValueError(f"Invalid object spec: {spec!r}")
+        self._proc.stdin.write(spec.encode('utf-8') + b'\n')
+        self._proc.stdin.flush()
+
+        header = self._proc.stdout.readline()
+        if not header:
+            raise RuntimeError(f"git cat-file exited unexpectedly: {self._proc.stderr.read().decode(errors='replace')}")
+        parts = header.rstrip(b'\n').split(b' ')
+        if len(parts) != 3:
+            # "<spec> missing" / "<spec> ambiguous"
+            return None
+
+        sha, obj_type, size = parts[0].decode(), parts[1].decode(), int(parts[2])
+        content = self._proc.stdout.read(size)
+        self._proc.stdout.read(1)  # trailing LF
+        profiling.record_read(sha, size)
+        return sha, obj_type, content
+
+    def read_blob(self, sha: str) -> bytes:
+        """Return the content of a blob, raising KeyError if it is missing."""
+        obj = self.read(sha)
+        if obj is None or obj[1] != 'blob':
+            raise KeyError(f"Blob {sha} not found")
+        return obj[2]
+
+    def list_tree(self, spec: str, prefix: str = '') -> Dict[str, str]:
+        """
+        Recursively list the blobs under a tree.
+
+        Returns:
+            Dict mapping path (prefix + relative path) to blob SHA; empty if
+            spec does not name a tree
+        """
+        obj = self.read(spec)
+        if obj is None or obj[1] != 'tree':
+            return {}
+        sha, _, content = obj
+        hash_len = len(sha) // 2
+
+        blobs = {}
+        pos = 0
+        while pos < len(content):
+            space = content.index(b' ', pos)
+            nul = content.index(b'\0', space)
+            mode = content[pos:space]
+            name = content[space + 1:nul].decode('utf-8', errors='surrogateescape')
+            entry_sha = content[nul + 1:nul + 1 + hash_len].hex()
+            pos = nul + 1 + hash_len
+
+            path = f"{prefix}{name}"
+            if mode == b'40000':
+                blobs.update(self.list_tree(entry_sha, f"{path}/"))
+            elif not mode.startswith(b'160'):  # skip submodules
+                blobs[path] = entry_sha
+        return blobs
+
+    def log_files(self, treeish: str) -> Dict[str, str]:
+        """Return {path: blob SHA} for the food logs in data/logs/ at treeish."""
+        return {
+            path: sha
+            for path, sha in self.list_tree(f"{treeish}:data/logs", 'data/logs/').items()
+            if path.endswith('.yaml') and 'SCHEMA' not in path
+        }
+
+class GitReaderPool:
+    """
+    Hand each thread its own GitObjectReader.
+
+    A cat-file process answers one request at a time, so concurrent branch
+    reads need one process per worker thread. Readers are started lazily
+    and all closed together.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._readers: List[GitObjectReader] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get(self) -> GitObjectReader:
+        reader = getattr(self._local, 'reader', None)
+        if reader is None:
+            reader = self._local.reader = GitObjectReader()
+            with self._lock:
+                self._readers.append(reader)
+        return reader
+
+    def close(self):
+        with self._lock:
+            readers, self._readers = self._readers, []
+        for reader in readers:
+            reader.close()
+
+def read_branch_logs(branch: str, remote: str, already_merged: Dict[str, str],
+                     readers: GitReaderPool) -> Tuple[Dict[str, str], List[tuple]]:
+    """
+    List a branch's log files and extract the ones not merged before.
+
+    Args:
+        branch: Branch name (e.g., 'claude/...')
+        remote: Git remote name (e.g., 'origin')
+        already_merged: path -> blob SHA merged from this branch on a previous run
+        readers: Pool providing this thread's GitObjectReader
+
+    Returns:
+        (log_files, extracted) where log_files maps every log path to its
+        blob SHA and extracted holds (path, blob SHA, content, error) for
+        each changed file in tree order; exactly one of content and error is None
+    """
+    reader = readers.get()
+    log_files = get_log_files_from_branch(branch, remote, reader)
+    extracted = []
+    for file_path, file_sha in log_files.items():
+        if already_merged.get(file_path) == file_sha:
+            continue
+        try:
+            content = extract_file_content(branch, file_path, remote, reader, file_sha)
+        except Exception as e:
+            extracted.append((file_path, file_sha, None, str(e)))
+        else:
+            extracted.append((file_path, file_sha, content, None))
+    return log_files, extracted
+
+def parse_log_content(file_path: str, content: str) -> Tuple[Optional[dict], List[str], Optional[Tuple[str, str]]]:
+    """
+    Parse and validate one extracted log file (safe to run in a worker process).
+
+    Returns:
+        (log_data, validation errors, failure) where failure is a
+        (label, message) pair if the file could not be parsed at all
+    """
+    try:
+        log_data = yaml.safe_load(content)
+    except yaml.YAMLError as e:
+        return None, [], ('YAML error', f"YAML parse error: {e}")
+    try:
+        errors = validate_log_schema(log_data, file_path)
+    except Exception as e:
+        return None, [], ('Error', f"unexpected error: {e}")
+    return log_data, errors, None
+
+def _parse_log_item(item: Tuple[str, str]):
+    return parse_log_content(*item)
+
+def map_ordered(executor_class, fn: Callable, items: Iterable, jobs: int) -> list:
+    """Apply fn to every item, in a pool of `jobs` workers if jobs > 1, keeping input order."""
+    items = list(items)
+    if jobs <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    workers = min(jobs, len(items))
+    with executor_class(max_workers=workers) as executor:
+        # chunksize only batches process-pool submissions; threads ignore it
+        return list(executor.map(fn, items, chunksize=max(1, len(items) // (workers * 4))))
+
 def validate_log_schema(log_data: dict, file_path: str) -> List[str]:
     """
     Validate food log schema.
@@ -227,13 +461,105 @@ def validate_log_schema(log_data: dict, file_path: str) -> List[str]:
 
     return errors
 
-def merge_log_files(files_by_branch: Dict[str, dict], file_path: str) -> dict:
+def entries_by_timestamp(entries: List[dict]) -> List[dict]:
+    """Return a branch's entries sorted by timestamp (as-is when already sorted)."""
+    if all(a['timestamp'] <= b['timestamp'] for a, b in zip(entries, entries[1:])):
+        return entries
+    return sorted(entries, key=lambda e: e['timestamp'])
+
+def items_digest(items: List[dict]) -> bytes:
+    """Content hash of an entry's items, independent of dict key order."""
+    canonical = json.dumps(items, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).digest()
+
+def merge_entry_group(timestamp: str, entries: List[dict], warnings: Optional[List[str]] = None) -> dict:
+    """
+    Combine the entries that several sources logged at the same timestamp.
+
+    Entries whose items are identical (same items digest) are copies of one
+    meal, e.g. the working-tree version of a branch's entry, and collapse
+    into it. Different item lists are merged item by item and flagged for
+    review.
+    """
+    distinct = []
+    seen_digests = set()
+    unique_notes = []
+    for entry in entries:
+        digest = items_digest(entry['items'])
+        if digest not in seen_digests:
+            seen_digests.add(digest)
+            distinct.append(entry)
+        # Deduplicate notes as well
+        if entry.get('notes') and entry['notes'] not in unique_notes:
+            unique_notes.append(entry['notes'])
+    merged_notes = ' | '.join(unique_notes)
+
+    if len(distinct) == 1:
+        entry = distinct[0]
+        if merged_notes and entry.get('notes') != merged_notes:
+            entry = dict(entry, notes=merged_notes)
+        return entry
+
+    # Entries at the same timestamp with different items - merge items
+    print(f"   ⚠️  REVIEW NEEDED: {len(distinct)} entries merged at {timestamp}")
+    print(f"       This may indicate duplicate logging. Please verify the merged result.")
+
+    all_items = [item for entry in distinct for item in entry['items']]
+
+    # Deduplicate items by comparing key properties
+    # Use name, food_bank_id, quantity, unit as unique identifier
+    seen_items = {}  # key -> item
+    for item in all_items:
+        item_key = (
+            item.get('name'),
+            item.get('food_bank_id'),
+            item.get('quantity'),
+            item.get('unit')
+        )
+
+        if item_key not in seen_items:
+            seen_items[item_key] = item
+        else:
+            # Check if nutrition values differ
+            existing_nutrition = seen_items[item_key].get('nutrition', {})
+            current_nutrition = item.get('nutrition', {})
+
+            if existing_nutrition != current_nutrition:
+                conflict_msg = f"Same item '{item.get('name')}' has different nutrition values"
+                if warnings is not None:
+                    warnings.append(conflict_msg)
+                print(f"      ⚠️  CONFLICT: {conflict_msg}")
+                print(f"         Existing: {existing_nutrition}")
+                print(f"         New:      {current_nutrition}")
+                print(f"         Using first version found")
+
+    deduplicated_items = list(seen_items.values())
+
+    # Log if deduplication occurred
+    if len(deduplicated_items) < len(all_items):
+        print(f"      Deduplicated {len(all_items)} items → {len(deduplicated_items)} unique items")
+
+    merged_entry = {
+        'timestamp': timestamp,
+        'items': deduplicated_items
+    }
+    if merged_notes:
+        merged_entry['notes'] = merged_notes
+    return merged_entry
+
+def merge_log_files(files_by_branch: Dict[str, dict], file_path: str,
+                    warnings: Optional[List[str]] = None) -> dict:
     """
     Merge multiple versions of the same log file from different branches.
 
+    Each branch's entries are timestamp-sorted and k-way merged, so merging
+    k versions of n entries is O(n log k) and only the entries sharing the
+    current timestamp are held beyond the output.
+
     Args:
         files_by_branch: Dict mapping branch_name -> log_data
         file_path: The file path being merged (for error messages)
+        warnings: List to append nutrition-conflict warnings to
 
     Returns:
         Merged log data
@@ -270,96 +596,19 @@ def merge_log_files(files_by_branch: Dict[str, dict], file_path: str) -> dict:
                 f"{base_branch} has {merged_day_type}, {branch} has {data['day_type']}"
             )
 
-    # Merge entries from all branches
-    all_entries = []
-    for branch, data in versions:
-        all_entries.extend(data['entries'])
-
-    # Sort by timestamp
-    all_entries.sort(key=lambda e: e['timestamp'])
-
-    # Check for duplicate timestamps and merge items if needed
+    # k-way merge by timestamp; ties keep branch order
+    merged_stream = heapq.merge(
+        *(entries_by_timestamp(data['entries']) for _, data in versions),
+        key=lambda e: e['timestamp'],
+    )
     merged_entries = []
-    entries_by_timestamp = defaultdict(list)
-
-    for entry in all_entries:
-        entries_by_timestamp[entry['timestamp']].append(entry)
-
-    for timestamp in sorted(entries_by_timestamp.keys()):
-        entries = entries_by_timestamp[timestamp]
-
+    for timestamp, group in itertools.groupby(merged_stream, key=lambda e: e['timestamp']):
+        entries = list(group)
         if len(entries) == 1:
             # No duplicates, add as-is
             merged_entries.append(entries[0])
         else:
-            # Multiple entries with same timestamp - merge items
-            print(f"   ⚠️  REVIEW NEEDED: {len(entries)} entries merged at {timestamp}")
-            print(f"       This may indicate duplicate logging. Please verify the merged result.")
-
-            all_items = []
-            merged_notes = []
-
-            for entry in entries:
-                all_items.extend(entry['items'])
-                if 'notes' in entry and entry['notes']:
-                    merged_notes.append(entry['notes'])
-
-            # Deduplicate items by comparing key properties
-            # Use name, food_bank_id, quantity, unit as unique identifier
-            seen_items = {}  # key -> item
-            nutrition_conflicts = []
-            
-            for item in all_items:
-                # Create unique key from item properties
-                item_key = (
-                    item.get('name'),
-                    item.get('food_bank_id'),
-                    item.get('quantity'),
-                    item.get('unit')
-                )
-
-                if item_key not in seen_items:
-                    seen_items[item_key] = item
-                else:
-                    # Check if nutrition values differ
-                    existing_nutrition = seen_items[item_key].get('nutrition', {})
-                    current_nutrition = item.get('nutrition', {})
-                    
-                    if existing_nutrition != current_nutrition:
-                        conflict_msg = f"Same item '{item.get('name')}' has different nutrition values"
-                        nutrition_conflicts.append(conflict_msg)
-                        print(f"      ⚠️  CONFLICT: {conflict_msg}")
-                        print(f"         Existing: {existing_nutrition}")
-                        print(f"         New:      {current_nutrition}")
-                        print(f"         Using first version found")
-
-            deduplicated_items = list(seen_items.values())
-            
-            # Add nutrition conflicts to warnings if any found
-            if nutrition_conflicts:
-                stats.setdefault('warnings', []).extend(nutrition_conflicts)
-
-            # Log if deduplication occurred
-            if len(deduplicated_items) < len(all_items):
-                print(f"      Deduplicated {len(all_items)} items → {len(deduplicated_items)} unique items")
-
-            merged_entry = {
-                'timestamp': timestamp,
-                'items': deduplicated_items
-            }
-
-            # Deduplicate notes as well
-            unique_notes = []
-            seen_notes = set()
-            for note in merged_notes:
-                if note not in seen_notes:
-                    unique_notes.append(note)
-                    seen_notes.add(note)
-
-            if unique_notes:
-                merged_entry['notes'] = ' | '.join(unique_notes)
-
-            merged_entries.append(merged_entry)
+            merged_entries.append(merge_entry_group(timestamp, entries, warnings))
 
     # Build merged log
     merged_log = {
@@ -494,8 +743,9 @@ def load_existing_log(file_path: str) -> dict:
             print(f"⚠️  Security: Skipping file outside data/logs/: {file_path}")
             return None
             
-        with open(log_file, 'r', encoding='utf-8') as f:
+        with open(log_file, 'r', encoding='utf-8') as f, profiling.phase('yaml_parse'):
             log_data = yaml.safe_load(f)
+        profiling.record_read(log_file)
             
         # Validate the existing log
         errors = validate_log_schema(log_data, file_path)
@@ -511,8 +761,41 @@ def load_existing_log(file_path: str) -> dict:
         print(f"⚠️  Could not load existing {file_path}: {e}")
         return None
 
+def merged_blobs(state: dict, branch: str) -> Dict[str, str]:
+    """
+    Return {path: blob SHA} of the branch's log files already merged on a previous run.
+    """
+    return dict(state['processed'].get(branch, {}).get('blobs', {}))
+
+def record_merged_blobs(state: dict, written_paths: List[str],
+                        blob_shas: Dict[str, Dict[str, str]]):
+    """
+    Remember the blobs that made it into written log files, so later runs skip them.
+
+    Args:
+        state: Processed-branches state (branches must already be marked processed)
+        written_paths: Log paths written to the working tree this run
+        blob_shas: path -> {branch -> blob SHA} for every extracted file
+    """
+    for file_path in written_paths:
+        for branch, blob_sha in blob_shas.get(file_path, {}).items():
+            if branch in state['processed']:
+                state['processed'][branch].setdefault('blobs', {})[file_path] = blob_sha
+
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Merge food logs from claude/* branches into the working tree.")
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help="Threads for git reads and processes for YAML parsing (0 = one per CPU; default: 1)",
+    )
+    profiling.add_profile_argument(parser)
+    args = parser.parse_args()
+    profiling.setup('merge_food_logs', args.profile)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
     print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
     print("Food Log Aggregation from Claude Branches")
     print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
@@ -524,7 +807,8 @@ def main():
     state = load_processed_state()
 
     # Discover branches
-    branches = discover_claude_branches(remote)
+    with profiling.phase('discovery'):
+        branches = discover_claude_branches(remote)
 
     if not branches:
         print("\n✓ No claude/* branches found, nothing to do")
@@ -535,6 +819,7 @@ def main():
         'branches_scanned': 0,
         'branches_skipped': 0,
         'files_extracted': 0,
+        'files_unchanged': 0,
         'files_merged': 0,
         'conflicts': [],
         'errors': [],
@@ -542,24 +827,47 @@ def main():
     }
 
     # Collect all log files grouped by path
-    files_by_path = defaultdict(dict)  # path -> {branch -> (sha, content)}
+    files_by_path = defaultdict(dict)  # path -> {branch -> log data}
+    blob_shas = defaultdict(dict)  # path -> {branch -> blob SHA}
 
+    # Branches whose head moved since the last run
+    to_read = []
+    for branch_name, branch_sha in branches:
+        processed_sha = state['processed'].get(branch_name, {}).get('sha')
+        if processed_sha != branch_sha:
+            to_read.append(branch_name)
+
+    # Fan git reads out over threads, each with its own cat-file process
+    with GitReaderPool() as readers, profiling.phase('discovery'):
+        listings = dict(zip(to_read, map_ordered(
+            ThreadPoolExecutor,
+            lambda name: read_branch_logs(name, remote, merged_blobs(state, name), readers),
+            to_read, jobs,
+        )))
+
+    # Parse and validate every extracted file in worker processes
+    to_parse = [
+        (file_path, content)
+        for branch_name in to_read
+        for file_path, _, content, error in listings[branch_name][1]
+        if error is None
+    ]
+    with profiling.phase('yaml_parse'):
+        parsed = iter(map_ordered(ProcessPoolExecutor, _parse_log_item, to_parse, jobs))
+
+    # Report and collect in branch order so merges are deterministic
     for branch_name, branch_sha in branches:
         stats['branches_scanned'] += 1
 
-        # Check if already processed at this SHA
-        if branch_name in state['processed']:
-            processed_sha = state['processed'][branch_name].get('sha')
-            if processed_sha == branch_sha:
-                print(f"\n✓ {branch_name}")
-                print(f"  Already processed at {branch_sha[:7]}")
-                stats['branches_skipped'] += 1
-                continue
+        if branch_name not in listings:
+            print(f"\n✓ {branch_name}")
+            print(f"  Already processed at {branch_sha[:7]}")
+            stats['branches_skipped'] += 1
+            continue
 
         print(f"\n📂 {branch_name} ({branch_sha[:7]})")
-
-        # Get log files from this branch
-        log_files = get_log_files_from_branch(branch_name, remote)
+        already_merged = merged_blobs(state, branch_name)
+        log_files, extracted = listings[branch_name]
 
         if not log_files:
             print("  No log files found")
@@ -567,42 +875,40 @@ def main():
             continue
 
         print(f"  Found {len(log_files)} log files")
+        stats['files_unchanged'] += len(log_files) - len(extracted)
 
-        # Extract each file
-        for file_path, file_sha in log_files.items():
-            try:
-                content = extract_file_content(branch_name, file_path, remote)
-
-                # Parse YAML
-                log_data = yaml.safe_load(content)
-
-                # Validate
-                errors = validate_log_schema(log_data, file_path)
-                if errors:
-                    error_msg = f"{branch_name}:{file_path} validation failed:\n" + "\n".join(f"    - {e}" for e in errors)
-                    print(f"  ❌ {file_path}: Validation errors")
-                    stats['errors'].append(error_msg)
-                    continue
-
-                # Store for merging
-                files_by_path[file_path][branch_name] = log_data
-                stats['files_extracted'] += 1
-                print(f"  ✓ {file_path}")
-
-            except yaml.YAMLError as e:
-                error_msg = f"{branch_name}:{file_path} YAML parse error: {e}"
-                print(f"  ❌ {file_path}: YAML error")
-                stats['errors'].append(error_msg)
-            except Exception as e:
-                error_msg = f"{branch_name}:{file_path} unexpected error: {e}"
+        for file_path, file_sha, content, extract_error in extracted:
+            if extract_error is not None:
                 print(f"  ❌ {file_path}: Error")
+                stats['errors'].append(f"{branch_name}:{file_path} unexpected error: {extract_error}")
+                continue
+
+            log_data, errors, failure = next(parsed)
+            if failure:
+                label, message = failure
+                print(f"  ❌ {file_path}: {label}")
+                stats['errors'].append(f"{branch_name}:{file_path} {message}")
+                continue
+            if errors:
+                error_msg = f"{branch_name}:{file_path} validation failed:\n" + "\n".join(f"    - {e}" for e in errors)
+                print(f"  ❌ {file_path}: Validation errors")
                 stats['errors'].append(error_msg)
+                continue
+
+            # Store for merging
+            files_by_path[file_path][branch_name] = log_data
+            blob_shas[file_path][branch_name] = file_sha
+            stats['files_extracted'] += 1
+            print(f"  ✓ {file_path}")
 
-        # Mark branch as processed
+        # Mark branch as processed; merged blobs are added once written
         state['processed'][branch_name] = {
             'sha': branch_sha,
             'processed_at': datetime.now(timezone.utc).isoformat(),
-            'files_extracted': len(log_files)
+            'files_extracted': len(log_files),
+            'blobs': {
+                path: sha for path, sha in already_merged.items() if log_files.get(path) == sha
+            },
         }
 
     # Merge files with same path
@@ -621,7 +927,8 @@ def main():
                 files_by_branch['working-tree'] = working_tree_data
                 print(f"   Including existing working tree version of {file_path}")
 
-            merged_data = merge_log_files(files_by_branch, file_path)
+            with profiling.phase('compute'):
+                merged_data = merge_log_files(files_by_branch, file_path, stats['warnings'])
             merged_files[file_path] = merged_data
 
             if len(files_by_branch) > 1:
@@ -638,6 +945,7 @@ def main():
             stats['errors'].append(str(e))
 
     # Write merged files to disk
+    written_paths = []
     if merged_files:
         print("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
         print("Writing merged files")
@@ -658,14 +966,18 @@ def main():
 
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(output_path, 'w') as f:
+            with open(output_path, 'w') as f, profiling.phase('write'):
                 yaml.dump(log_data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+            profiling.record_write(output_path)
+            written_paths.append(file_path)
 
             print(f"✓ Wrote {file_path}")
 
     # Update state
+    record_merged_blobs(state, written_paths, blob_shas)
     state['last_run'] = datetime.now(timezone.utc).isoformat()
-    save_processed_state(state)
+    with profiling.phase('write'):
+        save_processed_state(state)
 
     # Print summary
     print("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
@@ -674,6 +986,7 @@ def main():
     print(f"Branches scanned:  {stats['branches_scanned']}")
     print(f"Branches skipped:  {stats['branches_skipped']}")
     print(f"Files extracted:   {stats['files_extracted']}")
+    print(f"Files unchanged:   {stats['files_unchanged']}")
     print(f"Files merged:      {stats['files_merged']}")
     print(f"Conflicts:         {len(stats['conflicts'])}")
     print(f"Warnings:          {len(stats['warnings'])}")
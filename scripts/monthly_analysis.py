@@ -2,16 +2,38 @@
 """
 Monthly Nutrition Analysis Script
 Generates comprehensive monthly reports with meal frequency analysis and markdown dashboards.
+
+The same report can be produced for a quarter, a year, a custom date range
+or a rolling window; all periods requested in one run share a single load of
+the per-day rollup.
+
+Usage:
+    python3 scripts/monthly_analysis.py 2025-10
+    python3 scripts/monthly_analysis.py 2025-Q4 2025
+    python3 scripts/monthly_analysis.py --from 2025-09-15 --to 2025-10-14
+    python3 scripts/monthly_analysis.py --last 28 [--to 2025-10-31]
+    python3 scripts/monthly_analysis.py --last 1 --sections executive,targets
+
+--sections limits the report to the named sections (see REPORT_SECTIONS)
+and prints it without saving; only the aggregates those sections read are
+computed.
 """
 
+import argparse
+import calendar
+import re
 import yaml
 import sys
 from pathlib import Path
-from datetime import datetime, time
-from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from collections import Counter, defaultdict
 from typing import Dict, List, Tuple, Any, Optional
 import statistics
 
+import profiling
+from daily_rollup import Aggregate, DayRollup, DailyRollup
+
 # Project root
 PROJECT_ROOT = Path(__file__).parent.parent
 LOGS_DIR = PROJECT_ROOT / "data" / "logs"
@@ -61,84 +83,91 @@ def is_alcoholic(item_name: str) -> bool:
     return any(keyword in item_lower for keyword in alcoholic_keywords)
 
 
-def parse_daily_log(log_file: Path) -> Dict:
-    """Parse a single daily log file with detailed timing and item analysis."""
-    with open(log_file, 'r') as f:
-        data = yaml.safe_load(f)
-
-    # Calculate daily totals
-    daily_totals = defaultdict(float)
-    meal_times = []
-    items_consumed = []
-    alcoholic_items = []
-    entry_details = []
-
-    for entry in data.get('entries', []):
-        timestamp = entry.get('timestamp', '')
-        meal_times.append(timestamp)
-
-        entry_items = []
-        for item in entry.get('items', []):
-            item_name = item.get('name', '')
-            if not item_name:  # Skip items without names
-                continue
-            items_consumed.append(item_name)
-            entry_items.append(item_name)
-
-            # Track alcoholic items
-            if is_alcoholic(item_name):
-                alcoholic_items.append({
-                    'name': item_name,
-                    'timestamp': timestamp,
-                    'energy_kcal': item.get('nutrition', {}).get('energy_kcal', 0)
-                })
-
-            nutrition = item.get('nutrition', {})
-
-            # Sum up all nutrients
-            for nutrient, value in nutrition.items():
-                if value is not None and isinstance(value, (int, float)):
-                    daily_totals[nutrient] += value
-
-        entry_details.append({
-            'timestamp': timestamp,
-            'items': entry_items
-        })
+# Parts of summarize_day that cost more than reading the rollup record
+DAY_PARTS = frozenset({'items', 'alcohol', 'meals', 'timing'})
+
+# Analysis part -> the day part it is built from ('days' keeps the per-day rows)
+DAY_PARTS_FOR = {
+    'foods': 'items',
+    'alcohol': 'alcohol',
+    'meal_frequency': 'meals',
+    'days': 'meals',
+    'timing': 'timing',
+}
+
+
+def summarize_day(day: DayRollup, parts: frozenset = DAY_PARTS) -> Dict:
+    """Detailed timing and item analysis of one day, from its rollup record.
+
+    Only the given parts (see DAY_PARTS) are computed; the keys of the
+    others are left out of the result.
+    """
+    summary = {
+        'date': day.yaml_date,
+        'day_type': day.day_type,
+        'totals': dict(day.totals),
+        'num_entries': day.num_entries,
+    }
+
+    if parts & {'items', 'alcohol'}:
+        items_consumed = []
+        alcoholic_items = []
+        entry_details = []
+        for timestamp, items in day.meals:
+            entry_items = []
+            for item_name, energy_kcal in items:
+                if not item_name:  # Skip items without names
+                    continue
+                items_consumed.append(item_name)
+                entry_items.append(item_name)
+
+                # Track alcoholic items
+                if 'alcohol' in parts and is_alcoholic(item_name):
+                    alcoholic_items.append({
+                        'name': item_name,
+                        'timestamp': timestamp,
+                        'energy_kcal': energy_kcal
+                    })
+
+            entry_details.append({
+                'timestamp': timestamp,
+                'items': entry_items
+            })
+        if 'items' in parts:
+            summary['items'] = items_consumed
+            summary['entry_details'] = entry_details
+        if 'alcohol' in parts:
+            summary['alcoholic_items'] = alcoholic_items
 
     # Classify meals
-    meal_classification = defaultdict(int)
-    for ts in meal_times:
-        meal_type = classify_meal_time(ts)
-        meal_classification[meal_type] += 1
+    if 'meals' in parts:
+        meal_classification = defaultdict(int)
+        for ts, _ in day.meals:
+            meal_type = classify_meal_time(ts)
+            meal_classification[meal_type] += 1
+        summary['meals'] = dict(meal_classification)
 
     # Calculate eating window if we have timestamps
-    eating_window_hours = None
-    first_meal_time = None
-    last_meal_time = None
+    if 'timing' in parts:
+        eating_window_hours = None
+        first_meal_time = None
+        last_meal_time = None
 
-    if meal_times:
-        timestamps = [datetime.fromisoformat(ts.replace('Z', '+00:00')) for ts in meal_times]
-        timestamps.sort()
-        first_meal_time = timestamps[0].strftime('%H:%M')
-        last_meal_time = timestamps[-1].strftime('%H:%M')
+        if day.first_meal:
+            first = datetime.fromisoformat(day.first_meal.replace('Z', '+00:00'))
+            last = datetime.fromisoformat(day.last_meal.replace('Z', '+00:00'))
+            first_meal_time = first.strftime('%H:%M')
+            last_meal_time = last.strftime('%H:%M')
 
-        if len(timestamps) > 1:
-            time_diff = timestamps[-1] - timestamps[0]
-            eating_window_hours = time_diff.total_seconds() / 3600
+            if len(day.meals) > 1:
+                time_diff = last - first
+                eating_window_hours = time_diff.total_seconds() / 3600
 
-    return {
-        'date': data.get('date'),
-        'day_type': data.get('day_type'),
-        'totals': dict(daily_totals),
-        'meals': dict(meal_classification),
-        'num_entries': len(data.get('entries', [])),
-        'items': items_consumed,
-        'alcoholic_items': alcoholic_items,
-        'entry_details': entry_details,
-        'eating_window_hours': eating_window_hours,
-        'first_meal_time': first_meal_time,
-        'last_meal_time': last_meal_time
-    }
+        summary['eating_window_hours'] = eating_window_hours
+        summary['first_meal_time'] = first_meal_time
+        summary['last_meal_time'] = last_meal_time
+
+    return summary
 
 
 def generate_bar_chart(value: float, max_value: float, width: int = 40, target: Optional[float] = None) -> str:
@@ -173,11 +202,24 @@ def generate_compliance_indicator(actual: float, target_min: Optional[float] = N
         return "✅ ON TARGET"
 
 
-def calculate_statistics(values: List[float]) -> Dict[str, float]:
-    """Calculate basic statistics."""
+def calculate_statistics(values: List[float], aggregate: Optional[Aggregate] = None) -> Dict[str, float]:
+    """Calculate basic statistics.
+
+    With a precomputed aggregate over the same days, mean, stdev, min and max
+    come from its partial sums and only the median looks at values.
+    """
     if not values:
         return {'mean': 0, 'median': 0, 'stdev': 0, 'min': 0, 'max': 0}
 
+    if aggregate is not None and aggregate.count == len(values):
+        return {
+            'mean': aggregate.mean,
+            'median': statistics.median(values),
+            'stdev': aggregate.stdev,
+            'min': aggregate.min,
+            'max': aggregate.max
+        }
+
     return {
         'mean': statistics.mean(values),
         'median': statistics.median(values),
@@ -187,186 +229,323 @@ def calculate_statistics(values: List[float]) -> Dict[str, float]:
     }
 
 
-def analyze_month(year: int, month: int) -> Dict:
-    """Analyze all logs for a given month."""
-    month_dir = LOGS_DIR / f"{year:04d}-{month:02d}"
+# All 52 tracked nutrients, in report order
+NUTRIENTS = [
+    # Macronutrients and energy
+    'energy_kcal', 'protein_g', 'fat_g', 'carbs_total_g', 'fiber_total_g',
+    # Fat types
+    'sat_fat_g', 'mufa_g', 'pufa_g', 'trans_fat_g', 'cholesterol_mg',
+    # Carbohydrate types
+    'carbs_available_g', 'fiber_soluble_g', 'fiber_insoluble_g', 'sugar_g', 'polyols_g',
+    # Major minerals
+    'sodium_mg', 'potassium_mg', 'calcium_mg', 'magnesium_mg', 'phosphorus_mg', 'chloride_mg', 'sulfur_g',
+    # Trace minerals
+    'iron_mg', 'zinc_mg', 'copper_mg', 'manganese_mg', 'selenium_ug', 'iodine_ug', 'chromium_ug', 'molybdenum_ug',
+    # Ultra-trace minerals
+    'boron_mg', 'silicon_mg', 'vanadium_ug', 'nickel_ug',
+    # Fat-soluble vitamins
+    'vitamin_a_ug', 'vitamin_d_ug', 'vitamin_e_mg', 'vitamin_k_ug',
+    # Water-soluble vitamins
+    'vitamin_c_mg', 'vitamin_b1_mg', 'vitamin_b2_mg', 'vitamin_b3_mg', 'vitamin_b5_mg',
+    'vitamin_b6_mg', 'vitamin_b7_ug', 'vitamin_b9_ug', 'vitamin_b12_ug', 'choline_mg',
+    # Fatty acids
+    'omega3_epa_mg', 'omega3_dha_mg', 'omega3_ala_g', 'omega6_la_g'
+]
+
+# Report headings by period kind; anything else is a custom range
+REPORT_TITLES = {
+    'month': 'MONTHLY NUTRITION ANALYSIS',
+    'quarter': 'QUARTERLY NUTRITION ANALYSIS',
+    'year': 'ANNUAL NUTRITION ANALYSIS',
+}
+
+
+@dataclass
+class Period:
+    """A closed date range to analyze, with how to name it in the report."""
+    start: date
+    end: date
+    label: str          # Report subheading, e.g. "October 2025" or "Q4 2025"
+    kind: str = 'period'  # 'month', 'quarter', 'year' or 'period'
+    slug: str = ''      # Output file stem; defaults to START_END
+
+    def __post_init__(self):
+        if self.start > self.end:
+            raise ValueError(f"Period starts after it ends: {self.start} > {self.end}")
+        if not self.slug:
+            self.slug = f"{self.start.isoformat()}_{self.end.isoformat()}"
+
+
+def month_period(year: int, month: int) -> Period:
+    return Period(
+        date(year, month, 1),
+        date(year, month, calendar.monthrange(year, month)[1]),
+        f"{datetime(year, month, 1).strftime('%B')} {year}",
+        'month',
+        f"{year:04d}-{month:02d}",
+    )
+
+
+def quarter_period(year: int, quarter: int) -> Period:
+    first_month = 3 * (quarter - 1) + 1
+    return Period(
+        date(year, first_month, 1),
+        date(year, first_month + 2, calendar.monthrange(year, first_month + 2)[1]),
+        f"Q{quarter} {year}",
+        'quarter',
+        f"{year:04d}-Q{quarter}",
+    )
+
+
+def year_period(year: int) -> Period:
+    return Period(date(year, 1, 1), date(year, 12, 31), str(year), 'year', f"{year:04d}")
+
+
+def range_period(start: date, end: date) -> Period:
+    return Period(start, end, f"{start.isoformat()} to {end.isoformat()}")
+
+
+def rolling_period(days: int, end: date) -> Period:
+    """The `days`-day window ending on (and including) `end`."""
+    if days < 1:
+        raise ValueError(f"Rolling window must cover at least one day, got {days}")
+    start = end - timedelta(days=days - 1)
+    span = f"{days} days" if days > 1 else "day"
+    return Period(start, end, f"Last {span} ({start.isoformat()} to {end.isoformat()})")
+
+
+def parse_period(text: str) -> Period:
+    """Parse YYYY-MM, YYYY-Qn or YYYY into a Period."""
+    match = re.fullmatch(r'(\d{4})(?:-(?:Q(\d)|(\d{1,2})))?', text.strip(), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid period '{text}'. Use YYYY-MM, YYYY-Qn or YYYY")
+    year = int(match.group(1))
+
+    # Validate ranges to prevent path traversal and invalid dates
+    if not (1900 <= year <= 2100):
+        raise ValueError(f"Year {year} out of valid range (1900-2100)")
+    if match.group(2):
+        quarter = int(match.group(2))
+        if not (1 <= quarter <= 4):
+            raise ValueError(f"Quarter {quarter} out of valid range (1-4)")
+        return quarter_period(year, quarter)
+    if match.group(3):
+        month = int(match.group(3))
+        if not (1 <= month <= 12):
+            raise ValueError(f"Month {month} out of valid range (1-12)")
+        return month_period(year, month)
+    return year_period(year)
+
+
+def analyze_range(period: Period, rollup: Optional[DailyRollup] = None,
+                  profile: Optional[Dict] = None, sections: Optional[List[str]] = None) -> Optional[Dict]:
+    """Analyze all logs in a period in a single pass over its days.
+
+    Only the analysis parts read by `sections` (see REPORT_SECTIONS) are
+    computed; by default everything needed for the full report is. Pass the
+    same rollup (and profile) when analyzing several periods so the logs are
+    loaded once rather than once per report.
+    """
+    needs = analysis_parts(sections)
+    day_parts = frozenset(DAY_PARTS_FOR[part] for part in needs if part in DAY_PARTS_FOR)
+
+    # Per-day totals and meal outlines; only logs changed since the last run are parsed
+    if rollup is None:
+        rollup = DailyRollup(LOGS_DIR)
+    if profile is None:
+        profile = load_health_profile()
+    targets = profile.get('targets', {})
 
-    if not month_dir.exists():
-        return None
+    # Safe access to energy targets with fallback
+    energy_targets = targets.get('energy_kcal', {})
+    rest_day_max = energy_targets.get('rest_day_max', float('inf'))
+    training_day_max = energy_targets.get('training_day_max', float('inf'))
 
-    # Load health profile
-    profile = load_health_profile()
-    targets = profile.get('targets', {})
+    # (compliance key, nutrient, target key, at least target?)
+    compliance_checks = [
+        ('protein_min', 'protein_g', 'protein_g_min', True),
+        ('fat_min', 'fat_g', 'fat_g_min', True),
+        ('carbs_min', 'carbs_total_g', 'carbs_g_min', True),
+        ('fiber_min', 'fiber_total_g', 'fiber_g_min', True),
+        ('sat_fat_max', 'sat_fat_g', 'sat_fat_g_max', False),
+        ('sodium_max', 'sodium_mg', 'sodium_mg_max', False),
+        ('potassium_min', 'potassium_mg', 'potassium_mg_min', True),
+    ]
+    compliance = {key: 0 for key, _, _, _ in compliance_checks}
+    compliance['energy_rest'] = 0
+    compliance['energy_training'] = 0
 
-    # Parse all daily logs
     daily_data = []
-    log_files = sorted(month_dir.glob("*.yaml"))
+    days_logged = 0
+    values = {nutrient: [] for nutrient in NUTRIENTS}
+    rest_days = training_days = 0
+    meal_frequency = {'breakfast': 0, 'lunch': 0, 'dinner': 0, 'late_night': 0}
+    item_counts = Counter()
+    eating_windows, first_meals, last_meals = [], [], []
+    all_alcoholic_items = []
+    alcohol_days = 0
+    sugar_values, sugar_pct_of_carbs, sugar_per_1000kcal = [], [], []
 
-    for log_file in log_files:
+    for day in rollup.between(period.start, period.end):
         try:
-            data = parse_daily_log(log_file)
-            daily_data.append(data)
+            if day.error:
+                raise ValueError(day.error)
+            data = summarize_day(day, day_parts)
         except Exception as e:
-            print(f"Error parsing {log_file}: {e}", file=sys.stderr)
+            print(f"Error parsing {day.path}: {e}", file=sys.stderr)
             continue
-
-    if not daily_data:
+        days_logged += 1
+        if 'days' in needs:
+            daily_data.append(data)
+        totals = data['totals']
+
+        if 'summary' in needs:
+            for nutrient in NUTRIENTS:
+                values[nutrient].append(totals.get(nutrient, 0))
+
+        # Day types and energy compliance (separate for rest/training)
+        if needs & {'day_types', 'compliance'}:
+            if data.get('day_type') == 'rest':
+                rest_days += 1
+                if totals.get('energy_kcal', 0) <= rest_day_max:
+                    compliance['energy_rest'] += 1
+            elif data.get('day_type') == 'training':
+                training_days += 1
+                if totals.get('energy_kcal', 0) <= training_day_max:
+                    compliance['energy_training'] += 1
+
+        # Compliance analysis
+        if 'compliance' in needs:
+            for key, nutrient, target, at_least in compliance_checks:
+                actual = totals.get(nutrient, 0)
+                if (actual >= targets.get(target, 0)) if at_least else (actual <= targets.get(target, 0)):
+                    compliance[key] += 1
+
+        if 'meal_frequency' in needs:
+            for meal_type in meal_frequency:
+                if data['meals'].get(meal_type, 0) > 0:
+                    meal_frequency[meal_type] += 1
+
+        if 'foods' in needs:
+            item_counts.update(data['items'])
+
+        if 'timing' in needs:
+            if data.get('eating_window_hours') is not None:
+                eating_windows.append(data['eating_window_hours'])
+            if data.get('first_meal_time'):
+                first_meals.append(data['first_meal_time'])
+            if data.get('last_meal_time'):
+                last_meals.append(data['last_meal_time'])
+
+        if 'alcohol' in needs:
+            alcoholic = data.get('alcoholic_items', [])
+            if alcoholic:
+                alcohol_days += 1
+                all_alcoholic_items.extend(alcoholic)
+
+        # Sugar relative to carbs and energy
+        if 'sugar' in needs:
+            sugar = totals.get('sugar_g', 0)
+            sugar_values.append(sugar)
+            if totals.get('carbs_total_g', 0) > 0:
+                sugar_pct_of_carbs.append((sugar / totals['carbs_total_g']) * 100)
+            if totals.get('energy_kcal', 0) > 0:
+                sugar_per_1000kcal.append((sugar / totals['energy_kcal']) * 1000)
+
+    if not days_logged:
         return None
 
-    # Aggregate analysis
     analysis = {
-        'year': year,
-        'month': month,
-        'month_name': datetime(year, month, 1).strftime('%B'),
-        'days_logged': len(daily_data),
+        'start': period.start,
+        'end': period.end,
+        'period_label': period.label,
+        'period_kind': period.kind,
+        'days_logged': days_logged,
         'profile': profile,
-        'daily_data': daily_data,
-        'summary': {}
-    }
-
-    # Calculate monthly aggregates - All 52 nutrients
-    nutrients = [
-        # Macronutrients and energy
-        'energy_kcal', 'protein_g', 'fat_g', 'carbs_total_g', 'fiber_total_g',
-        # Fat types
-        'sat_fat_g', 'mufa_g', 'pufa_g', 'trans_fat_g', 'cholesterol_mg',
-        # Carbohydrate types
-        'carbs_available_g', 'fiber_soluble_g', 'fiber_insoluble_g', 'sugar_g', 'polyols_g',
-        # Major minerals
-        'sodium_mg', 'potassium_mg', 'calcium_mg', 'magnesium_mg', 'phosphorus_mg', 'chloride_mg', 'sulfur_g',
-        # Trace minerals
-        'iron_mg', 'zinc_mg', 'copper_mg', 'manganese_mg', 'selenium_ug', 'iodine_ug', 'chromium_ug', 'molybdenum_ug',
-        # Ultra-trace minerals
-        'boron_mg', 'silicon_mg', 'vanadium_ug', 'nickel_ug',
-        # Fat-soluble vitamins
-        'vitamin_a_ug', 'vitamin_d_ug', 'vitamin_e_mg', 'vitamin_k_ug',
-        # Water-soluble vitamins
-        'vitamin_c_mg', 'vitamin_b1_mg', 'vitamin_b2_mg', 'vitamin_b3_mg', 'vitamin_b5_mg',
-        'vitamin_b6_mg', 'vitamin_b7_ug', 'vitamin_b9_ug', 'vitamin_b12_ug', 'choline_mg',
-        # Fatty acids
-        'omega3_epa_mg', 'omega3_dha_mg', 'omega3_ala_g', 'omega6_la_g'
-    ]
-
-    summary = {}
-    for nutrient in nutrients:
-        values = [day['totals'].get(nutrient, 0) for day in daily_data]
-        summary[nutrient] = calculate_statistics(values)
-
-    # Compliance analysis
-    compliance = {
-        'protein_min': sum(1 for d in daily_data if d['totals'].get('protein_g', 0) >= targets.get('protein_g_min', 0)),
-        'fat_min': sum(1 for d in daily_data if d['totals'].get('fat_g', 0) >= targets.get('fat_g_min', 0)),
-        'carbs_min': sum(1 for d in daily_data if d['totals'].get('carbs_total_g', 0) >= targets.get('carbs_g_min', 0)),
-        'fiber_min': sum(1 for d in daily_data if d['totals'].get('fiber_total_g', 0) >= targets.get('fiber_g_min', 0)),
-        'sat_fat_max': sum(1 for d in daily_data if d['totals'].get('sat_fat_g', 0) <= targets.get('sat_fat_g_max', 0)),
-        'sodium_max': sum(1 for d in daily_data if d['totals'].get('sodium_mg', 0) <= targets.get('sodium_mg_max', 0)),
-        'potassium_min': sum(1 for d in daily_data if d['totals'].get('potassium_mg', 0) >= targets.get('potassium_mg_min', 0)),
     }
 
-    # Energy compliance (separate for rest/training)
-    rest_days = [d for d in daily_data if d.get('day_type') == 'rest']
-    training_days = [d for d in daily_data if d.get('day_type') == 'training']
-
-    # Safe access to energy targets with fallback
-    energy_targets = targets.get('energy_kcal', {})
-    rest_day_max = energy_targets.get('rest_day_max', float('inf'))
-    training_day_max = energy_targets.get('training_day_max', float('inf'))
-
-    compliance['energy_rest'] = sum(1 for d in rest_days if d['totals'].get('energy_kcal', 0) <= rest_day_max)
-    compliance['energy_training'] = sum(1 for d in training_days if d['totals'].get('energy_kcal', 0) <= training_day_max)
+    if 'days' in needs:
+        analysis['daily_data'] = daily_data
+
+    if 'summary' in needs:
+        # Period partials from the rollup; only usable if every readable day was analyzed
+        aggregates = rollup.aggregate(period.start, period.end, NUTRIENTS)
+        analysis['summary'] = {
+            nutrient: calculate_statistics(values[nutrient], aggregates[nutrient][0])
+            for nutrient in NUTRIENTS
+        }
+
+    if 'compliance' in needs:
+        analysis['compliance'] = compliance
+
+    if 'day_types' in needs:
+        analysis['rest_days'] = rest_days
+        analysis['training_days'] = training_days
+
+    if 'meal_frequency' in needs:
+        analysis['meal_frequency'] = meal_frequency
+
+    if 'foods' in needs:
+        analysis['unique_foods'] = len(item_counts)
+        analysis['top_foods'] = item_counts.most_common(10)
+
+    if 'timing' in needs:
+        analysis['timing'] = {
+            'avg_eating_window': statistics.mean(eating_windows) if eating_windows else 0,
+            'eating_windows': eating_windows,
+            'first_meals': first_meals,
+            'last_meals': last_meals
+        }
+
+    if 'alcohol' in needs:
+        # Estimate alcohol content (rough: 1 pint beer ~150 kcal = ~12-14g alcohol, ~1 standard drink)
+        # For beverages around 80-150 kcal, assume ~1 drink
+        alcohol_drinks_estimated = []
+        for item in all_alcoholic_items:
+            kcal = item.get('energy_kcal', 0)
+            # Rough estimation: 80-180 kcal per drink
+            if kcal > 0:
+                drinks = max(1, kcal / 120)  # Assume ~120 kcal per drink average
+            else:
+                drinks = 1
+            alcohol_drinks_estimated.append(drinks)
+
+        analysis['alcohol'] = {
+            'total_items': len(all_alcoholic_items),
+            'days_with_alcohol': alcohol_days,
+            'days_without_alcohol': days_logged - alcohol_days,
+            'estimated_drinks': sum(alcohol_drinks_estimated),
+            'alcoholic_items': all_alcoholic_items
+        }
+
+    if 'sugar' in needs:
+        analysis['sugar_analysis'] = {
+            'avg_sugar_g': statistics.mean(sugar_values) if sugar_values else 0,
+            'avg_sugar_pct_of_carbs': statistics.mean(sugar_pct_of_carbs) if sugar_pct_of_carbs else 0,
+            'avg_sugar_per_1000kcal': statistics.mean(sugar_per_1000kcal) if sugar_per_1000kcal else 0,
+            'max_sugar_day': max(sugar_values) if sugar_values else 0,
+            'days_over_50g': sum(1 for s in sugar_values if s > 50),
+            'days_over_25g': sum(1 for s in sugar_values if s > 25)
+        }
 
-    analysis['summary'] = summary
-    analysis['compliance'] = compliance
-    analysis['rest_days'] = len(rest_days)
-    analysis['training_days'] = len(training_days)
+    return analysis
 
-    # Meal frequency analysis
-    meal_frequency = {
-        'breakfast': sum(1 for d in daily_data if d['meals'].get('breakfast', 0) > 0),
-        'lunch': sum(1 for d in daily_data if d['meals'].get('lunch', 0) > 0),
-        'dinner': sum(1 for d in daily_data if d['meals'].get('dinner', 0) > 0),
-        'late_night': sum(1 for d in daily_data if d['meals'].get('late_night', 0) > 0),
-    }
-    analysis['meal_frequency'] = meal_frequency
-
-    # Food diversity
-    all_items = []
-    for day in daily_data:
-        all_items.extend(day['items'])
-
-    from collections import Counter
-    item_counts = Counter(all_items)
-    analysis['unique_foods'] = len(item_counts)
-    analysis['top_foods'] = item_counts.most_common(10)
-
-    # Meal timing analysis
-    eating_windows = [d['eating_window_hours'] for d in daily_data if d.get('eating_window_hours') is not None]
-    first_meals = [d['first_meal_time'] for d in daily_data if d.get('first_meal_time')]
-    last_meals = [d['last_meal_time'] for d in daily_data if d.get('last_meal_time')]
-
-    analysis['timing'] = {
-        'avg_eating_window': statistics.mean(eating_windows) if eating_windows else 0,
-        'eating_windows': eating_windows,
-        'first_meals': first_meals,
-        'last_meals': last_meals
-    }
 
-    # Alcohol analysis
-    all_alcoholic_items = []
-    alcohol_days = 0
-    for day in daily_data:
-        alcoholic = day.get('alcoholic_items', [])
-        if alcoholic:
-            alcohol_days += 1
-            all_alcoholic_items.extend(alcoholic)
-
-    # Estimate alcohol content (rough: 1 pint beer ~150 kcal = ~12-14g alcohol, ~1 standard drink)
-    # For beverages around 80-150 kcal, assume ~1 drink
-    alcohol_drinks_estimated = []
-    for item in all_alcoholic_items:
-        kcal = item.get('energy_kcal', 0)
-        # Rough estimation: 80-180 kcal per drink
-        if kcal > 0:
-            drinks = max(1, kcal / 120)  # Assume ~120 kcal per drink average
-        else:
-            drinks = 1
-        alcohol_drinks_estimated.append(drinks)
-
-    analysis['alcohol'] = {
-        'total_items': len(all_alcoholic_items),
-        'days_with_alcohol': alcohol_days,
-        'days_without_alcohol': len(daily_data) - alcohol_days,
-        'estimated_drinks': sum(alcohol_drinks_estimated),
-        'alcoholic_items': all_alcoholic_items
-    }
+def analyze_month(year: int, month: int, rollup: Optional[DailyRollup] = None,
+                  profile: Optional[Dict] = None, sections: Optional[List[str]] = None) -> Dict:
+    """Analyze all logs for a given month."""
+    month_dir = LOGS_DIR / f"{year:04d}-{month:02d}"
 
-    # Sugar analysis
-    sugar_values = [day['totals'].get('sugar_g', 0) for day in daily_data]
-    carb_values = [day['totals'].get('carbs_total_g', 0) for day in daily_data]
-    energy_values = [day['totals'].get('energy_kcal', 0) for day in daily_data]
-
-    sugar_pct_of_carbs = []
-    sugar_per_1000kcal = []
-
-    for i, sugar in enumerate(sugar_values):
-        if carb_values[i] > 0:
-            sugar_pct_of_carbs.append((sugar / carb_values[i]) * 100)
-        if energy_values[i] > 0:
-            sugar_per_1000kcal.append((sugar / energy_values[i]) * 1000)
-
-    analysis['sugar_analysis'] = {
-        'avg_sugar_g': statistics.mean(sugar_values) if sugar_values else 0,
-        'avg_sugar_pct_of_carbs': statistics.mean(sugar_pct_of_carbs) if sugar_pct_of_carbs else 0,
-        'avg_sugar_per_1000kcal': statistics.mean(sugar_per_1000kcal) if sugar_per_1000kcal else 0,
-        'max_sugar_day': max(sugar_values) if sugar_values else 0,
-        'days_over_50g': sum(1 for s in sugar_values if s > 50),
-        'days_over_25g': sum(1 for s in sugar_values if s > 25)
-    }
+    if not month_dir.exists():
+        return None
 
+    analysis = analyze_range(month_period(year, month), rollup, profile, sections)
+    if analysis:
+        analysis.update(year=year, month=month, month_name=datetime(year, month, 1).strftime('%B'))
     return analysis
 
 
-def _generate_executive_summary(analysis: Dict) -> List[str]:
+def _generate_executive_summary(analysis: Dict, targets: Dict) -> List[str]:
     """Generate the executive summary section."""
     lines = []
     lines.append("## 📈 EXECUTIVE SUMMARY")
@@ -390,7 +569,7 @@ def _generate_executive_summary(analysis: Dict) -> List[str]:
     return lines
 
 
-def _generate_meal_frequency_section(analysis: Dict) -> List[str]:
+def _generate_meal_frequency_section(analysis: Dict, targets: Dict) -> List[str]:
     """Generate meal frequency analysis section."""
     lines = []
     meal_freq = analysis['meal_frequency']
@@ -434,7 +613,7 @@ def _generate_meal_frequency_section(analysis: Dict) -> List[str]:
     return lines
 
 
-def _generate_meal_timing_section(analysis: Dict) -> List[str]:
+def _generate_meal_timing_section(analysis: Dict, targets: Dict) -> List[str]:
     """Generate meal timing and eating patterns section."""
     lines = []
     timing = analysis.get('timing', {})
@@ -781,53 +960,19 @@ def _generate_diet_quality_section(analysis: Dict, targets: Dict) -> List[str]:
     return lines
 
 
-def generate_markdown_report(analysis: Dict) -> str:
-    """Generate comprehensive markdown report using modular helper functions."""
-    if not analysis:
-        return "# No data available\n"
-
-    year = analysis['year']
-    month = analysis['month']
-    month_name = analysis['month_name']
-    profile = analysis['profile']
-    targets = profile.get('targets', {})
+def _generate_micronutrient_section(analysis: Dict, targets: Dict) -> List[str]:
+    """Generate micronutrient averages grouped by vitamin and mineral class."""
+    lines = []
     summary = analysis['summary']
-    days_logged = analysis['days_logged']
-    meal_freq = analysis['meal_frequency']
-
-    # Extract commonly used values
-    alcohol_data = analysis.get('alcohol', {})
-    days_with_alcohol = alcohol_data.get('days_with_alcohol', 0)
-    days_without_alcohol = alcohol_data.get('days_without_alcohol', 0)
-    total_drinks = alcohol_data.get('estimated_drinks', 0)
-
-    timing = analysis.get('timing', {})
-    avg_window = timing.get('avg_eating_window', 0)
-
-    report = []
-
-    # Header
-    report.append(f"# 📊 MONTHLY NUTRITION ANALYSIS")
-    report.append(f"## {month_name} {year}")
-    report.append("")
-    report.append("━" * 80)
-    report.append("")
 
-    # Use helper functions for major sections
-    report.extend(_generate_executive_summary(analysis))
-    report.extend(_generate_meal_frequency_section(analysis))
-    report.extend(_generate_meal_timing_section(analysis))
-    report.extend(_generate_target_achievement_section(analysis, targets))
-
-    # Micronutrients - Comprehensive Analysis
-    report.append("## 🔬 MICRONUTRIENT AVERAGES")
-    report.append("")
+    lines.append("## 🔬 MICRONUTRIENT AVERAGES")
+    lines.append("")
 
     # B-Complex Vitamins
-    report.append("### B-Complex Vitamins")
-    report.append("")
-    report.append("| Nutrient | Daily Average | Range |")
-    report.append("|----------|---------------|-------|")
+    lines.append("### B-Complex Vitamins")
+    lines.append("")
+    lines.append("| Nutrient | Daily Average | Range |")
+    lines.append("|----------|---------------|-------|")
 
     b_vitamins = [
         ('Vitamin B1 (Thiamin)', 'vitamin_b1_mg', 'mg'),
@@ -846,15 +991,15 @@ def generate_markdown_report(analysis: Dict) -> str:
             avg = summary[key]['mean']
             min_val = summary[key]['min']
             max_val = summary[key]['max']
-            report.append(f"| {label} | {avg:.1f} {unit} | {min_val:.1f} - {max_val:.1f} |")
+            lines.append(f"| {label} | {avg:.1f} {unit} | {min_val:.1f} - {max_val:.1f} |")
 
-    report.append("")
+    lines.append("")
 
     # Fat-Soluble Vitamins
-    report.append("### Fat-Soluble Vitamins")
-    report.append("")
-    report.append("| Nutrient | Daily Average | Range |")
-    report.append("|----------|---------------|-------|")
+    lines.append("### Fat-Soluble Vitamins")
+    lines.append("")
+    lines.append("| Nutrient | Daily Average | Range |")
+    lines.append("|----------|---------------|-------|")
 
     fat_sol_vitamins = [
         ('Vitamin A', 'vitamin_a_ug', 'μg'),
@@ -869,15 +1014,15 @@ def generate_markdown_report(analysis: Dict) -> str:
             avg = summary[key]['mean']
             min_val = summary[key]['min']
             max_val = summary[key]['max']
-            report.append(f"| {label} | {avg:.1f} {unit} | {min_val:.1f} - {max_val:.1f} |")
+            lines.append(f"| {label} | {avg:.1f} {unit} | {min_val:.1f} - {max_val:.1f} |")
 
-    report.append("")
+    lines.append("")
 
     # Major Minerals
-    report.append("### Major Minerals")
-    report.append("")
-    report.append("| Nutrient | Daily Average | Range |")
-    report.append("|----------|---------------|-------|")
+    lines.append("### Major Minerals")
+    lines.append("")
+    lines.append("| Nutrient | Daily Average | Range |")
+    lines.append("|----------|---------------|-------|")
 
     major_minerals = [
         ('Sodium', 'sodium_mg', 'mg'),
@@ -894,15 +1039,15 @@ def generate_markdown_report(analysis: Dict) -> str:
             avg = summary[key]['mean']
             min_val = summary[key]['min']
             max_val = summary[key]['max']
-            report.append(f"| {label} | {avg:.1f} {unit} | {min_val:.1f} - {max_val:.1f} |")
+            lines.append(f"| {label} | {avg:.1f} {unit} | {min_val:.1f} - {max_val:.1f} |")
 
-    report.append("")
+    lines.append("")
 
     # Trace Minerals
-    report.append("### Trace Minerals")
-    report.append("")
-    report.append("| Nutrient | Daily Average | Range |")
-    report.append("|----------|---------------|-------|")
+    lines.append("### Trace Minerals")
+    lines.append("")
+    lines.append("| Nutrient | Daily Average | Range |")
+    lines.append("|----------|---------------|-------|")
 
     trace_minerals = [
         ('Iron', 'iron_mg', 'mg'),
@@ -920,15 +1065,15 @@ def generate_markdown_report(analysis: Dict) -> str:
             avg = summary[key]['mean']
             min_val = summary[key]['min']
             max_val = summary[key]['max']
-            report.append(f"| {label} | {avg:.1f} {unit} | {min_val:.1f} - {max_val:.1f} |")
+            lines.append(f"| {label} | {avg:.1f} {unit} | {min_val:.1f} - {max_val:.1f} |")
 
-    report.append("")
+    lines.append("")
 
     # Ultra-trace Minerals
-    report.append("### Ultra-trace Minerals")
-    report.append("")
-    report.append("| Nutrient | Daily Average | Range |")
-    report.append("|----------|---------------|-------|")
+    lines.append("### Ultra-trace Minerals")
+    lines.append("")
+    lines.append("| Nutrient | Daily Average | Range |")
+    lines.append("|----------|---------------|-------|")
 
     ultratrace_minerals = [
         ('Boron', 'boron_mg', 'mg'),
@@ -942,15 +1087,15 @@ def generate_markdown_report(analysis: Dict) -> str:
             avg = summary[key]['mean']
             min_val = summary[key]['min']
             max_val = summary[key]['max']
-            report.append(f"| {label} | {avg:.1f} {unit} | {min_val:.1f} - {max_val:.1f} |")
+            lines.append(f"| {label} | {avg:.1f} {unit} | {min_val:.1f} - {max_val:.1f} |")
 
-    report.append("")
+    lines.append("")
 
     # Essential Fatty Acids
-    report.append("### Essential Fatty Acids")
-    report.append("")
-    report.append("| Nutrient | Daily Average | Range |")
-    report.append("|----------|---------------|-------|")
+    lines.append("### Essential Fatty Acids")
+    lines.append("")
+    lines.append("| Nutrient | Daily Average | Range |")
+    lines.append("|----------|---------------|-------|")
 
     fatty_acids = [
         ('Omega-3 EPA', 'omega3_epa_mg', 'mg'),
@@ -964,13 +1109,20 @@ def generate_markdown_report(analysis: Dict) -> str:
             avg = summary[key]['mean']
             min_val = summary[key]['min']
             max_val = summary[key]['max']
-            report.append(f"| {label} | {avg:.1f} {unit} | {min_val:.1f} - {max_val:.1f} |")
+            lines.append(f"| {label} | {avg:.1f} {unit} | {min_val:.1f} - {max_val:.1f} |")
 
-    report.append("")
+    lines.append("")
+
+    return lines
 
-    # Fat Quality
-    report.append("## 🥑 FAT QUALITY ANALYSIS")
-    report.append("")
+
+def _generate_fat_quality_section(analysis: Dict, targets: Dict) -> List[str]:
+    """Generate fat quality breakdown and sodium:potassium ratio."""
+    lines = []
+    summary = analysis['summary']
+
+    lines.append("## 🥑 FAT QUALITY ANALYSIS")
+    lines.append("")
 
     avg_sat = summary['sat_fat_g']['mean']
     avg_mufa = summary['mufa_g']['mean']
@@ -981,13 +1133,13 @@ def generate_markdown_report(analysis: Dict) -> str:
     mufa_pct = (avg_mufa / avg_total_fat * 100) if avg_total_fat > 0 else 0
     pufa_pct = (avg_pufa / avg_total_fat * 100) if avg_total_fat > 0 else 0
 
-    report.append(f"```")
-    report.append(f"Total Fat:        {avg_total_fat:.1f}g/day")
-    report.append(f"Saturated:        {avg_sat:.1f}g ({sat_pct:.1f}%)  {'✅ Good (<33%)' if sat_pct < 33 else '⚠️ High (>33%)'}")
-    report.append(f"Monounsaturated:  {avg_mufa:.1f}g ({mufa_pct:.1f}%)")
-    report.append(f"Polyunsaturated:  {avg_pufa:.1f}g ({pufa_pct:.1f}%)")
-    report.append(f"```")
-    report.append("")
+    lines.append(f"```")
+    lines.append(f"Total Fat:        {avg_total_fat:.1f}g/day")
+    lines.append(f"Saturated:        {avg_sat:.1f}g ({sat_pct:.1f}%)  {'✅ Good (<33%)' if sat_pct < 33 else '⚠️ High (>33%)'}")
+    lines.append(f"Monounsaturated:  {avg_mufa:.1f}g ({mufa_pct:.1f}%)")
+    lines.append(f"Polyunsaturated:  {avg_pufa:.1f}g ({pufa_pct:.1f}%)")
+    lines.append(f"```")
+    lines.append("")
 
     # Sodium:Potassium Ratio
     avg_sodium = summary['sodium_mg']['mean']
@@ -996,16 +1148,22 @@ def generate_markdown_report(analysis: Dict) -> str:
     # Calculate molar ratio: Na (22.99 g/mol) / K (39.10 g/mol)
     na_k_molar_ratio = (avg_sodium / 22.99) / (avg_potassium / 39.10) if avg_potassium > 0 else 999
 
-    report.append("### Sodium:Potassium Ratio")
-    report.append(f"```")
-    report.append(f"Mass Ratio:  {na_k_mass_ratio:.2f}:1  {'✅ Excellent (<1:1)' if na_k_mass_ratio < 1 else '⚠️ Consider more potassium (target <1:1)'}")
-    report.append(f"Molar Ratio: {na_k_molar_ratio:.2f}:1  {'✅ Excellent (<1:1)' if na_k_molar_ratio < 1 else '⚠️ Consider more potassium (target <1:1)'}")
-    report.append(f"```")
-    report.append("")
+    lines.append("### Sodium:Potassium Ratio")
+    lines.append(f"```")
+    lines.append(f"Mass Ratio:  {na_k_mass_ratio:.2f}:1  {'✅ Excellent (<1:1)' if na_k_mass_ratio < 1 else '⚠️ Consider more potassium (target <1:1)'}")
+    lines.append(f"Molar Ratio: {na_k_molar_ratio:.2f}:1  {'✅ Excellent (<1:1)' if na_k_molar_ratio < 1 else '⚠️ Consider more potassium (target <1:1)'}")
+    lines.append(f"```")
+    lines.append("")
 
-    # Sugar Analysis
-    report.append("## 🍬 SUGAR ANALYSIS")
-    report.append("")
+    return lines
+
+
+def _generate_sugar_section(analysis: Dict, targets: Dict) -> List[str]:
+    """Generate sugar intake section against WHO guidelines."""
+    lines = []
+
+    lines.append("## 🍬 SUGAR ANALYSIS")
+    lines.append("")
 
     sugar_data = analysis.get('sugar_analysis', {})
     avg_sugar = sugar_data.get('avg_sugar_g', 0)
@@ -1015,29 +1173,37 @@ def generate_markdown_report(analysis: Dict) -> str:
     days_over_50g = sugar_data.get('days_over_50g', 0)
     days_over_25g = sugar_data.get('days_over_25g', 0)
 
-    report.append(f"```")
-    report.append(f"Daily Average:        {avg_sugar:.1f}g")
-    report.append(f"% of Total Carbs:     {sugar_pct_carbs:.1f}%")
-    report.append(f"Sugar Density:        {sugar_density:.1f}g per 1000 kcal")
-    report.append(f"Highest Day:          {max_sugar:.1f}g")
-    report.append(f"Days >50g (WHO max):  {days_over_50g}/{analysis['days_logged']}")
-    report.append(f"Days >25g (WHO ideal): {days_over_25g}/{analysis['days_logged']}")
-    report.append(f"```")
-    report.append("")
+    lines.append(f"```")
+    lines.append(f"Daily Average:        {avg_sugar:.1f}g")
+    lines.append(f"% of Total Carbs:     {sugar_pct_carbs:.1f}%")
+    lines.append(f"Sugar Density:        {sugar_density:.1f}g per 1000 kcal")
+    lines.append(f"Highest Day:          {max_sugar:.1f}g")
+    lines.append(f"Days >50g (WHO max):  {days_over_50g}/{analysis['days_logged']}")
+    lines.append(f"Days >25g (WHO ideal): {days_over_25g}/{analysis['days_logged']}")
+    lines.append(f"```")
+    lines.append("")
 
     # Sugar guidelines interpretation
     if avg_sugar < 25:
-        report.append(f"✅ **Excellent sugar control:** Averaging {avg_sugar:.1f}g/day, well under WHO recommended limit of 25g for optimal health.")
+        lines.append(f"✅ **Excellent sugar control:** Averaging {avg_sugar:.1f}g/day, well under WHO recommended limit of 25g for optimal health.")
     elif avg_sugar < 50:
-        report.append(f"✅ **Good sugar intake:** Averaging {avg_sugar:.1f}g/day, within WHO's upper limit of 50g but above the 25g ideal. Room for improvement.")
+        lines.append(f"✅ **Good sugar intake:** Averaging {avg_sugar:.1f}g/day, within WHO's upper limit of 50g but above the 25g ideal. Room for improvement.")
     else:
-        report.append(f"⚠️ **High sugar intake:** Averaging {avg_sugar:.1f}g/day exceeds WHO recommendations (25-50g). Consider reducing added sugars from beverages, sweets, and processed foods.")
+        lines.append(f"⚠️ **High sugar intake:** Averaging {avg_sugar:.1f}g/day exceeds WHO recommendations (25-50g). Consider reducing added sugars from beverages, sweets, and processed foods.")
 
-    report.append("")
+    lines.append("")
 
-    # Alcohol Analysis
-    report.append("## 🍺 ALCOHOL CONSUMPTION")
-    report.append("")
+    return lines
+
+
+def _generate_alcohol_section(analysis: Dict, targets: Dict) -> List[str]:
+    """Generate alcohol consumption section."""
+    lines = []
+    days_logged = analysis['days_logged']
+    period_kind = analysis['period_kind']
+
+    lines.append("## 🍺 ALCOHOL CONSUMPTION")
+    lines.append("")
 
     alcohol_data = analysis.get('alcohol', {})
     days_with_alcohol = alcohol_data.get('days_with_alcohol', 0)
@@ -1049,63 +1215,72 @@ def generate_markdown_report(analysis: Dict) -> str:
         avg_drinks_per_week = (total_drinks / days_logged) * 7
         drinks_per_drinking_day = total_drinks / days_with_alcohol if days_with_alcohol > 0 else 0
 
-        report.append(f"```")
-        report.append(f"Days with Alcohol:     {days_with_alcohol}/{days_logged}")
-        report.append(f"Days Alcohol-Free:     {days_without_alcohol}/{days_logged}")
-        report.append(f"Estimated Total:       {total_drinks:.1f} drinks")
-        report.append(f"Drinks per Week:       {avg_drinks_per_week:.1f} drinks")
-        report.append(f"Per Drinking Day:      {drinks_per_drinking_day:.1f} drinks")
-        report.append(f"```")
-        report.append("")
+        lines.append(f"```")
+        lines.append(f"Days with Alcohol:     {days_with_alcohol}/{days_logged}")
+        lines.append(f"Days Alcohol-Free:     {days_without_alcohol}/{days_logged}")
+        lines.append(f"Estimated Total:       {total_drinks:.1f} drinks")
+        lines.append(f"Drinks per Week:       {avg_drinks_per_week:.1f} drinks")
+        lines.append(f"Per Drinking Day:      {drinks_per_drinking_day:.1f} drinks")
+        lines.append(f"```")
+        lines.append("")
 
         # Health guidelines (CDC: moderate = up to 1/day women, 2/day men)
         if avg_drinks_per_week <= 7:
-            report.append(f"✅ **Low consumption:** {avg_drinks_per_week:.1f} drinks/week is within low-risk guidelines.")
+            lines.append(f"✅ **Low consumption:** {avg_drinks_per_week:.1f} drinks/week is within low-risk guidelines.")
         elif avg_drinks_per_week <= 14:
-            report.append(f"ℹ️ **Moderate consumption:** {avg_drinks_per_week:.1f} drinks/week. Consider having more alcohol-free days.")
+            lines.append(f"ℹ️ **Moderate consumption:** {avg_drinks_per_week:.1f} drinks/week. Consider having more alcohol-free days.")
         else:
-            report.append(f"⚠️ **High consumption:** {avg_drinks_per_week:.1f} drinks/week exceeds moderate guidelines (7-14 drinks/week). Reducing intake would benefit health.")
+            lines.append(f"⚠️ **High consumption:** {avg_drinks_per_week:.1f} drinks/week exceeds moderate guidelines (7-14 drinks/week). Reducing intake would benefit health.")
 
-        report.append("")
+        lines.append("")
 
         # List alcoholic items
         if alcoholic_items:
-            report.append("### Alcoholic Items Consumed")
-            report.append("")
-            from collections import Counter
+            lines.append("### Alcoholic Items Consumed")
+            lines.append("")
             alcohol_names = [item['name'] for item in alcoholic_items]
             alcohol_counts = Counter(alcohol_names)
             for item, count in alcohol_counts.most_common(5):
-                report.append(f"- {item}: {count}x")
-            report.append("")
+                lines.append(f"- {item}: {count}x")
+            lines.append("")
     else:
-        report.append(f"```")
-        report.append(f"No alcohol consumption detected this month.")
-        report.append(f"```")
-        report.append("")
-        report.append("✅ **Alcohol-free month:** Excellent for health, sleep quality, and body composition goals.")
-        report.append("")
-
-    # Food Diversity
-    report.append("## 🌈 FOOD DIVERSITY")
-    report.append("")
-    report.append(f"**Total Unique Items:** {analysis['unique_foods']}")
-    report.append("")
-    report.append("### Top 10 Most Consumed Foods")
-    report.append("")
-    report.append("| Rank | Food | Count |")
-    report.append("|------|------|-------|")
+        lines.append(f"```")
+        lines.append(f"No alcohol consumption detected this {period_kind}.")
+        lines.append(f"```")
+        lines.append("")
+        lines.append(f"✅ **Alcohol-free {period_kind}:** Excellent for health, sleep quality, and body composition goals.")
+        lines.append("")
+
+    return lines
+
+
+def _generate_food_diversity_section(analysis: Dict, targets: Dict) -> List[str]:
+    """Generate food diversity section with the most consumed foods."""
+    lines = []
+    lines.append("## 🌈 FOOD DIVERSITY")
+    lines.append("")
+    lines.append(f"**Total Unique Items:** {analysis['unique_foods']}")
+    lines.append("")
+    lines.append("### Top 10 Most Consumed Foods")
+    lines.append("")
+    lines.append("| Rank | Food | Count |")
+    lines.append("|------|------|-------|")
 
     for idx, (food, count) in enumerate(analysis['top_foods'], 1):
-        report.append(f"| {idx} | {food} | {count}x |")
+        lines.append(f"| {idx} | {food} | {count}x |")
 
-    report.append("")
+    lines.append("")
 
-    # Daily Breakdown
-    report.append("## 📅 DAILY BREAKDOWN")
-    report.append("")
-    report.append("| Date | Type | Energy | Protein | Fiber | Meals | Status |")
-    report.append("|------|------|--------|---------|-------|-------|--------|")
+    return lines
+
+
+def _generate_daily_breakdown_section(analysis: Dict, targets: Dict) -> List[str]:
+    """Generate per-day breakdown table."""
+    lines = []
+    lines.append("## 📅 DAILY BREAKDOWN")
+    lines.append("")
+    lines.append("| Date | Type | Energy | Protein | Fiber | Meals | Status |")
+    lines.append("|------|------|--------|---------|-------|-------|--------|")
 
     for day in analysis['daily_data']:
         date = day['date']
@@ -1130,212 +1305,24 @@ def generate_markdown_report(analysis: Dict) -> str:
 
         status = "✅" if (protein_ok and fiber_ok and energy_ok and meal_count == 3) else "⚠️"
 
-        report.append(f"| {date} | {day_type.title()[:4]} | {energy:.0f} | {protein:.0f}g | {fiber:.1f}g | {meal_count}/3 | {status} |")
-
-    report.append("")
-
-    # Overall Diet Commentary
-    report.append("## 📝 OVERALL DIET COMMENTARY")
-    report.append("")
-
-    # Calculate diet quality score (0-100)
-    score_components = []
-
-    # Protein compliance (0-15 points)
-    protein_avg = summary['protein_g']['mean']
-    protein_target = targets.get('protein_g_min', 170)
-    protein_score = min(15, (protein_avg / protein_target) * 15)
-    score_components.append(protein_score)
-
-    # Fiber adequacy (0-15 points)
-    fiber_avg = summary['fiber_total_g']['mean']
-    fiber_target = targets.get('fiber_g_min', 40)
-    fiber_score = min(15, (fiber_avg / fiber_target) * 15)
-    score_components.append(fiber_score)
-
-    # Fat quality (0-15 points) - higher unsaturated fat ratio is better
-    unsat_to_sat_ratio = (avg_mufa + avg_pufa) / avg_sat if avg_sat > 0 else 1
-    fat_quality_score = min(15, unsat_to_sat_ratio * 5)
-    score_components.append(fat_quality_score)
+        lines.append(f"| {date} | {day_type.title()[:4]} | {energy:.0f} | {protein:.0f}g | {fiber:.1f}g | {meal_count}/3 | {status} |")
 
-    # Sodium control (0-15 points)
-    sodium_avg = summary['sodium_mg']['mean']
-    sodium_target = targets.get('sodium_mg_max', 2300)
-    sodium_score = 15 if sodium_avg <= sodium_target else max(0, 15 - ((sodium_avg - sodium_target) / 100))
-    score_components.append(sodium_score)
-
-    # Sugar control (0-10 points)
-    sugar_score = 10 if avg_sugar < 25 else (5 if avg_sugar < 50 else max(0, 10 - ((avg_sugar - 50) / 5)))
-    score_components.append(sugar_score)
-
-    # Meal consistency (0-10 points)
-    meal_consistency_score = (meal_freq.get('breakfast', 0) + meal_freq.get('lunch', 0) + meal_freq.get('dinner', 0)) / (days_logged * 3) * 10
-    score_components.append(meal_consistency_score)
-
-    # Food diversity (0-10 points)
-    diversity_score = min(10, (analysis['unique_foods'] / days_logged) * 2)
-    score_components.append(diversity_score)
-
-    # Micronutrient adequacy (0-10 points) - based on potassium, calcium, magnesium
-    potassium_target = targets.get('potassium_mg_min', 4000)
-    potassium_adequacy = min(1, summary['potassium_mg']['mean'] / potassium_target)
-    calcium_adequacy = min(1, summary['calcium_mg']['mean'] / 1000)  # RDA ~1000mg
-    magnesium_adequacy = min(1, summary['magnesium_mg']['mean'] / 400)  # RDA ~400mg
-    micronutrient_score = (potassium_adequacy + calcium_adequacy + magnesium_adequacy) / 3 * 10
-    score_components.append(micronutrient_score)
-
-    total_score = sum(score_components)
-
-    # Generate commentary
-    report.append("### Diet Quality Score")
-    report.append("")
-
-    score_bar = generate_bar_chart(total_score, 100, width=50)
-    report.append(f"```")
-    report.append(f"Overall Score: {score_bar}")
-    report.append(f"```")
-    report.append("")
-
-    if total_score >= 85:
-        quality_rating = "⭐⭐⭐⭐⭐ EXCELLENT"
-        quality_desc = "Your diet demonstrates outstanding nutritional quality with strong compliance across all key metrics."
-    elif total_score >= 70:
-        quality_rating = "⭐⭐⭐⭐ VERY GOOD"
-        quality_desc = "Your diet shows very good nutritional quality with room for minor improvements."
-    elif total_score >= 55:
-        quality_rating = "⭐⭐⭐ GOOD"
-        quality_desc = "Your diet has a solid foundation but would benefit from addressing several areas."
-    elif total_score >= 40:
-        quality_rating = "⭐⭐ NEEDS IMPROVEMENT"
-        quality_desc = "Your diet requires attention in multiple areas to support your health and fitness goals."
-    else:
-        quality_rating = "⭐ SIGNIFICANT CHANGES NEEDED"
-        quality_desc = "Your current dietary pattern needs substantial improvement across most nutritional areas."
-
-    report.append(f"**{quality_rating}** ({total_score:.1f}/100)")
-    report.append("")
-    report.append(quality_desc)
-    report.append("")
-
-    # Detailed commentary
-    report.append("### Comprehensive Assessment")
-    report.append("")
-
-    # Macronutrient balance
-    protein_pct = (summary['protein_g']['mean'] * 4 / summary['energy_kcal']['mean'] * 100) if summary['energy_kcal']['mean'] > 0 else 0
-    fat_pct = (summary['fat_g']['mean'] * 9 / summary['energy_kcal']['mean'] * 100) if summary['energy_kcal']['mean'] > 0 else 0
-    carb_pct = (summary['carbs_total_g']['mean'] * 4 / summary['energy_kcal']['mean'] * 100) if summary['energy_kcal']['mean'] > 0 else 0
-
-    report.append("**Macronutrient Distribution:**")
-    report.append(f"- Protein: {protein_pct:.0f}% of calories ({summary['protein_g']['mean']:.1f}g/day)")
-    report.append(f"- Fat: {fat_pct:.0f}% of calories ({summary['fat_g']['mean']:.1f}g/day)")
-    report.append(f"- Carbohydrates: {carb_pct:.0f}% of calories ({summary['carbs_total_g']['mean']:.1f}g/day)")
-    report.append("")
-
-    # Macro balance assessment
-    if 25 <= protein_pct <= 35:
-        report.append(f"✅ Protein intake is well-optimized for muscle maintenance and body composition goals.")
-    elif protein_pct < 25:
-        report.append(f"📈 Protein could be increased to better support training and recovery.")
-    else:
-        report.append(f"ℹ️ Very high protein intake - ensure adequate hydration and kidney function monitoring.")
-    report.append("")
-
-    # Diet pattern analysis
-    report.append("**Dietary Pattern Analysis:**")
-
-    strengths = []
-    concerns = []
-
-    # Identify strengths
-    if meal_consistency_score >= 9:
-        strengths.append("Excellent meal timing consistency")
-    if fiber_score >= 13:
-        strengths.append("Outstanding fiber intake")
-    if protein_score >= 13:
-        strengths.append("Excellent protein intake")
-    if na_k_mass_ratio < 1:
-        strengths.append("Optimal sodium:potassium ratio")
-    if fat_quality_score >= 12:
-        strengths.append("High-quality fat sources")
-    if sugar_score >= 8:
-        strengths.append("Well-controlled sugar intake")
-    if diversity_score >= 8:
-        strengths.append("Excellent dietary variety")
-
-    # Identify concerns
-    if fiber_score < 10:
-        concerns.append("Insufficient fiber intake")
-    if protein_score < 12:
-        concerns.append("Suboptimal protein for goals")
-    if sodium_score < 10:
-        concerns.append("Elevated sodium levels")
-    if sat_pct > 33:
-        concerns.append("High saturated fat percentage")
-    if sugar_score < 5:
-        concerns.append("Excessive sugar consumption")
-    if meal_consistency_score < 7:
-        concerns.append("Inconsistent meal timing")
-    if days_with_alcohol > days_logged * 0.5:
-        concerns.append("Frequent alcohol consumption")
-
-    if strengths:
-        report.append("")
-        report.append("**Strengths:**")
-        for strength in strengths:
-            report.append(f"- ✅ {strength}")
-
-    if concerns:
-        report.append("")
-        report.append("**Areas for Improvement:**")
-        for concern in concerns:
-            report.append(f"- ⚠️ {concern}")
-
-    report.append("")
-
-    # Health implications
-    report.append("**Health & Performance Implications:**")
-    report.append("")
-
-    # Provide contextualized insights
-    implications = []
-
-    if protein_avg >= protein_target * 0.95:
-        implications.append("✅ **Muscle preservation:** Protein intake supports lean mass maintenance during body recomposition.")
-    else:
-        implications.append("⚠️ **Muscle risk:** Suboptimal protein may compromise muscle retention, especially in caloric deficit or intense training.")
-
-    if fiber_avg >= 35:
-        implications.append("✅ **Gut health:** High fiber intake supports beneficial gut bacteria, digestive health, and stable blood sugar.")
-    else:
-        implications.append("ℹ️ **Digestive health:** Increasing fiber would benefit gut microbiome, satiety, and metabolic health.")
-
-    if na_k_mass_ratio < 1:
-        implications.append("✅ **Cardiovascular health:** Excellent sodium:potassium balance supports healthy blood pressure.")
-    else:
-        implications.append("⚠️ **Blood pressure:** Elevated sodium:potassium ratio may increase cardiovascular strain. Add more fruits and vegetables.")
-
-    if sat_pct > 33:
-        implications.append("⚠️ **Heart health:** High saturated fat intake may negatively impact cholesterol profiles. Emphasize unsaturated fats from nuts, avocados, fatty fish, and olive oil.")
-
-    if avg_window > 0 and avg_window < 12:
-        implications.append("✅ **Metabolic health:** Time-restricted eating pattern may enhance insulin sensitivity and fat oxidation.")
+    lines.append("")
 
-    if days_with_alcohol > 0:
-        drinks_per_week = (total_drinks / days_logged) * 7
-        if drinks_per_week > 14:
-            implications.append("⚠️ **Recovery impact:** High alcohol consumption can impair muscle recovery, sleep quality, and fat metabolism.")
-        elif drinks_per_week > 7:
-            implications.append("ℹ️ **Training optimization:** Moderate alcohol intake may affect training performance and recovery. Consider timing around workout days.")
+    return lines
 
-    for implication in implications:
-        report.append(implication)
 
-    report.append("")
+def _generate_recommendations_section(analysis: Dict, targets: Dict) -> List[str]:
+    """Generate recommendations from average intake and meal frequency."""
+    lines = []
+    summary = analysis['summary']
+    days_logged = analysis['days_logged']
+    meal_freq = analysis['meal_frequency']
+    avg_potassium = summary['potassium_mg']['mean']
+    na_k_mass_ratio = summary['sodium_mg']['mean'] / avg_potassium if avg_potassium > 0 else 999
 
-    # Recommendations
-    report.append("## 💡 RECOMMENDATIONS")
-    report.append("")
+    lines.append("## 💡 RECOMMENDATIONS")
+    lines.append("")
 
     recommendations = []
 
@@ -1378,9 +1365,78 @@ def generate_markdown_report(analysis: Dict) -> str:
         recommendations.append(f"🥦 **Increase potassium:** Your sodium:potassium ratio is {na_k_mass_ratio:.2f}:1. Aim for <1:1 by eating more vegetables, fruits, and legumes.")
 
     for rec in recommendations:
-        report.append(f"- {rec}")
+        lines.append(f"- {rec}")
+
+    lines.append("")
 
+    return lines
+
+
+# Report sections in output order: name -> (generator, analysis parts it reads).
+# Every generator takes (analysis, targets); analyze_range only computes the
+# parts needed by the sections requested.
+REPORT_SECTIONS = {
+    'executive': (_generate_executive_summary, {'day_types', 'compliance', 'foods'}),
+    'meals': (_generate_meal_frequency_section, {'meal_frequency'}),
+    'timing': (_generate_meal_timing_section, {'timing'}),
+    'targets': (_generate_target_achievement_section, {'summary'}),
+    'micronutrients': (_generate_micronutrient_section, {'summary'}),
+    'fat': (_generate_fat_quality_section, {'summary'}),
+    'sugar': (_generate_sugar_section, {'sugar'}),
+    'alcohol': (_generate_alcohol_section, {'alcohol'}),
+    'diversity': (_generate_food_diversity_section, {'foods'}),
+    'daily': (_generate_daily_breakdown_section, {'days'}),
+    'commentary': (_generate_diet_quality_section,
+                   {'summary', 'meal_frequency', 'foods', 'sugar', 'alcohol', 'timing'}),
+    'recommendations': (_generate_recommendations_section, {'summary', 'meal_frequency'}),
+}
+
+ANALYSIS_PARTS = frozenset().union(*(needs for _, needs in REPORT_SECTIONS.values()))
+
+
+def parse_sections(text: str) -> List[str]:
+    """Parse a comma-separated list of section names into report order."""
+    requested = {name.strip().lower() for name in text.split(',') if name.strip()}
+    unknown = requested - REPORT_SECTIONS.keys()
+    if unknown or not requested:
+        raise ValueError(
+            f"Unknown section(s): {', '.join(sorted(unknown)) or '(none given)'}. "
+            f"Choose from: {', '.join(REPORT_SECTIONS)}"
+        )
+    return [name for name in REPORT_SECTIONS if name in requested]
+
+
+def analysis_parts(sections: Optional[List[str]] = None) -> frozenset:
+    """The analysis parts the given sections read (all parts when sections is None)."""
+    if sections is None:
+        return ANALYSIS_PARTS
+    return frozenset().union(*(REPORT_SECTIONS[name][1] for name in sections))
+
+
+def generate_markdown_report(analysis: Dict, sections: Optional[List[str]] = None) -> str:
+    """Generate a markdown report from the given sections (all of them by default).
+
+    The analysis must include the parts those sections read; see analysis_parts.
+    """
+    if not analysis:
+        return "# No data available\n"
+
+    period_kind = analysis['period_kind']
+    targets = analysis['profile'].get('targets', {})
+
+    report = []
+
+    # Header
+    report.append(f"# 📊 {REPORT_TITLES.get(period_kind, 'NUTRITION ANALYSIS')}")
+    report.append(f"## {analysis['period_label']}")
+    report.append("")
+    report.append("━" * 80)
     report.append("")
+
+    for name in sections or REPORT_SECTIONS:
+        generator, _ = REPORT_SECTIONS[name]
+        report.extend(generator(analysis, targets))
+
     report.append("━" * 80)
     report.append("")
     report.append(f"*Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} UTC*")
@@ -1388,52 +1444,101 @@ def generate_markdown_report(analysis: Dict) -> str:
     return "\n".join(report)
 
 
-def main():
-    """Main entry point."""
-    if len(sys.argv) < 2:
-        print("Usage: monthly_analysis.py YYYY-MM")
-        print("Example: monthly_analysis.py 2025-10")
-        sys.exit(1)
-
-    # Parse arguments
-    year_month = sys.argv[1]
+def _parse_date(value: str) -> date:
     try:
-        year, month = map(int, year_month.split('-'))
+        return date.fromisoformat(value)
     except ValueError:
-        print("Error: Invalid date format. Use YYYY-MM")
-        sys.exit(1)
+        raise argparse.ArgumentTypeError(f"Invalid date '{value}'. Use YYYY-MM-DD")
 
-    # Validate date ranges to prevent path traversal and invalid dates
-    if not (1900 <= year <= 2100):
-        print(f"Error: Year {year} out of valid range (1900-2100)")
-        sys.exit(1)
-    if not (1 <= month <= 12):
-        print(f"Error: Month {month} out of valid range (1-12)")
-        sys.exit(1)
 
-    # Analyze month
-    print(f"Analyzing {year:04d}-{month:02d}...")
-    analysis = analyze_month(year, month)
+def _parse_period(value: str) -> Period:
+    try:
+        return parse_period(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
 
-    if not analysis:
-        print(f"No data found for {year:04d}-{month:02d}")
-        sys.exit(1)
+def _parse_sections(value: str) -> List[str]:
+    try:
+        return parse_sections(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Generate nutrition analysis reports for months, quarters, years or date ranges",
+        epilog="Examples: monthly_analysis.py 2025-10 | 2025-Q4 2025 | --from 2025-09-15 --to 2025-10-14 | --last 28",
+    )
+    parser.add_argument("periods", nargs="*", type=_parse_period, metavar="PERIOD",
+                        help="YYYY-MM, YYYY-Qn or YYYY; several periods share one pass over the logs")
+    parser.add_argument("--from", dest="start", type=_parse_date, metavar="YYYY-MM-DD",
+                        help="Start of a custom date range (inclusive)")
+    parser.add_argument("--to", dest="end", type=_parse_date, metavar="YYYY-MM-DD",
+                        help="End of the custom range or rolling window (inclusive, default: today)")
+    parser.add_argument("--last", type=int, metavar="DAYS",
+                        help="Rolling window of DAYS days ending at --to")
+    parser.add_argument("--sections", type=_parse_sections, metavar="NAME[,NAME...]",
+                        help=f"Only build (and print, without saving) these report sections: "
+                             f"{', '.join(REPORT_SECTIONS)} (default: all)")
+    profiling.add_profile_argument(parser)
+    args = parser.parse_args()
+    profiling.setup("monthly_analysis", args.profile)
+
+    periods = list(args.periods)
+    try:
+        if args.last is not None:
+            periods.append(rolling_period(args.last, args.end or date.today()))
+        elif args.start:
+            periods.append(range_period(args.start, args.end or date.today()))
+        elif args.end:
+            parser.error("--to needs --from or --last")
+    except ValueError as e:
+        parser.error(str(e))
+    if not periods:
+        parser.error("give a PERIOD, --from or --last")
+
+    # Load logs and targets once for all reports
+    with profiling.phase("compute"):
+        rollup = DailyRollup(LOGS_DIR)
+        profile = load_health_profile()
+
+    missing = False
+    for period in periods:
+        print(f"Analyzing {period.slug}...")
+        with profiling.phase("compute"):
+            if period.kind == 'month':
+                analysis = analyze_month(period.start.year, period.start.month, rollup, profile, args.sections)
+            else:
+                analysis = analyze_range(period, rollup, profile, args.sections)
+
+        if not analysis:
+            print(f"No data found for {period.slug}")
+            missing = True
+            continue
+
+        # Generate report
+        with profiling.phase("render"):
+            report = generate_markdown_report(analysis, args.sections)
 
-    # Generate report
-    report = generate_markdown_report(analysis)
+        # Save full reports only; a partial one must not replace the archived report
+        if not args.sections:
+            ANALYSIS_DIR.mkdir(parents=True, exist_ok=True)
+            output_file = ANALYSIS_DIR / f"{period.slug}.md"
 
-    # Save to file
-    ANALYSIS_DIR.mkdir(parents=True, exist_ok=True)
-    output_file = ANALYSIS_DIR / f"{year:04d}-{month:02d}.md"
+            with open(output_file, 'w') as f, profiling.phase("write"):
+                f.write(report)
+            profiling.record_write(output_file)
 
-    with open(output_file, 'w') as f:
-        f.write(report)
+            print(f"✅ Report generated: {output_file}")
+            print("")
 
-    print(f"✅ Report generated: {output_file}")
-    print("")
+        # Also print to stdout
+        print(report)
 
-    # Also print to stdout
-    print(report)
+    if missing:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -19,6 +19,8 @@ except ImportError:
     print("Warning: PyYAML not installed. Config file loading disabled.")
     print("  Install with: pip install pyyaml")
 
+import profiling
+
 
 SCHEMA_TEMPLATE = """id: {stable_id}
 version: 1
@@ -257,17 +259,24 @@ def create_dish_file(dish_id, venue_name, display_name, category, portion_desc,
     return filepath
 
 
-def regenerate_index():
-    """Auto-regenerate the index after adding a dish."""
+def regenerate_index(changed_file=None):
+    """Auto-regenerate the index after adding a dish.
+
+    Only the category sections touched since the last run (plus the
+    category of changed_file, if given) are rewritten.
+    """
     script_dir = Path(__file__).parent
     generate_index_script = script_dir / "generate_index.py"
 
     if generate_index_script.exists():
         print("\n✓ Regenerating index...")
         import subprocess
+        cmd = [sys.executable, str(generate_index_script), "--incremental"]
+        if changed_file:
+            cmd += ["--changed", str(changed_file)]
         try:
             result = subprocess.run(
-                [sys.executable, str(generate_index_script)],
+                cmd,
                 capture_output=True,
                 text=True,
                 check=True
@@ -314,7 +323,9 @@ Examples:
     ap.add_argument("--folder-name",
                     help="Override automatic folder name (use with --category-type)")
 
+    profiling.add_profile_argument(ap)
     args = ap.parse_args()
+    profiling.setup("new_dish_from_template", args.profile)
 
     # Determine output directory
     script_dir = Path(__file__).parent
@@ -351,7 +362,7 @@ Examples:
     print(f"  Dish ID: {dish_id}")
 
     # Regenerate index
-    regenerate_index()
+    regenerate_index(filepath)
 
 
 if __name__ == "__main__":
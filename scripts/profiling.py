@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Opt-in profiling shared by the scripts.
+
+Scripts enable it with --profile (see add_profile_argument) or when
+NUTRITION_PROFILE=1 is set in the environment, which also covers scripts
+launched by hooks and the nightly automation. When enabled, one JSON object
+is emitted at exit:
+
+    {"script": "generate_index", "argv": [...], "wall_s": 1.93,
+     "phases": {"discovery": 0.02, "yaml_parse": 1.71, "compute": 0.01,
+                "render": 0.12, "write": 0.04},
+     "files_read": 812, "bytes_read": 2204311,
+     "files_written": 2, "bytes_written": 1730042,
+     "peak_rss_kb": 48212, "peak_rss_children_kb": 0}
+
+to stderr, or appended as a single line to the file named by
+NUTRITION_PROFILE_OUTPUT so runs can be collected.
+
+Phase times are exclusive: a yaml_parse inside discovery is charged to
+yaml_parse only, so phases never add up to more than wall_s. When profiling
+is off every hook is a no-op.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ENV_FLAG = "NUTRITION_PROFILE"
+ENV_OUTPUT = "NUTRITION_PROFILE_OUTPUT"
+
+PHASES = ("discovery", "yaml_parse", "compute", "render", "write")
+
+_NULL_PHASE = contextlib.nullcontext()
+
+
+def _peak_rss_kb(who) -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class Profile:
+    """Per-process phase timer and I/O counter."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.script: Optional[str] = None
+        self.phases: Dict[str, float] = {name: 0.0 for name in PHASES}
+        self.files_read: Set[str] = set()
+        self.files_written: Set[str] = set()
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self._stack: List[List] = []  # [phase, started_at]
+        self._io_lock = threading.Lock()  # I/O may be counted from worker threads
+        self._started = time.perf_counter()
+
+    def enable(self, script: str) -> None:
+        if self.enabled:
+            return
+        self.enabled = True
+        self.script = script
+        self._started = time.perf_counter()
+        atexit.register(self.emit)
+
+    def phase(self, name: str):
+        if name not in PHASES:
+            raise ValueError(f"Unknown profiling phase '{name}' (expected one of {', '.join(PHASES)})")
+        if not self.enabled:
+            return _NULL_PHASE
+        return self._timed(name)
+
+    @contextlib.contextmanager
+    def _timed(self, name: str):
+        now = time.perf_counter()
+        if self._stack:
+            outer = self._stack[-1]
+            self.phases[outer[0]] += now - outer[1]
+        frame = [name, now]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self.phases[name] += now - frame[1]
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][1] = now
+
+    def read(self, path, nbytes: int) -> None:
+        if self.enabled:
+            with self._io_lock:
+                self.files_read.add(str(path))
+                self.bytes_read += nbytes
+
+    def wrote(self, path, nbytes: int) -> None:
+        if self.enabled:
+            with self._io_lock:
+                self.files_written.add(str(path))
+                self.bytes_written += nbytes
+
+    def report(self) -> dict:
+        return {
+            "script": self.script,
+            "argv": sys.argv[1:],
+            "wall_s": round(time.perf_counter() - self._started, 6),
+            "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            "files_read": len(self.files_read),
+            "bytes_read": self.bytes_read,
+            "files_written": len(self.files_written),
+            "bytes_written": self.bytes_written,
+            "peak_rss_kb": _peak_rss_kb(resource.RUSAGE_SELF) if resource else None,
+            "peak_rss_children_kb": _peak_rss_kb(resource.RUSAGE_CHILDREN) if resource else None,
+        }
+
+    def emit(self) -> None:
+        line = json.dumps(self.report(), sort_keys=False)
+        output = os.environ.get(ENV_OUTPUT)
+        if output:
+            try:
+                with open(output, "a", encoding="utf-8") as handle:
+                    handle.write(line + "\n")
+                return
+            except OSError as exc:
+                print(f"Warning: Could not write profile to {output}: {exc}", file=sys.stderr)
+        print(line, file=sys.stderr)
+
+
+PROFILE = Profile()
+
+
+def env_enabled() -> bool:
+    return os.environ.get(ENV_FLAG, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def add_profile_argument(parser) -> None:
+    """Add the shared --profile flag to an argparse parser."""
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=f"Emit per-phase timings, I/O counts and peak RSS as JSON at exit (or set {ENV_FLAG}=1)",
+    )
+
+
+def setup(script: str, requested: bool = False) -> bool:
+    """Enable profiling for this process if requested or set in the environment."""
+    if requested or env_enabled():
+        PROFILE.enable(script)
+    return PROFILE.enabled
+
+
+def phase(name: str):
+    """Context manager charging the enclosed work to one of PHASES."""
+    return PROFILE.phase(name)
+
+
+def record_read(path, nbytes: Optional[int] = None) -> None:
+    """Count a file read; nbytes defaults to the file's size on disk."""
+    if PROFILE.enabled:
+        if nbytes is None:
+            try:
+                nbytes = Path(path).stat().st_size
+            except OSError:
+                nbytes = 0
+        PROFILE.read(path, nbytes)
+
+
+def record_write(path, nbytes: Optional[int] = None) -> None:
+    """Count a file write; nbytes defaults to the file's size on disk."""
+    if PROFILE.enabled:
+        if nbytes is None:
+            try:
+                nbytes = Path(path).stat().st_size
+            except OSError:
+                nbytes = 0
+        PROFILE.wrote(path, nbytes)
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Fuzzy dish search over the food bank.
+
+Answers "is this dish already in the data bank?" (SKILL.md, A) Step 1)
+without browsing data/food-data-bank-index.md by eye. Dishes come from the
+same compiled scan as generate_index.scan_data_bank (FoodBankIndex +
+dish_from_record), and each dish is indexed by its name, id, aliases,
+venue, category and folder.
+
+Ranking is BM25 over those fields, with the name and aliases weighted
+highest. A query word that is not in the vocabulary is matched by prefix
+("pist" -> pistachio) and by trigram similarity ("chiken" -> chicken), so
+partial words and typos still find the dish; a query equal to a dish's
+name or id always ranks that dish first.
+
+BM25 scores are precomputed per (word, dish) and the inverted index is kept
+in data/.cache/food-data-bank-search.pickle. It is rebuilt only when the
+dish files (paths and content hashes) change, so a query costs a few
+dictionary lookups per word regardless of the size of the food bank.
+
+Usage:
+    python3 scripts/search_food_bank.py "chicken salad" [--limit 10] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import re
+import sys
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import profiling
+from food_bank_index import DEFAULT_ROOT, DishRecord, FoodBankIndex, read_artifact, write_artifact
+from generate_index import dish_from_record
+
+# Bump whenever the pickled index layout changes so stale indexes are rebuilt.
+CACHE_VERSION = 1
+
+# Relative weight of a word occurring in each field
+FIELD_WEIGHTS = {
+    'name': 3.0,
+    'aliases': 3.0,
+    'id': 2.0,
+    'venue': 1.5,
+    'category': 1.0,
+    'folder': 1.0,
+}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Fuzzy matching of query words that are not in the vocabulary
+MIN_PREFIX_LENGTH = 3
+MIN_TRIGRAM_SIMILARITY = 0.4
+MAX_EXPANSIONS = 8
+
+# Added to dishes whose whole name or id equals the query
+EXACT_MATCH_BONUS = 100.0
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def default_search_path(root: Path) -> Path:
+    """Return the search index path for a food-bank root (a .cache dir next to it)."""
+    return root.parent / ".cache" / f"{root.name}-search.pickle"
+
+
+def tokenize(text) -> List[str]:
+    """Lowercase, accent-free alphanumeric words ("Crème brûlée_v1" -> creme, brulee, v1)."""
+    text = str(text).casefold()
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(char for char in text if not unicodedata.combining(char))
+    return WORD_RE.findall(text)
+
+
+def trigrams(word: str) -> Set[str]:
+    """Padded character trigrams of a word, as used for fuzzy matching."""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass
+class SearchResult:
+    """One ranked dish."""
+
+    id: str
+    name: str
+    score: float
+    path: Path
+    folder: str
+
+
+def dish_fields(record: DishRecord) -> Optional[Dict[str, str]]:
+    """Searchable text of one dish, or None if generate_index would skip it."""
+    dish = dish_from_record(record)
+    if dish is None:
+        return None
+    data = record.data
+    source = data.get("source") if isinstance(data.get("source"), dict) else {}
+    aliases = data.get("aliases") or []
+    if isinstance(aliases, str):
+        aliases = [aliases]
+    return {
+        "name": dish["name"],
+        "aliases": " ".join(str(alias) for alias in aliases),
+        "id": str(dish["id"]),
+        "venue": str(source.get("venue") or ""),
+        "category": str(dish["category"] or ""),
+        "folder": dish["category_path"],
+    }
+
+
+def food_bank_fingerprint(records: Iterable[DishRecord]) -> str:
+    """Hash of every dish file's path and content; changes whenever a dish does."""
+    digest = hashlib.sha256()
+    for record in records:
+        digest.update(f"{record.path.as_posix()}\0{record.sha256}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class DishSearchIndex:
+    """Inverted index from words to (dish, BM25 score)."""
+
+    def __init__(
+        self,
+        dishes: List[Tuple[str, str, Path, str]],
+        postings: Dict[str, List[Tuple[int, float]]],
+        exact: Dict[str, List[int]],
+    ) -> None:
+        self.dishes = dishes  # (id, name, path, folder)
+        self.postings = postings
+        self.exact = exact
+        self.vocabulary = sorted(postings)
+        self._trigrams: Dict[str, List[str]] = defaultdict(list)
+        for word in self.vocabulary:
+            for gram in trigrams(word):
+                self._trigrams[gram].append(word)
+
+    def __len__(self) -> int:
+        return len(self.dishes)
+
+    @classmethod
+    def build(cls, records: Iterable[DishRecord]) -> "DishSearchIndex":
+        """Index every dish record that has a header and an id."""
+        dishes = []
+        weighted_tf: List[Counter] = []
+        exact: Dict[str, List[int]] = defaultdict(list)
+        for record in records:
+            fields = dish_fields(record)
+            if fields is None:
+                continue
+            doc = len(dishes)
+            dishes.append((fields["id"], fields["name"], record.path, fields["folder"]))
+            tf: Counter = Counter()
+            for field_name, weight in FIELD_WEIGHTS.items():
+                words = tokenize(fields[field_name])
+                for word in words:
+                    tf[word] += weight
+                if field_name in ("name", "id") and words:
+                    key = " ".join(words)
+                    if doc not in exact[key]:
+                        exact[key].append(doc)
+            weighted_tf.append(tf)
+
+        lengths = [sum(tf.values()) for tf in weighted_tf]
+        average = sum(lengths) / len(lengths) if lengths else 0.0
+        frequencies = Counter(word for tf in weighted_tf for word in tf)
+        total = len(dishes)
+
+        postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        for doc, (tf, length) in enumerate(zip(weighted_tf, lengths)):
+            norm = K1 * (1 - B + B * length / average)
+            for word, count in tf.items():
+                df = frequencies[word]
+                idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+                postings[word].append((doc, idf * count * (K1 + 1) / (count + norm)))
+        return cls(dishes, dict(postings), dict(exact))
+
+    def expand(self, word: str) -> List[Tuple[str, float]]:
+        """Vocabulary words matching a query word, with a match weight in (0, 1]."""
+        if word in self.postings and len(word) < MIN_PREFIX_LENGTH:
+            return [(word, 1.0)]
+        matches: Dict[str, float] = {}
+        if word in self.postings:
+            matches[word] = 1.0
+        if len(word) >= MIN_PREFIX_LENGTH:
+            i = bisect_left(self.vocabulary, word)
+            while i < len(self.vocabulary) and self.vocabulary[i].startswith(word):
+                candidate = self.vocabulary[i]
+                matches.setdefault(candidate, 0.5 + 0.5 * len(word) / len(candidate))
+                i += 1
+        if word not in self.postings:
+            grams = trigrams(word)
+            shared = Counter(candidate for gram in grams for candidate in self._trigrams.get(gram, ()))
+            for candidate, count in shared.items():
+                similarity = count / (len(grams) + len(trigrams(candidate)) - count)
+                if similarity >= MIN_TRIGRAM_SIMILARITY and similarity > matches.get(candidate, 0.0):
+                    matches[candidate] = similarity
+        return heapq.nlargest(MAX_EXPANSIONS, matches.items(), key=lambda item: (item[1], item[0]))
+
+    def search(self, query: str, limit: int = 10) -> List[SearchResult]:
+        """Return the best-matching dishes for a free-text query, best first."""
+        words = tokenize(query)
+        scores: Dict[int, float] = defaultdict(float)
+        for word in dict.fromkeys(words):
+            # Each query word counts once per dish, through its best-matching expansion
+            best: Dict[int, float] = {}
+            for candidate, weight in self.expand(word):
+                for doc, score in self.postings[candidate]:
+                    score *= weight
+                    if score > best.get(doc, 0.0):
+                        best[doc] = score
+            for doc, score in best.items():
+                scores[doc] += score
+        for doc in self.exact.get(" ".join(words), ()):
+            scores[doc] += EXACT_MATCH_BONUS
+
+        ranked = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], self.dishes[item[0]][0]))
+        return [
+            SearchResult(dish_id, name, round(score, 3), path, folder)
+            for (dish_id, name, path, folder), score in ((self.dishes[doc], score) for doc, score in ranked)
+        ]
+
+
+def load_search_index(
+    root: Path = DEFAULT_ROOT,
+    cache_path: Optional[Path] = None,
+    use_cache: bool = True,
+    refresh: bool = True,
+) -> DishSearchIndex:
+    """Load the persisted search index, rebuilding it if the food bank changed.
+
+    With refresh=False an existing index is used without scanning the food
+    bank at all (fastest, but may miss dishes edited since it was built).
+    """
+    root = Path(root)
+    cache_path = cache_path or default_search_path(root)
+    payload = read_artifact(cache_path, CACHE_VERSION) if use_cache else None
+    if payload and payload.get("root") != str(root):
+        payload = None
+    if payload and not refresh:
+        return DishSearchIndex(payload["dishes"], payload["postings"], payload["exact"])
+
+    food_bank = FoodBankIndex(root, use_cache=use_cache)
+    fingerprint = food_bank_fingerprint(food_bank.records)
+    if payload and payload.get("fingerprint") == fingerprint:
+        return DishSearchIndex(payload["dishes"], payload["postings"], payload["exact"])
+
+    with profiling.phase("compute"):
+        index = DishSearchIndex.build(food_bank.dishes())
+    if use_cache:
+        try:
+            with profiling.phase("write"):
+                write_artifact(
+                    cache_path,
+                    {
+                        "version": CACHE_VERSION,
+                        "root": str(root),
+                        "fingerprint": fingerprint,
+                        "dishes": index.dishes,
+                        "postings": index.postings,
+                        "exact": index.exact,
+                    },
+                )
+        except OSError as exc:
+            print(f"Warning: Could not write search index {cache_path}: {exc}", file=sys.stderr)
+    return index
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Search the food bank for existing dishes.")
+    parser.add_argument("query", nargs="+", help="Dish name, id, alias, venue or category (typos are fine)")
+    parser.add_argument("--limit", type=int, default=10, help="Number of results (default: 10)")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+    parser.add_argument("--root", type=Path, default=DEFAULT_ROOT, help="Food-bank root (default: data/food-data-bank)")
+    parser.add_argument("--no-refresh", action="store_true",
+                        help="Use the existing search index without checking the food bank for changes")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore any existing index and rebuild it")
+    profiling.add_profile_argument(parser)
+    args = parser.parse_args()
+    if args.limit < 1:
+        parser.error("--limit must be at least 1.")
+    profiling.setup("search_food_bank", args.profile)
+
+    if not args.root.exists():
+        print(f"Error: Could not find {args.root}", file=sys.stderr)
+        return 1
+
+    if args.rebuild:
+        try:
+            default_search_path(args.root).unlink()
+        except FileNotFoundError:
+            pass
+
+    index = load_search_index(args.root, refresh=not args.no_refresh)
+    query = " ".join(args.query)
+    with profiling.phase("compute"):
+        results = index.search(query, limit=args.limit)
+
+    if args.json:
+        print(json.dumps([{**asdict(result), "path": str(result.path)} for result in results], indent=2))
+        return 0
+
+    if not results:
+        print(f"No dishes match '{query}'")
+        return 0
+    for rank, result in enumerate(results, 1):
+        print(f"{rank}. {result.id} — {result.name} ({result.folder}) [{result.score:.2f}]")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
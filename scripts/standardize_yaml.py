@@ -20,6 +20,8 @@ import yaml
 from pathlib import Path
 from typing import List, Tuple
 
+import profiling
+
 
 def extract_yaml_from_markdown(content: str) -> Tuple[str, str, str]:
     """
@@ -232,7 +234,9 @@ def main():
     parser.add_argument('--all', action='store_true', help='Process all files in data/food-data-bank/')
     parser.add_argument('--validate-only', action='store_true', help='Only validate, do not modify files')
 
+    profiling.add_profile_argument(parser)
     args = parser.parse_args()
+    profiling.setup("standardize_yaml", args.profile)
 
     # Determine files to process
     if args.all:
@@ -4,10 +4,13 @@ Update existing log files to include all 52 nutrient fields.
 Adds missing nutrients with value 0 to maintain schema v2 consistency.
 """
 
+import argparse
 import yaml
 from pathlib import Path
 from datetime import datetime
 
+import profiling
+
 # All 52 required nutrients in schema v2 (in desired order)
 REQUIRED_NUTRIENTS = [
     # Energy & Core Macros
@@ -82,6 +85,11 @@ def update_log_file(log_path):
     return True
 
 def main():
+    parser = argparse.ArgumentParser(description="Add missing nutrient fields to every log file")
+    profiling.add_profile_argument(parser)
+    args = parser.parse_args()
+    profiling.setup("update_log_nutrients", args.profile)
+
     # Use relative path from script location
     logs_dir = Path(__file__).parent.parent / "data" / "logs"
 
@@ -9,7 +9,6 @@ listed for manual follow-up.
 from __future__ import annotations
 
 import argparse
-import re
 import shutil
 import tempfile
 from collections import defaultdict
@@ -20,6 +19,10 @@ from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 import yaml
 
+import profiling
+from food_bank_index import FoodBankIndex
+from log_store import LogStore
+
 getcontext().prec = 28
 
 EXPECTED_FIELDS: Sequence[str] = [
@@ -119,49 +122,6 @@ class ManualItem:
     notes: Optional[str]
 
 
-class FoodBankIndex:
-    def __init__(self, root: Path) -> None:
-        self.root = root
-        self._index: Dict[str, Path] = {}
-        self._cache: Dict[str, dict] = {}
-        self._build_index()
-
-    def _build_index(self) -> None:
-        for path in self.root.rglob("*.md"):
-            entry_id = self._extract_id(path)
-            if entry_id:
-                self._index[entry_id] = path
-
-    @staticmethod
-    def _extract_id(path: Path) -> Optional[str]:
-        inside_block = False
-        with path.open() as handle:
-            for line in handle:
-                stripped = line.strip()
-                if stripped.startswith("```yaml"):
-                    inside_block = True
-                    continue
-                if inside_block and stripped.startswith("```"):
-                    break
-                if inside_block and stripped.startswith("id:"):
-                    return stripped.split(":", 1)[1].strip()
-        return None
-
-    def get(self, entry_id: str) -> dict:
-        if entry_id in self._cache:
-            return self._cache[entry_id]
-        path = self._index.get(entry_id)
-        if not path:
-            raise KeyError(f"Food bank entry '{entry_id}' not found")
-        text = path.read_text()
-        match = re.search(r"```yaml\s*(.*?)```", text, re.S)
-        if not match:
-            raise ValueError(f"No YAML block found in {path}")
-        data = yaml.safe_load(match.group(1))
-        self._cache[entry_id] = data
-        return data
-
-
 def decimal_value(raw: Optional[float]) -> Decimal:
     if raw is None:
         return Decimal("0")
@@ -206,6 +166,7 @@ def atomic_write_yaml(file_path: Path, data: dict) -> None:
         
         # Atomic rename (POSIX guarantees atomicity)
         temp_path.rename(file_path)
+        profiling.record_write(file_path)
         
     except Exception as exc:
         # Clean up temp file if it exists
@@ -245,12 +206,69 @@ def build_scaled_nutrition(per_portion: dict, derived: dict, factor: Decimal) ->
     return result
 
 
+class ScaledNutritionCache:
+    """Batch rescaler: computes each (food_bank_id, scale factor) once per run.
+
+    A popular dish logged hundreds of times at the same quantity is scaled and
+    quantized a single time; every occurrence receives its own copy of the
+    result (shared dicts would be dumped as YAML aliases). Lookup errors are
+    memoized too, and a fresh exception is raised for each occurrence.
+    """
+
+    def __init__(self, food_bank: FoodBankIndex) -> None:
+        self.food_bank = food_bank
+        self._entries: Dict[str, dict] = {}
+        self._errors: Dict[str, Tuple[type, tuple]] = {}  # food_id -> (exception class, args)
+        self._scaled: Dict[Tuple[str, Decimal], Dict[str, float | int]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, food_id: str) -> dict:
+        entry = self._entries.get(food_id)
+        if entry is not None:
+            return entry
+        error = self._errors.get(food_id)
+        if error is not None:
+            error_class, args = error
+            raise error_class(*args)
+        try:
+            entry = self._entries[food_id] = self.food_bank.get(food_id)
+        except (KeyError, FileNotFoundError) as exc:
+            self._errors[food_id] = (type(exc), exc.args)
+            raise
+        return entry
+
+    def factor(self, food_id: str, quantity: Decimal, unit: str) -> Decimal:
+        """Scale factor for an item; raises KeyError/ValueError like the unbatched path."""
+        fb_entry = self._entry(food_id)
+        portion_weight = fb_entry.get("portion", {}).get("est_weight_g")
+        return scale_factor(quantity, unit, portion_weight)
+
+    def scaled(self, food_id: str, factor: Decimal) -> Dict[str, float | int]:
+        key = (food_id, factor)
+        cached = self._scaled.get(key)
+        if cached is None:
+            self.misses += 1
+            fb_entry = self._entry(food_id)
+            cached = build_scaled_nutrition(
+                fb_entry.get("per_portion", {}), fb_entry.get("derived", {}), factor
+            )
+            self._scaled[key] = cached
+        else:
+            self.hits += 1
+        return dict(cached)
+
+
 def diff_fields(current: dict, updated: dict) -> List[str]:
     """Compare current and updated nutrition, including optional alcohol fields."""
     diffs: List[str] = []
     
     # Check expected fields
     for field in EXPECTED_FIELDS:
+        cur_raw = current.get(field)
+        if cur_raw is not None and cur_raw == updated.get(field):
+            # Identical values (the common case) need no Decimal comparison
+            continue
         cur_val = decimal_value(current.get(field))
         new_val = decimal_value(updated.get(field))
         if current.get(field) is None:
@@ -304,18 +322,37 @@ def iter_log_files(paths: List[Path], logs_dir: Path) -> Iterable[Path]:
             yield path
 
 
+def referencing_logs(
+    log_paths: List[Path], logs_dir: Path, food_bank_ids: List[str], use_cache: bool = True
+) -> List[Path]:
+    """Keep only the log files that reference one of food_bank_ids.
+
+    Uses the log store's reverse index, so unchanged logs are not re-parsed.
+    """
+    store = LogStore(logs_dir, use_cache=use_cache)
+    referencing = set(store.files_referencing(food_bank_ids))
+    return [path for path in log_paths if path.resolve() in referencing]
+
+
 def process_file(
     log_path: Path,
     food_bank: FoodBankIndex,
     apply_changes: bool,
     create_backup: bool,
+    scaler: Optional[ScaledNutritionCache] = None,
 ) -> Tuple[List[ItemChange], List[ManualItem]]:
     if log_path.name == "SCHEMA.md":
         return [], []
-    data = yaml.safe_load(log_path.read_text())
+    if scaler is None:
+        scaler = ScaledNutritionCache(food_bank)
+    text = log_path.read_text()
+    profiling.record_read(log_path)
+    with profiling.phase("yaml_parse"):
+        data = yaml.safe_load(text)
     entries = data.get("entries") or []
     file_changes: List[ItemChange] = []
     manual_items: List[ManualItem] = []
+    nutrition_replaced = False
     for entry in entries:
         timestamp = entry.get("timestamp", "unknown")
         entry_notes = entry.get("notes")
@@ -343,8 +380,8 @@ def process_file(
                 )
                 continue
             try:
-                fb_entry = food_bank.get(food_id)
-            except (KeyError, ValueError, FileNotFoundError) as exc:
+                factor = scaler.factor(food_id, quantity, unit)
+            except (KeyError, FileNotFoundError) as exc:
                 file_changes.append(
                     ItemChange(
                         timestamp=timestamp,
@@ -353,11 +390,6 @@ def process_file(
                     )
                 )
                 continue
-            per_portion = fb_entry.get("per_portion", {})
-            derived = fb_entry.get("derived", {})
-            portion_weight = fb_entry.get("portion", {}).get("est_weight_g")
-            try:
-                factor = scale_factor(quantity, unit, portion_weight)
             except ValueError as exc:
                 file_changes.append(
                     ItemChange(
@@ -369,21 +401,24 @@ def process_file(
                 continue
             
             # Build updated nutrition including alcohol fields
-            updated_nutrition = build_scaled_nutrition(per_portion, derived, factor)
+            updated_nutrition = scaler.scaled(food_id, factor)
             diffs = diff_fields(nutrition, updated_nutrition)
             
             if diffs:
                 file_changes.append(ItemChange(timestamp=timestamp, name=name, fields_changed=diffs))
                 if apply_changes:
                     item["nutrition"] = updated_nutrition
-    if apply_changes and file_changes:
+                    nutrition_replaced = True
+    # Only rewrite files whose nutrition values actually changed
+    if apply_changes and nutrition_replaced:
         if create_backup:
             backup_path = log_path.with_suffix(log_path.suffix + ".bak")
             shutil.copy2(log_path, backup_path)
         
         # Use atomic write to prevent file corruption
         try:
-            atomic_write_yaml(log_path, data)
+            with profiling.phase("write"):
+                atomic_write_yaml(log_path, data)
         except RuntimeError as exc:
             print(f"[ERROR] Failed to write {log_path}: {exc}")
             # If backup exists, restore it
@@ -458,28 +493,50 @@ def main() -> None:
         type=Path,
         help="Root directory of log files (default: data/logs)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse every food-bank and log file instead of reusing the cached indexes",
+    )
+    parser.add_argument(
+        "--changed-dish",
+        action="append",
+        default=[],
+        metavar="ID",
+        help="Only process logs that reference this food_bank_id (repeatable)",
+    )
+    profiling.add_profile_argument(parser)
     args = parser.parse_args()
+    profiling.setup("update_logs_from_food_bank", args.profile)
 
-    food_bank = FoodBankIndex(args.food_bank_dir)
+    food_bank = FoodBankIndex(args.food_bank_dir, use_cache=not args.no_cache)
+    scaler = ScaledNutritionCache(food_bank)
     changes_by_file: Dict[Path, List[ItemChange]] = defaultdict(list)
     manual_items: List[ManualItem] = []
-    for log_path in iter_log_files([p for p in args.paths], args.logs_dir):
-        file_changes, manual = process_file(
-            log_path,
-            food_bank,
-            apply_changes=args.apply,
-            create_backup=not args.no_backup,
-        )
-        if file_changes:
-            changes_by_file[log_path].extend(file_changes)
-        manual_items.extend(manual)
-
-    if args.apply:
-        print("Updates applied to", len(changes_by_file), "file(s). Backups saved unless disabled.")
-    else:
-        print(summarize_changes(changes_by_file))
-    print()
-    print(summarize_manual(manual_items))
+    with profiling.phase("discovery"):
+        log_paths = list(iter_log_files([p for p in args.paths], args.logs_dir))
+    if args.changed_dish:
+        log_paths = referencing_logs(log_paths, args.logs_dir, args.changed_dish, use_cache=not args.no_cache)
+    with profiling.phase("compute"):
+        for log_path in log_paths:
+            file_changes, manual = process_file(
+                log_path,
+                food_bank,
+                apply_changes=args.apply,
+                create_backup=not args.no_backup,
+                scaler=scaler,
+            )
+            if file_changes:
+                changes_by_file[log_path].extend(file_changes)
+            manual_items.extend(manual)
+
+    with profiling.phase("render"):
+        if args.apply:
+            print("Updates applied to", len(changes_by_file), "file(s). Backups saved unless disabled.")
+        else:
+            print(summarize_changes(changes_by_file))
+        print()
+        print(summarize_manual(manual_items))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Persistent response cache for the USDA client
+
+Search results and food details are stored as JSON in a small SQLite file,
+keyed by normalized query or fdcId. Entries expire after a TTL, and once the
+cache holds more than max_entries the least recently used ones are evicted.
+
+Any object with get(key) and put(key, value) methods can be passed to
+UsdaApiClient instead; ResponseCache is the disk-backed default.
+
+The cache is only an optimization: a corrupt cache file is recreated, and
+if the file cannot be used at all (or a read/write fails, e.g. because the
+database is locked) lookups just go to the API.
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_CACHE_PATH = PROJECT_ROOT / "data" / ".cache" / "usda-responses.sqlite"
+
+# FDC publishes Foundation/SR Legacy updates a few times a year
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS response (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS response_used_at ON response (used_at);
+"""
+
+
+def search_key(query: str, page_size: int, data_types: List[str]) -> str:
+    """Cache key for a search: case and whitespace in the query don't matter."""
+    normalized = ' '.join(query.lower().split())
+    return f"search:{','.join(sorted(data_types))}:{page_size}:{normalized}"
+
+
+def food_key(fdc_id) -> str:
+    """Cache key for a food's details."""
+    return f"food:{int(fdc_id)}"
+
+
+class ResponseCache:
+    """Disk-backed cache with TTL, a size cap and LRU eviction"""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, clock: Callable[[], float] = time.time):
+        """
+        Open (or create) a response cache
+
+        Args:
+            path: SQLite file holding the cached responses
+            ttl: Seconds before an entry expires
+            max_entries: Entries kept before the least recently used are evicted
+            clock: Time source, in seconds (for tests)
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()  # the client may look up from worker threads
+        self._warned = False
+        self.conn: Optional[sqlite3.Connection] = None
+
+        try:
+            self.conn = self._connect()
+        except sqlite3.OperationalError as exc:
+            # Locked, read-only, can't be created...: leave the file alone
+            print(f"Warning: USDA cache disabled: {exc}", file=sys.stderr)
+        except sqlite3.DatabaseError as exc:
+            # Corrupt or not a database: start over with an empty cache
+            print(f"Warning: Recreating unreadable USDA cache {self.path}: {exc}", file=sys.stderr)
+            try:
+                for suffix in ('', '-wal', '-shm'):
+                    Path(f"{self.path}{suffix}").unlink(missing_ok=True)
+                self.conn = self._connect()
+            except (OSError, sqlite3.Error) as retry_exc:
+                print(f"Warning: USDA cache disabled: {retry_exc}", file=sys.stderr)
+        except (OSError, sqlite3.Error) as exc:
+            print(f"Warning: USDA cache disabled: {exc}", file=sys.stderr)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(SCHEMA)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    def _warn(self, exc: sqlite3.Error) -> None:
+        # Once per session, so a batch lookup doesn't print one line per food
+        if not self._warned:
+            self._warned = True
+            print(f"Warning: USDA cache error, continuing without it: {exc}", file=sys.stderr)
+
+    def close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+
+    def __len__(self) -> int:
+        if self.conn is None:
+            return 0
+        with self._lock:
+            try:
+                return self.conn.execute("SELECT COUNT(*) FROM response").fetchone()[0]
+            except sqlite3.Error as exc:
+                self._warn(exc)
+                return 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached response
+
+        Returns:
+            The cached value, or None if missing, expired or unreadable
+        """
+        now = self.clock()
+        with self._lock:
+            try:
+                row = self._lookup(key, now)
+            except sqlite3.Error as exc:
+                self._warn(exc)
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def _lookup(self, key: str, now: float) -> Optional[tuple]:
+        if self.conn is None:
+            return None
+        row = self.conn.execute("SELECT value, stored_at FROM response WHERE key = ?", (key,)).fetchone()
+        if row is None or now - row[1] > self.ttl:
+            if row is not None:
+                self.conn.execute("DELETE FROM response WHERE key = ?", (key,))
+            return None
+        self.conn.execute("UPDATE response SET used_at = ? WHERE key = ?", (now, key))
+        return row
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a response, evicting the least recently used entries if over max_entries.
+
+        A failed write (e.g. the database is locked) is skipped.
+        """
+        if self.conn is None:
+            return
+        now = self.clock()
+        encoded = json.dumps(value, separators=(',', ':'))
+        with self._lock:
+            try:
+                self.conn.execute("BEGIN IMMEDIATE")
+            except sqlite3.Error as exc:
+                self._warn(exc)
+                return
+            try:
+                self.conn.execute("INSERT OR REPLACE INTO response VALUES (?, ?, ?, ?)", (key, encoded, now, now))
+                excess = self.conn.execute("SELECT COUNT(*) FROM response").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    self.conn.execute(
+                        "DELETE FROM response WHERE key IN "
+                        "(SELECT key FROM response ORDER BY used_at, rowid LIMIT ?)",
+                        (excess,),
+                    )
+                self.conn.execute("COMMIT")
+            except BaseException as exc:
+                if self.conn.in_transaction:
+                    self.conn.execute("ROLLBACK")
+                if not isinstance(exc, sqlite3.Error):
+                    raise
+                self._warn(exc)
+                return
+            if excess > 0:
+                self.evictions += excess
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        if self.conn is None:
+            return
+        with self._lock:
+            try:
+                self.conn.execute("DELETE FROM response")
+            except sqlite3.Error as exc:
+                self._warn(exc)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters for this session plus the current size."""
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'entries': len(self)}
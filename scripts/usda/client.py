@@ -3,14 +3,132 @@
 USDA FoodData Central API Client
 
 Provides easy access to 600,000+ food items with complete nutritional profiles.
+Searches and food details can also be served offline from a local mirror of
+the FDC bulk downloads (see mirror.py).
 """
 
 import os
 import sys
 import json
 import requests
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Union
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from .cache import ResponseCache, food_key, search_key
+    from .mirror import DEFAULT_DB_PATH, FdcMirror
+except ImportError:  # run as a script
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # scripts/, for profiling
+    from cache import ResponseCache, food_key, search_key
+    from mirror import DEFAULT_DB_PATH, FdcMirror
+
+import profiling
+
+
+# Nutrient ID to field name mapping (USDA uses numeric IDs).
+# See NUTRIENT_ID_MAPPING.md for coverage notes and alternative IDs.
+NUTRIENT_MAPPING = {
+    # Macros & energy
+    1008: 'energy_kcal',
+    1003: 'protein_g',
+    1004: 'fat_g',
+    1258: 'sat_fat_g',
+    1292: 'mufa_g',
+    1293: 'pufa_g',
+    1257: 'trans_fat_g',
+    1253: 'cholesterol_mg',
+
+    # Carbohydrates (carbs_available_g is derived)
+    1005: 'carbs_total_g',
+    1018: 'polyols_g',  # Sugar alcohols (erythritol, xylitol, sorbitol, etc.)
+    2000: 'sugar_g',
+    1079: 'fiber_total_g',
+    1082: 'fiber_soluble_g',
+    1084: 'fiber_insoluble_g',
+
+    # Essential minerals
+    1093: 'sodium_mg',
+    1092: 'potassium_mg',
+    1087: 'calcium_mg',
+    1090: 'magnesium_mg',
+    1091: 'phosphorus_mg',
+    1088: 'chloride_mg',
+    1094: 'sulfur_g',
+
+    # Trace minerals
+    1089: 'iron_mg',
+    1095: 'zinc_mg',
+    1098: 'copper_mg',
+    1101: 'manganese_mg',
+    1103: 'selenium_ug',
+    1100: 'iodine_ug',
+    1096: 'chromium_ug',
+    1102: 'molybdenum_ug',
+
+    # Fat-soluble vitamins
+    1106: 'vitamin_a_ug',  # RAE
+    1114: 'vitamin_d_ug',  # D2 + D3
+    1109: 'vitamin_e_mg',  # alpha-tocopherol
+    1185: 'vitamin_k_ug',  # phylloquinone
+
+    # B vitamins and choline
+    1165: 'vitamin_b1_mg',
+    1166: 'vitamin_b2_mg',
+    1167: 'vitamin_b3_mg',
+    1170: 'vitamin_b5_mg',
+    1175: 'vitamin_b6_mg',
+    1176: 'vitamin_b7_ug',
+    1190: 'vitamin_b9_ug',  # DFE
+    1178: 'vitamin_b12_ug',
+    1180: 'choline_mg',
+
+    1162: 'vitamin_c_mg',
+
+    # Omega-3 and omega-6 fatty acids
+    1278: 'omega3_epa_mg',
+    1272: 'omega3_dha_mg',
+    1404: 'omega3_ala_g',
+    1269: 'omega6_la_g',
+
+    # boron_mg, silicon_mg, vanadium_ug and nickel_ug are not tracked by USDA
+}
+
+# Required fields for our nutrition schema (all 52 fields)
+REQUIRED_FIELDS = [
+    'energy_kcal', 'protein_g', 'fat_g', 'sat_fat_g', 'mufa_g', 'pufa_g',
+    'trans_fat_g', 'cholesterol_mg',
+    'carbs_total_g', 'polyols_g', 'carbs_available_g', 'sugar_g',
+    'fiber_total_g', 'fiber_soluble_g', 'fiber_insoluble_g',
+    'sodium_mg', 'potassium_mg', 'calcium_mg', 'magnesium_mg',
+    'phosphorus_mg', 'chloride_mg', 'sulfur_g',
+    'iron_mg', 'zinc_mg', 'copper_mg', 'manganese_mg',
+    'selenium_ug', 'iodine_ug', 'chromium_ug', 'molybdenum_ug',
+    'vitamin_a_ug', 'vitamin_d_ug', 'vitamin_e_mg', 'vitamin_k_ug',
+    'vitamin_b1_mg', 'vitamin_b2_mg', 'vitamin_b3_mg', 'vitamin_b5_mg',
+    'vitamin_b6_mg', 'vitamin_b7_ug', 'vitamin_b9_ug', 'vitamin_b12_ug',
+    'choline_mg',
+    'vitamin_c_mg',
+    'omega3_epa_mg', 'omega3_dha_mg', 'omega3_ala_g', 'omega6_la_g',
+    'boron_mg', 'silicon_mg', 'vanadium_ug', 'nickel_ug',
+]
+
+# FDC units that differ from our schema's: fatty acids are reported in g,
+# sulfur in mg
+UNIT_CONVERSIONS = {
+    1278: 1000,   # EPA g -> mg
+    1272: 1000,   # DHA g -> mg
+    1094: 0.001,  # Sulfur mg -> g
+}
+
+# Precomputed for parse_nutrition: the REQUIRED_FIELDS column of each mapped
+# nutrient ID, and the unit factor of each column
+NUTRIENT_COLUMNS = {nutrient_id: REQUIRED_FIELDS.index(field) for nutrient_id, field in NUTRIENT_MAPPING.items()}
+UNIT_FACTORS = [1.0] * len(REQUIRED_FIELDS)
+for _nutrient_id, _factor in UNIT_CONVERSIONS.items():
+    UNIT_FACTORS[NUTRIENT_COLUMNS[_nutrient_id]] = _factor
 
 
 class UsdaApiClient:
@@ -18,58 +136,79 @@ class UsdaApiClient:
 
     BASE_URL = "https://api.nal.usda.gov/fdc/v1"
 
+    # POST /foods accepts at most 20 FDC IDs per request
+    MAX_IDS_PER_REQUEST = 20
+
+    # Responses worth retrying (429 and 503 honour the Retry-After header)
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
     # Nutrient ID to field name mapping (USDA uses numeric IDs)
-    NUTRIENT_MAPPING = {
-        1008: 'energy_kcal',
-        1003: 'protein_g',
-        1004: 'fat_g',
-        1258: 'sat_fat_g',
-        1292: 'mufa_g',
-        1293: 'pufa_g',
-        1257: 'trans_fat_g',
-        1253: 'cholesterol_mg',
-        2000: 'sugar_g',
-        1079: 'fiber_total_g',
-        1082: 'fiber_soluble_g',
-        1084: 'fiber_insoluble_g',
-        1005: 'carbs_total_g',
-        1018: 'polyols_g',  # Sugar alcohols (erythritol, xylitol, sorbitol, etc.)
-        1093: 'sodium_mg',
-        1092: 'potassium_mg',
-        1100: 'iodine_ug',
-        1090: 'magnesium_mg',
-        1087: 'calcium_mg',
-        1089: 'iron_mg',
-        1095: 'zinc_mg',
-        1162: 'vitamin_c_mg',
-        1101: 'manganese_mg',
-    }
-
-    # Required fields for our nutrition schema (all 24 fields)
-    REQUIRED_FIELDS = [
-        'energy_kcal', 'protein_g', 'fat_g', 'sat_fat_g', 'mufa_g', 'pufa_g',
-        'trans_fat_g', 'cholesterol_mg', 'sugar_g', 'fiber_total_g',
-        'fiber_soluble_g', 'fiber_insoluble_g', 'carbs_total_g',
-        'carbs_available_g', 'sodium_mg', 'potassium_mg', 'iodine_ug',
-        'magnesium_mg', 'calcium_mg', 'iron_mg', 'zinc_mg', 'vitamin_c_mg',
-        'manganese_mg', 'polyols_g'
-    ]
-
-    def __init__(self, api_key: Optional[str] = None):
+    NUTRIENT_MAPPING = NUTRIENT_MAPPING
+
+    # Required fields for our nutrition schema (all 52 fields)
+    REQUIRED_FIELDS = REQUIRED_FIELDS
+
+    def __init__(self, api_key: Optional[str] = None, mirror: Optional[FdcMirror] = None,
+                 cache: Optional[ResponseCache] = None, base_url: Optional[str] = None,
+                 max_workers: int = 8, retries: int = 3, backoff: float = 0.5,
+                 timeout: float = 30):
         """
         Initialize USDA API client
 
         Args:
             api_key: USDA API key. If None, will look for USDA_API_KEY env var
+            mirror: Local FDC mirror to serve searches and details from. No API
+                key is needed (or used) when a mirror is given
+            cache: Cache for API responses (anything with get(key) and
+                put(key, value), e.g. ResponseCache). Not used with a mirror
+            base_url: API root (default: BASE_URL; tests point it at a stub server)
+            max_workers: Maximum concurrent requests made by batch lookups
+            retries: Retries for failed connections and RETRY_STATUSES responses
+            backoff: Exponential backoff factor between retries, in seconds
+            timeout: Seconds to wait for each response
         """
+        self.mirror = mirror
+        self.cache = cache
+        self.base_url = (base_url or self.BASE_URL).rstrip('/')
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.session = self._create_session(retries, backoff)
         self.api_key = api_key or os.environ.get('USDA_API_KEY')
-        if not self.api_key:
+        if not self.api_key and mirror is None:
             raise ValueError(
                 "USDA API key required. Set USDA_API_KEY environment variable "
                 "or pass api_key parameter. Get a free key at: "
                 "https://fdc.nal.usda.gov/api-key-signup.html"
             )
 
+    def _create_session(self, retries: int, backoff: float) -> requests.Session:
+        """
+        Create a pooled session that retries with backoff
+
+        The pool holds one connection per worker so batch lookups reuse
+        connections instead of opening one per request.
+        """
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset({'GET', 'POST'}),  # POST /foods only reads
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers, max_retries=retry)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _map(self, func: Callable, items: List) -> List:
+        """Apply func to items, at most max_workers at a time, keeping order"""
+        if self.mirror is not None or self.max_workers == 1 or len(items) < 2:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as pool:
+            return list(pool.map(func, items))
+
     def search_foods(self, query: str, page_size: int = 25,
                      data_types: List[str] = None) -> List[Dict]:
         """
@@ -86,6 +225,15 @@ class UsdaApiClient:
         if data_types is None:
             data_types = ['Foundation', 'SR Legacy']
 
+        if self.mirror is not None:
+            return self.mirror.search(query, page_size=page_size, data_types=data_types)
+
+        key = search_key(query, page_size, data_types)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
         params = {
             'api_key': self.api_key,
             'query': query,
@@ -94,7 +242,7 @@ class UsdaApiClient:
         }
 
         try:
-            response = requests.get(f"{self.BASE_URL}/foods/search", params=params)
+            response = self.session.get(f"{self.base_url}/foods/search", params=params, timeout=self.timeout)
             response.raise_for_status()
             data = response.json()
 
@@ -108,6 +256,8 @@ class UsdaApiClient:
                 print(f"Error: Invalid 'foods' format (expected list, got {type(foods).__name__})", file=sys.stderr)
                 return []
 
+            if self.cache is not None:
+                self.cache.put(key, foods)
             return foods
         except requests.exceptions.RequestException as e:
             print(f"Error searching USDA database: {e}", file=sys.stderr)
@@ -126,16 +276,112 @@ class UsdaApiClient:
         Returns:
             Detailed food information including all nutrients
         """
+        if self.mirror is not None:
+            return self.mirror.food(fdc_id)
+
+        key = food_key(fdc_id)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
         params = {'api_key': self.api_key}
 
         try:
-            response = requests.get(f"{self.BASE_URL}/food/{fdc_id}", params=params)
+            response = self.session.get(f"{self.base_url}/food/{fdc_id}", params=params, timeout=self.timeout)
             response.raise_for_status()
-            return response.json()
+            details = response.json()
         except requests.exceptions.RequestException as e:
             print(f"Error getting food details: {e}", file=sys.stderr)
             return None
 
+        if self.cache is not None and isinstance(details, dict):
+            self.cache.put(key, details)
+        return details
+
+    def get_foods_details(self, fdc_ids: Iterable[int]) -> Dict[int, Dict]:
+        """
+        Get detailed nutrition information for several foods at once
+
+        Cached foods are reused; the rest are fetched with POST /foods, up to
+        MAX_IDS_PER_REQUEST per request, with requests running concurrently.
+
+        Args:
+            fdc_ids: FoodData Central IDs
+
+        Returns:
+            Food details keyed by FDC ID (foods that were not found are missing)
+        """
+        ids = list(dict.fromkeys(int(fdc_id) for fdc_id in fdc_ids))
+        found = {}
+        if self.mirror is not None:
+            for fdc_id in ids:
+                details = self.mirror.food(fdc_id)
+                if details:
+                    found[fdc_id] = details
+            return found
+
+        missing = []
+        for fdc_id in ids:
+            cached = self.cache.get(food_key(fdc_id)) if self.cache is not None else None
+            if cached is not None:
+                found[fdc_id] = cached
+            else:
+                missing.append(fdc_id)
+
+        chunks = [missing[i:i + self.MAX_IDS_PER_REQUEST]
+                  for i in range(0, len(missing), self.MAX_IDS_PER_REQUEST)]
+        for foods in self._map(self._fetch_foods, chunks):
+            for details in foods:
+                if not isinstance(details, dict) or details.get('fdcId') is None:
+                    continue
+                fdc_id = int(details['fdcId'])
+                found[fdc_id] = details
+                if self.cache is not None:
+                    self.cache.put(food_key(fdc_id), details)
+        return found
+
+    def _fetch_foods(self, fdc_ids: List[int]) -> List[Dict]:
+        """Fetch up to MAX_IDS_PER_REQUEST foods in one POST /foods request"""
+        try:
+            response = self.session.post(
+                f"{self.base_url}/foods",
+                params={'api_key': self.api_key},
+                json={'fdcIds': fdc_ids},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            foods = response.json()
+        except requests.exceptions.RequestException as e:
+            print(f"Error getting food details: {e}", file=sys.stderr)
+            return []
+        except ValueError as e:
+            print(f"Error parsing USDA response: {e}", file=sys.stderr)
+            return []
+
+        if not isinstance(foods, list):
+            print(f"Error: Invalid response format (expected list, got {type(foods).__name__})", file=sys.stderr)
+            return []
+        return foods
+
+    def nutrient_vector(self, usda_food: Dict) -> List[float]:
+        """
+        Extract a food's per-100g nutrients as one value per REQUIRED_FIELDS column
+
+        Args:
+            usda_food: USDA food object from get_food_details()
+
+        Returns:
+            Amounts in FDC units (unmapped nutrients are ignored, missing ones are 0)
+        """
+        vector = [0.0] * len(REQUIRED_FIELDS)
+        for nutrient in usda_food.get('foodNutrients') or ():
+            nutrient_id = nutrient.get('nutrient', {}).get('id') or nutrient.get('nutrientId')
+            column = NUTRIENT_COLUMNS.get(nutrient_id)
+            if column is not None:
+                vector[column] = nutrient.get('amount') or 0
+        return vector
+
     def parse_nutrition(self, usda_food: Dict, serving_grams: float = 100) -> Dict:
         """
         Parse USDA nutrition data into our standard format
@@ -145,34 +391,44 @@ class UsdaApiClient:
             serving_grams: Serving size in grams (default: 100g)
 
         Returns:
-            Dictionary with standardized nutrition fields (per_portion format)
+            Dictionary with all 52 standardized nutrition fields (per_portion format)
+        """
+        return self._portion(self.nutrient_vector(usda_food), serving_grams)
+
+    def parse_nutrition_many(self, usda_foods: List[Dict],
+                             serving_grams: Union[float, List[float]] = 100) -> List[Dict]:
+        """
+        Parse several USDA foods at once
+
+        Args:
+            usda_foods: USDA food objects from get_food_details() or get_foods_details()
+            serving_grams: One serving size for every food, or one per food
+
+        Returns:
+            One parse_nutrition() result per food, in order
         """
-        nutrients = {}
-
-        # Extract nutrients from USDA data
-        if 'foodNutrients' in usda_food:
-            for nutrient in usda_food['foodNutrients']:
-                nutrient_id = nutrient.get('nutrient', {}).get('id') or nutrient.get('nutrientId')
-                if nutrient_id in self.NUTRIENT_MAPPING:
-                    field_name = self.NUTRIENT_MAPPING[nutrient_id]
-                    # USDA data is per 100g, scale to serving size
-                    value = nutrient.get('amount', 0)
-                    scaled_value = value * (serving_grams / 100)
-                    nutrients[field_name] = round(scaled_value, 2)
-
-        # Fill in missing required fields with 0
-        for field in self.REQUIRED_FIELDS:
-            if field not in nutrients:
-                nutrients[field] = 0
+        if isinstance(serving_grams, (int, float)):
+            serving_grams = [serving_grams] * len(usda_foods)
+        if len(serving_grams) != len(usda_foods):
+            raise ValueError(f"Got {len(serving_grams)} serving sizes for {len(usda_foods)} foods")
+        return [self._portion(self.nutrient_vector(food), grams)
+                for food, grams in zip(usda_foods, serving_grams)]
+
+    def _portion(self, vector: List[float], serving_grams: float) -> Dict:
+        """Scale a per-100g nutrient vector to a serving, converting to schema units"""
+        # USDA data is per 100g: one multiply per column covers scaling and units
+        scale = serving_grams / 100
+        nutrients = dict(zip(REQUIRED_FIELDS, [
+            round(value * factor * scale, 2) or 0 for value, factor in zip(vector, UNIT_FACTORS)
+        ]))
 
         # Calculate derived fields
         # carbs_available = carbs_total - fiber - polyols
-        if nutrients.get('carbs_available_g') == 0:
-            nutrients['carbs_available_g'] = max(0, round(
-                nutrients.get('carbs_total_g', 0) -
-                nutrients.get('fiber_total_g', 0) -
-                nutrients.get('polyols_g', 0), 2
-            ))
+        nutrients['carbs_available_g'] = max(0, round(
+            nutrients['carbs_total_g'] -
+            nutrients['fiber_total_g'] -
+            nutrients['polyols_g'], 2
+        ))
 
         return nutrients
 
@@ -186,12 +442,40 @@ class UsdaApiClient:
         Returns:
             Dict with food name, serving info, and complete nutrition data
         """
-        # Extract quantity and unit if present
-        serving_grams = self._extract_serving_size(query)
-
         # Search for food
-        results = self.search_foods(query, page_size=5)
+        best_match = self._best_match(self.search_foods(query, page_size=5))
+        if best_match is None:
+            return None
+
+        # Get detailed nutrition data
+        details = self.get_food_details(best_match['fdcId'])
+        return self._lookup_result(query, best_match, details)
+
+    def lookup_many(self, queries: Iterable[str]) -> List[Optional[Dict]]:
+        """
+        Quick lookup for many foods at once (e.g., a recipe's ingredients)
+
+        Searches run concurrently (at most max_workers at a time) and all
+        matches are then fetched together with POST /foods, so a batch costs
+        about two round-trips instead of two per query.
+
+        Args:
+            queries: Food descriptions (e.g., ["200g chicken breast", "1 banana"])
 
+        Returns:
+            One quick_lookup() result (or None) per query, in order
+        """
+        queries = list(queries)
+        matches = [self._best_match(results)
+                   for results in self._map(lambda query: self.search_foods(query, page_size=5), queries)]
+        details = self.get_foods_details(match['fdcId'] for match in matches if match is not None)
+        return [
+            self._lookup_result(query, match, details.get(int(match['fdcId']))) if match is not None else None
+            for query, match in zip(queries, matches)
+        ]
+
+    def _best_match(self, results: List[Dict]) -> Optional[Dict]:
+        """Pick the best search result, or None if there is no usable one"""
         if not results:
             return None
 
@@ -203,19 +487,23 @@ class UsdaApiClient:
         if not fdc_id or not isinstance(fdc_id, (int, str)):
             print(f"Error: Invalid or missing fdcId in search result", file=sys.stderr)
             return None
+        return best_match
 
-        # Get detailed nutrition data
-        details = self.get_food_details(fdc_id)
+    def _lookup_result(self, query: str, best_match: Dict, details: Optional[Dict]) -> Optional[Dict]:
+        """Build a quick_lookup() result from a search match and its details"""
         if not details:
             return None
 
+        # Extract quantity and unit if present
+        serving_grams = self._extract_serving_size(query)
+
         # Parse nutrition
         nutrition = self.parse_nutrition(details, serving_grams)
 
         return {
             'success': True,
             'food_name': best_match.get('description', 'Unknown food'),
-            'fdc_id': fdc_id,
+            'fdc_id': best_match['fdcId'],
             'serving_grams': serving_grams,
             'per_portion': nutrition,
             'source': 'USDA FoodData Central',
@@ -313,34 +601,67 @@ Examples:
 
   # Get nutrition data as JSON
   python scripts/usda/client.py lookup "2 eggs scrambled" --json
+
+  # Look up a recipe's ingredients in one batch
+  python scripts/usda/client.py batch "200g chicken breast" "150g rice cooked" "1 tbsp olive oil"
+
+  # Look up offline from the local mirror (see mirror.py)
+  python scripts/usda/client.py --mirror lookup "200g chicken breast"
         """
     )
 
-    parser.add_argument('command', choices=['search', 'details', 'lookup'],
+    parser.add_argument('command', choices=['search', 'details', 'lookup', 'batch'],
                         help='Command to execute')
-    parser.add_argument('query', help='Search query or FDC ID')
+    parser.add_argument('query', nargs='+',
+                        help='Search query or FDC ID (batch: one quoted query per food)')
     parser.add_argument('--json', action='store_true',
                         help='Output as JSON')
     parser.add_argument('--api-key', help='USDA API key (or set USDA_API_KEY env var)')
+    parser.add_argument('--mirror', action='store_true',
+                        help='Serve from the local FDC mirror instead of the API (no API key needed)')
+    parser.add_argument('--mirror-db', type=Path, default=DEFAULT_DB_PATH,
+                        help='Mirror database (default: %(default)s)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always query the API instead of reusing cached responses')
+    parser.add_argument('--cache-stats', action='store_true',
+                        help='Print response cache hits/misses to stderr when done')
+    profiling.add_profile_argument(parser)
 
     args = parser.parse_args()
+    profiling.setup("usda_client", args.profile)
 
     try:
-        client = UsdaApiClient(api_key=args.api_key)
+        mirror = FdcMirror(args.mirror_db) if args.mirror else None
+        cache = None if args.no_cache or mirror else ResponseCache()
+        client = UsdaApiClient(api_key=args.api_key, mirror=mirror, cache=cache)
+        query = ' '.join(args.query)
+
+        def print_lookup(result):
+            if result:
+                print(f"\nServing: {result['serving_grams']}g")
+                print(f"Source: {result['source']} (FDC ID: {result['fdc_id']})")
+                print(f"Confidence: {result['confidence']}")
+                summary = client.format_nutrition_summary(
+                    result['per_portion'],
+                    result['food_name']
+                )
+                print(summary)
+            else:
+                print("No results found")
 
         if args.command == 'search':
-            results = client.search_foods(args.query)
+            results = client.search_foods(query)
             if args.json:
                 print(json.dumps(results, indent=2))
             else:
-                print(f"\nFound {len(results)} results for '{args.query}':\n")
+                print(f"\nFound {len(results)} results for '{query}':\n")
                 for i, food in enumerate(results[:10], 1):
                     print(f"{i}. {food.get('description')} (FDC ID: {food.get('fdcId')})")
                     print(f"   Type: {food.get('dataType')}")
                     print()
 
         elif args.command == 'details':
-            fdc_id = int(args.query)
+            fdc_id = int(query)
             details = client.get_food_details(fdc_id)
             if args.json:
                 print(json.dumps(details, indent=2))
@@ -356,21 +677,25 @@ Examples:
                     print("Food not found")
 
         elif args.command == 'lookup':
-            result = client.quick_lookup(args.query)
+            result = client.quick_lookup(query)
             if args.json:
                 print(json.dumps(result, indent=2))
             else:
-                if result:
-                    print(f"\nServing: {result['serving_grams']}g")
-                    print(f"Source: {result['source']} (FDC ID: {result['fdc_id']})")
-                    print(f"Confidence: {result['confidence']}")
-                    summary = client.format_nutrition_summary(
-                        result['per_portion'],
-                        result['food_name']
-                    )
-                    print(summary)
-                else:
-                    print("No results found")
+                print_lookup(result)
+
+        elif args.command == 'batch':
+            results = client.lookup_many(args.query)
+            if args.json:
+                print(json.dumps(results, indent=2))
+            else:
+                for item, result in zip(args.query, results):
+                    print(f"\n# {item}")
+                    print_lookup(result)
+
+        if args.cache_stats and cache is not None:
+            stats = cache.stats()
+            print(f"Cache: {stats['hits']} hits, {stats['misses']} misses, "
+                  f"{stats['evictions']} evictions, {stats['entries']} entries", file=sys.stderr)
 
     except ValueError as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Local FoodData Central mirror
+
+Imports the FDC bulk downloads (Foundation and SR Legacy, JSON or CSV) into a
+single SQLite file and serves searches and food details from it: no API key,
+no rate limits, no network, and lookups in well under a millisecond.
+
+Layout of the database:
+- food:          one row per fdcId (description, data type, publication date)
+- food_fts:      FTS5 full-text index over food descriptions (porter stemming)
+- nutrient:      nutrient id -> name and unit
+- food_nutrient: sparse nutrient matrix, clustered by (fdc_id, nutrient_id),
+                 amounts per 100 g as published by FDC
+
+Bulk downloads: https://fdc.nal.usda.gov/download-datasets.html
+
+Usage:
+    python3 scripts/usda/mirror.py import FoodData_Central_foundation_food_json_*.zip \\
+        FoodData_Central_sr_legacy_food_json_*.zip
+    python3 scripts/usda/mirror.py search "chicken breast"
+    python3 scripts/usda/client.py --mirror lookup "200g chicken breast"
+"""
+
+import csv
+import io
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+if not __package__:  # run as a script
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # scripts/, for profiling
+
+import profiling
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / ".cache" / "usda-fdc.sqlite"
+
+SCHEMA_VERSION = 1
+
+DEFAULT_DATA_TYPES = ['Foundation', 'SR Legacy']
+
+# data_type values in the CSV downloads -> names used by the API and JSON
+CSV_DATA_TYPES = {
+    'foundation_food': 'Foundation',
+    'sr_legacy_food': 'SR Legacy',
+}
+
+# Serving-size words that should not take part in a description search
+UNIT_WORDS = {'g', 'gram', 'grams', 'oz', 'ounce', 'ounces', 'lb', 'lbs', 'pound', 'pounds'}
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE food (
+    fdc_id INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    data_type TEXT NOT NULL,
+    publication_date TEXT
+);
+CREATE VIRTUAL TABLE food_fts USING fts5(
+    description, content='food', content_rowid='fdc_id', tokenize='porter unicode61'
+);
+CREATE TABLE nutrient (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    unit_name TEXT NOT NULL,
+    number TEXT
+);
+CREATE TABLE food_nutrient (
+    fdc_id INTEGER NOT NULL,
+    nutrient_id INTEGER NOT NULL,
+    amount REAL NOT NULL,
+    PRIMARY KEY (fdc_id, nutrient_id)
+) WITHOUT ROWID;
+"""
+
+# (fdc_id, description, data_type, publication_date)
+FoodRow = Tuple[int, str, str, Optional[str]]
+# (id, name, unit_name, number)
+NutrientRow = Tuple[int, str, str, Optional[str]]
+# (fdc_id, nutrient_id, amount)
+AmountRow = Tuple[int, int, float]
+
+
+class _Importer:
+    """Collects rows from any number of bulk files into one database."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.nutrients: Dict[int, NutrientRow] = {}
+        self.foods = 0
+        self.amounts = 0
+
+    def add_foods(self, foods: Iterable[FoodRow]) -> None:
+        before = self.conn.total_changes
+        self.conn.executemany("INSERT OR REPLACE INTO food VALUES (?, ?, ?, ?)", foods)
+        self.foods += self.conn.total_changes - before
+
+    def add_amounts(self, amounts: Iterable[AmountRow]) -> None:
+        before = self.conn.total_changes
+        self.conn.executemany("INSERT OR REPLACE INTO food_nutrient VALUES (?, ?, ?)", amounts)
+        self.amounts += self.conn.total_changes - before
+
+    # --- JSON downloads ----------------------------------------------------
+
+    def add_json(self, handle) -> None:
+        """Import a Foundation/SR Legacy JSON download ({"FoundationFoods": [...]} etc.)."""
+        data = json.load(handle)
+        if isinstance(data, dict):
+            foods = [food for value in data.values() if isinstance(value, list) for food in value]
+        elif isinstance(data, list):
+            foods = data
+        else:
+            raise ValueError("Unrecognized FDC JSON: expected an object or a list of foods")
+
+        for food in foods:
+            if not isinstance(food, dict) or 'fdcId' not in food:
+                continue
+            fdc_id = int(food['fdcId'])
+            self.add_foods([(
+                fdc_id,
+                str(food.get('description', '')),
+                str(food.get('dataType', '')),
+                food.get('publicationDate'),
+            )])
+            self.add_amounts(self._json_amounts(fdc_id, food.get('foodNutrients') or []))
+
+    def _json_amounts(self, fdc_id: int, food_nutrients: List[Dict]) -> Iterator[AmountRow]:
+        for entry in food_nutrients:
+            nutrient = entry.get('nutrient') or {}
+            nutrient_id = nutrient.get('id')
+            amount = entry.get('amount')
+            if nutrient_id is None or amount is None:
+                continue
+            nutrient_id = int(nutrient_id)
+            if nutrient_id not in self.nutrients:
+                self.nutrients[nutrient_id] = (
+                    nutrient_id, str(nutrient.get('name', '')),
+                    str(nutrient.get('unitName', '')), nutrient.get('number'),
+                )
+            yield fdc_id, nutrient_id, float(amount)
+
+    # --- CSV downloads -----------------------------------------------------
+
+    def add_csv(self, open_member) -> None:
+        """Import a CSV download; open_member(name) opens food.csv, nutrient.csv, ... as text."""
+        with open_member('nutrient.csv') as f:
+            for row in csv.DictReader(f):
+                nutrient_id = int(row['id'])
+                self.nutrients[nutrient_id] = (
+                    nutrient_id, row['name'], row['unit_name'], row.get('nutrient_nbr') or None,
+                )
+
+        wanted = set()
+        foods = []
+        with open_member('food.csv') as f:
+            for row in csv.DictReader(f):
+                data_type = CSV_DATA_TYPES.get(row['data_type'])
+                if data_type is None:
+                    continue
+                fdc_id = int(row['fdc_id'])
+                wanted.add(fdc_id)
+                foods.append((fdc_id, row['description'], data_type, row.get('publication_date') or None))
+        self.add_foods(foods)
+
+        with open_member('food_nutrient.csv') as f:
+            self.add_amounts(
+                (int(row['fdc_id']), int(row['nutrient_id']), float(row['amount']))
+                for row in csv.DictReader(f)
+                if row['amount'] and int(row['fdc_id']) in wanted
+            )
+
+    def finish(self, sources: List[str]) -> None:
+        self.conn.executemany("INSERT OR REPLACE INTO nutrient VALUES (?, ?, ?, ?)", self.nutrients.values())
+        self.conn.execute("INSERT INTO food_fts(food_fts) VALUES ('rebuild')")
+        self.conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [
+            ('schema_version', str(SCHEMA_VERSION)),
+            ('sources', json.dumps(sources)),
+        ])
+
+
+def _find_member(names: List[str], filename: str) -> Optional[str]:
+    matches = [name for name in names if name.rsplit('/', 1)[-1] == filename]
+    return min(matches, key=len) if matches else None
+
+
+def _import_source(importer: _Importer, source: Path) -> None:
+    if source.is_dir():
+        def open_member(name):
+            found = list(source.rglob(name))
+            if not found:
+                raise ValueError(f"{source} has no {name}")
+            return open(min(found, key=lambda p: len(p.parts)), 'r', encoding='utf-8', newline='')
+
+        importer.add_csv(open_member)
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            names = archive.namelist()
+            json_members = [name for name in names if name.lower().endswith('.json')]
+            if json_members:
+                for name in json_members:
+                    with archive.open(name) as handle:
+                        importer.add_json(handle)
+                return
+
+            def open_member(name):
+                member = _find_member(names, name)
+                if member is None:
+                    raise ValueError(f"{source} has no {name}")
+                return io.TextIOWrapper(archive.open(member), encoding='utf-8', newline='')
+
+            importer.add_csv(open_member)
+    elif source.suffix.lower() == '.json':
+        with open(source, 'rb') as handle:
+            importer.add_json(handle)
+    else:
+        raise ValueError(f"Unsupported FDC download: {source} (expected .json, .zip or a CSV directory)")
+
+
+def import_bulk(sources: Iterable[Path], db_path: Path = DEFAULT_DB_PATH) -> Dict[str, int]:
+    """
+    Build the mirror database from FDC bulk downloads
+
+    The database is rebuilt from scratch and atomically replaces db_path, so
+    pass every download that should be in the mirror (e.g. both Foundation
+    and SR Legacy).
+
+    Args:
+        sources: JSON files, zip archives (JSON or CSV) or extracted CSV directories
+        db_path: Where to write the database
+
+    Returns:
+        Counts of imported foods, nutrients and food-nutrient amounts
+    """
+    sources = [Path(source) for source in sources]
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=db_path.parent, prefix=db_path.name, suffix=".tmp")
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(tmp_name)
+        try:
+            conn.execute("PRAGMA journal_mode = OFF")
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.executescript(SCHEMA)
+            importer = _Importer(conn)
+            with conn:
+                for source in sources:
+                    _import_source(importer, source)
+                importer.finish([source.name for source in sources])
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        os.replace(tmp_name, db_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+    return {'foods': importer.foods, 'nutrients': len(importer.nutrients), 'amounts': importer.amounts}
+
+
+def fts_query(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query matching any of its words
+
+    Numbers and serving units ("200g", "oz") are dropped; results matching
+    more of the remaining words rank higher.
+    """
+    words = [word for word in re.findall(r"[^\W\d_]+", query.lower())
+             if len(word) > 1 and word not in UNIT_WORDS]
+    if not words:
+        return None
+    return ' OR '.join(f'"{word}"' for word in dict.fromkeys(words))
+
+
+class FdcMirror:
+    """Read-only access to a mirror database built by import_bulk()"""
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH):
+        """
+        Open a mirror database
+
+        Args:
+            db_path: Path to the SQLite file written by import_bulk()
+        """
+        self.db_path = Path(db_path)
+        if not self.db_path.is_file():
+            raise ValueError(
+                f"FDC mirror not found at {self.db_path}. Build it with: "
+                "python3 scripts/usda/mirror.py import <FDC bulk download>..."
+            )
+        # check_same_thread=False: the connection is read-only
+        self.conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True,
+                                    check_same_thread=False)
+        version = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if not version or int(version[0]) != SCHEMA_VERSION:
+            self.conn.close()
+            raise ValueError(f"{self.db_path} was built by another mirror version; re-run the import")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM food").fetchone()[0]
+
+    def search(self, query: str, page_size: int = 25,
+               data_types: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Search food descriptions, best match first
+
+        Args:
+            query: Search term (e.g., "chicken breast")
+            page_size: Number of results to return (default: 25)
+            data_types: Data types to search. Default: Foundation, SR Legacy
+
+        Returns:
+            List of foods in the shape of the API's /foods/search results
+        """
+        match = fts_query(query)
+        if match is None:
+            return []
+        if data_types is None:
+            data_types = DEFAULT_DATA_TYPES
+        placeholders = ','.join('?' * len(data_types))
+        rows = self.conn.execute(
+            f"""
+            SELECT food.fdc_id, food.description, food.data_type, food.publication_date
+            FROM food_fts JOIN food ON food.fdc_id = food_fts.rowid
+            WHERE food_fts MATCH ? AND food.data_type IN ({placeholders})
+            ORDER BY bm25(food_fts), length(food.description)
+            LIMIT ?
+            """,
+            [match, *data_types, page_size],
+        ).fetchall()
+        return [
+            {'fdcId': fdc_id, 'description': description, 'dataType': data_type,
+             'publicationDate': published}
+            for fdc_id, description, data_type, published in rows
+        ]
+
+    def food(self, fdc_id: int) -> Optional[Dict]:
+        """
+        Get one food with all its nutrients
+
+        Args:
+            fdc_id: FoodData Central ID
+
+        Returns:
+            Food in the shape of the API's /food/{fdcId} response, or None
+        """
+        row = self.conn.execute(
+            "SELECT description, data_type, publication_date FROM food WHERE fdc_id = ?", (int(fdc_id),)
+        ).fetchone()
+        if row is None:
+            return None
+        nutrients = self.conn.execute(
+            """
+            SELECT n.id, n.number, n.name, n.unit_name, fn.amount
+            FROM food_nutrient fn JOIN nutrient n ON n.id = fn.nutrient_id
+            WHERE fn.fdc_id = ?
+            ORDER BY fn.nutrient_id
+            """,
+            (int(fdc_id),),
+        ).fetchall()
+        return {
+            'fdcId': int(fdc_id),
+            'description': row[0],
+            'dataType': row[1],
+            'publicationDate': row[2],
+            'foodNutrients': [
+                {'nutrient': {'id': nid, 'number': number, 'name': name, 'unitName': unit}, 'amount': amount}
+                for nid, number, name, unit, amount in nutrients
+            ],
+        }
+
+
+def main():
+    """Command-line interface for the FDC mirror"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Local FoodData Central mirror',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Build the mirror from the Foundation and SR Legacy downloads
+  python scripts/usda/mirror.py import FoodData_Central_foundation_food_json_2024-10-31.zip \\
+      FoodData_Central_sr_legacy_food_json_2018-04.zip
+
+  # Search it
+  python scripts/usda/mirror.py search "chicken breast"
+
+  # Serve client lookups from it
+  python scripts/usda/client.py --mirror lookup "200g chicken breast"
+        """
+    )
+    parser.add_argument('--db', type=Path, default=DEFAULT_DB_PATH,
+                        help='Mirror database (default: %(default)s)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    import_parser = subparsers.add_parser('import', help='Build the mirror from FDC bulk downloads')
+    import_parser.add_argument('sources', nargs='+', type=Path,
+                               help='JSON files, zip archives or extracted CSV directories')
+    search_parser = subparsers.add_parser('search', help='Search the mirror')
+    search_parser.add_argument('query')
+    search_parser.add_argument('--limit', type=int, default=10)
+    subparsers.add_parser('stats', help='Show what the mirror contains')
+    profiling.add_profile_argument(parser)
+
+    args = parser.parse_args()
+    profiling.setup("usda_mirror", args.profile)
+
+    try:
+        if args.command == 'import':
+            counts = import_bulk(args.sources, args.db)
+            print(f"✓ Imported {counts['foods']} foods, {counts['nutrients']} nutrients, "
+                  f"{counts['amounts']} amounts into {args.db}")
+            return
+
+        mirror = FdcMirror(args.db)
+        if args.command == 'search':
+            for i, food in enumerate(mirror.search(args.query, page_size=args.limit), 1):
+                print(f"{i}. {food['description']} (FDC ID: {food['fdcId']}, {food['dataType']})")
+        else:
+            sources = mirror.conn.execute("SELECT value FROM meta WHERE key = 'sources'").fetchone()
+            print(f"{args.db}: {len(mirror)} foods from {', '.join(json.loads(sources[0]))}")
+    except (ValueError, OSError, sqlite3.Error, zipfile.BadZipFile) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -96,7 +96,7 @@ def test_quick_lookup():
 
 
 def test_all_required_fields():
-    """Test that all 24 required fields are present"""
+    """Test that all 52 required fields are present"""
     print("Test 4: All Required Fields Present")
     print("-" * 50)
 
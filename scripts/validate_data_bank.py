@@ -18,6 +18,9 @@ except Exception as e:
     sys.stderr.write("This script requires PyYAML. Install with: pip install pyyaml\n")
     raise
 
+import profiling
+from food_bank_index import FoodBankIndex
+
 # Validation constants with rationale:
 # - TOL_ENERGY_PCT: ±8% tolerance for energy calculations to account for rounding in
 #   macronutrient values and natural variation in Atwater factors (4-4-9 rule)
@@ -137,44 +140,24 @@ POLYOL_PATTERN = re.compile(
 )
 
 
-def parse_yaml_from_file(filepath):
-    """Parse YAML block from a dish markdown file.
-
-    Returns: (raw_yaml_text, parsed_dict) or (None, None) if parsing fails
-    """
-    try:
-        content = filepath.read_text(encoding='utf-8')
-
-        # Find YAML block
-        yaml_start = content.index('```yaml') + 7
-        yaml_end = content.index('```', yaml_start)
-        yaml_text = content[yaml_start:yaml_end].strip()
-
-        # Parse YAML
-        data = yaml.safe_load(yaml_text)
-
-        return (yaml_text, data)
-    except Exception as e:
-        print(f"Warning: Failed to parse {filepath.name}: {e}", file=sys.stderr)
-        return (None, None)
-
-
-def scan_data_bank(data_bank_dir):
+def scan_data_bank(data_bank_dir, use_cache=True):
     """Scan data bank directory and return all dish files.
 
-    Returns: list of (filepath, raw_yaml, parsed_dict) tuples
+    Dish files are read through the shared compiled index (see
+    food_bank_index.py), so unchanged files are not re-parsed between runs.
+
+    Returns: list of (filepath, parsed_dict) tuples
     """
     blocks = []
 
-    # Find all .md files recursively
-    for filepath in sorted(data_bank_dir.rglob('*.md')):
-        # Skip README and RESEARCH files
-        if filepath.name in ['README.md', 'RESEARCH.md', 'index.md']:
+    index = FoodBankIndex(data_bank_dir, use_cache=use_cache)
+    for record in index.records:
+        if record.error:
+            print(f"Warning: Failed to parse {record.path.name}: {record.error}", file=sys.stderr)
             continue
-
-        raw, data = parse_yaml_from_file(filepath)
+        data = record.data
         if data and isinstance(data, dict) and 'id' in data:
-            blocks.append((filepath, raw, data))
+            blocks.append((record.path, data))
 
     return blocks
 
@@ -432,17 +415,6 @@ def check_block(y, filepath):
     }
 
 
-def process_single_file(filepath):
-    """Process a single file for parallel execution.
-
-    Returns: validation result dict or None if parsing fails
-    """
-    raw, data = parse_yaml_from_file(filepath)
-    if data and isinstance(data, dict) and 'id' in data:
-        return check_block(data, filepath)
-    return None
-
-
 def main():
     import argparse
     parser = argparse.ArgumentParser(description="Validate all nutrition dish files in the Data Bank")
@@ -450,7 +422,10 @@ def main():
     parser.add_argument("--no-index", action="store_true", help="Skip automatic index regeneration")
     parser.add_argument("--parallel", action="store_true", help="Use parallel processing for validation (faster for large food banks)")
     parser.add_argument("--jobs", type=int, default=None, help="Number of parallel jobs (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Parse every dish file instead of reusing the compiled index")
+    profiling.add_profile_argument(parser)
     args = parser.parse_args()
+    profiling.setup("validate_data_bank", args.profile)
 
     # Determine path
     if args.data_bank_dir:
@@ -465,61 +440,59 @@ def main():
 
     print(f"Scanning: {path}")
 
-    # Find all dish files
-    dish_files = []
-    for filepath in sorted(path.rglob('*.md')):
-        if filepath.name not in ['README.md', 'RESEARCH.md', 'index.md']:
-            dish_files.append(filepath)
+    # Load dish files (only changed files are re-parsed; see food_bank_index.py)
+    blocks = scan_data_bank(path, use_cache=not args.no_cache)
 
     report = {"directory": str(path), "checked": 0, "results": []}
 
     # Process files (parallel or sequential)
-    if args.parallel:
-        # Parallel processing
-        max_workers = args.jobs if args.jobs else cpu_count()
-        print(f"Using parallel processing with {max_workers} workers...")
-
-        with ProcessPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all files for processing
-            future_to_file = {executor.submit(process_single_file, fp): fp for fp in dish_files}
-
-            # Collect results as they complete
-            for future in as_completed(future_to_file):
-                result = future.result()
-                if result:
-                    report["results"].append(result)
-                    report["checked"] += 1
-    else:
-        # Sequential processing (original behavior)
-        blocks = scan_data_bank(path)
-        for filepath, raw, y in blocks:
-            res = check_block(y, filepath)
-            report["results"].append(res)
-            report["checked"] += 1
+    with profiling.phase("compute"):
+        if args.parallel:
+            # Parallel processing
+            max_workers = args.jobs if args.jobs else cpu_count()
+            print(f"Using parallel processing with {max_workers} workers...")
+
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                # Submit all parsed dishes for checking
+                futures = [executor.submit(check_block, y, filepath) for filepath, y in blocks]
+
+                # Collect results as they complete
+                for future in as_completed(futures):
+                    result = future.result()
+                    if result:
+                        report["results"].append(result)
+                        report["checked"] += 1
+        else:
+            # Sequential processing (original behavior)
+            for filepath, y in blocks:
+                res = check_block(y, filepath)
+                report["results"].append(res)
+                report["checked"] += 1
 
     # Human summary
-    print("\n" + "=" * 80)
-    print("DATA BANK VALIDATION REPORT")
-    print("=" * 80)
-    print(f"Directory: {path}")
-    print(f"Dishes checked: {report['checked']}")
-    print()
-
-    for res in report["results"]:
-        print(f"## {res['id']}")
-        print(f"   File: {res['filepath']}")
-        for p in res["passes"]:
-            print(f"  ✓ PASS: {p}")
-        for w in res["warnings"]:
-            print(f"  ⚠ WARN: {w}")
-        for i in res["issues"]:
-            print(f"  ✗ FAIL: {i}")
+    with profiling.phase("render"):
+        print("\n" + "=" * 80)
+        print("DATA BANK VALIDATION REPORT")
+        print("=" * 80)
+        print(f"Directory: {path}")
+        print(f"Dishes checked: {report['checked']}")
         print()
 
-    print("=" * 80)
-    print("JSON REPORT")
-    print("=" * 80)
-    print(json.dumps(report, indent=2))
+        for res in report["results"]:
+            print(f"## {res['id']}")
+            print(f"   File: {res['filepath']}")
+            for p in res["passes"]:
+                print(f"  ✓ PASS: {p}")
+            for w in res["warnings"]:
+                print(f"  ⚠ WARN: {w}")
+            for i in res["issues"]:
+                print(f"  ✗ FAIL: {i}")
+            print()
+
+        print("=" * 80)
+        print("JSON REPORT")
+        print("=" * 80)
+        print(json.dumps(report, indent=2))
 
     # Check for critical issues (exit code for CI/CD)
     has_issues = any(res['issues'] for res in report['results'])
@@ -534,9 +507,12 @@ def main():
             print("\n" + "=" * 80)
             print("INDEX GENERATION")
             print("=" * 80)
+            cmd = [sys.executable, str(generate_index_script), "--incremental"]
+            if profiling.PROFILE.enabled:
+                cmd.append("--profile")
             try:
                 result = subprocess.run(
-                    [sys.executable, str(generate_index_script)],
+                    cmd,
                     capture_output=True,
                     text=True,
                     check=True
@@ -544,6 +520,9 @@ def main():
                 stdout = result.stdout.strip()
                 if stdout:
                     print(stdout)
+                if profiling.PROFILE.enabled and result.stderr:
+                    # The child's profile JSON
+                    sys.stderr.write(result.stderr)
             except subprocess.CalledProcessError as e:
                 print(f"Warning: Failed to regenerate index: {e}")
                 if e.stderr:
@@ -9,11 +9,14 @@ Checks:
 4. YAML is well-formed
 """
 
+import argparse
 import yaml
 from pathlib import Path
 import sys
 import re
 
+import profiling
+
 
 def validate_config():
     """Validate venue configuration against actual folder structure."""
@@ -137,5 +140,10 @@ def validate_config():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate venue-mappings.yaml against the food-bank folders")
+    profiling.add_profile_argument(parser)
+    args = parser.parse_args()
+    profiling.setup("validate_venue_config", args.profile)
+
     success = validate_config()
     sys.exit(0 if success else 1)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Shared builders for test fixtures.
+
+Tests write small food-bank and log trees under tmp_path; these helpers
+lay files out the way data/ does so every test builds them the same way.
+"""
+
+import yaml
+
+
+def write_dish(root, category_path, name, dish_id, **fields):
+    """Write root/category_path/<dish_id>.md with a header and YAML block.
+
+    Extra keyword arguments become top-level YAML fields next to 'id'.
+    Returns the path of the written file.
+    """
+    path = root / category_path / f'{dish_id}.md'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {'id': dish_id, **fields}
+    path.write_text(f"## {name}\n\n```yaml\n{yaml.safe_dump(data, sort_keys=False)}```\n", encoding='utf-8')
+    return path
+
+
+def log_item(item):
+    """Expand an item tuple (name, nutrition[, food_bank_id]) into a log item.
+
+    Dicts are passed through unchanged.
+    """
+    if isinstance(item, dict):
+        return item
+    name, nutrition, *food_bank_id = item
+    entry = {'name': name}
+    if food_bank_id and food_bank_id[0] is not None:
+        entry['food_bank_id'] = food_bank_id[0]
+    entry['nutrition'] = nutrition
+    return entry
+
+
+def write_log(logs_dir, day, entries, day_type='rest'):
+    """Write logs_dir/YYYY-MM/DD.yaml for one day.
+
+    entries is a list of (timestamp, items). A bare 'HH:MM' timestamp is
+    placed on day in UTC; full ISO timestamps are kept as given.
+    Returns the path of the written file.
+    """
+    path = logs_dir / day.strftime('%Y-%m') / f"{day.day:02d}.yaml"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        'date': day,
+        'day_type': day_type,
+        'entries': [
+            {
+                'timestamp': timestamp if 'T' in timestamp else f"{day.isoformat()}T{timestamp}:00+00:00",
+                'items': [log_item(item) for item in items],
+            }
+            for timestamp, items in entries
+        ],
+    }
+    path.write_text(yaml.safe_dump(data, sort_keys=False), encoding='utf-8')
+    return path
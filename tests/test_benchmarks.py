@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Unit tests for benchmarks/generators.py and benchmarks/harness.py
+
+Tests cover:
+- Generated dishes pass validate_data_bank checks
+- Generated logs pass the merge_food_logs schema check
+- Generation is deterministic
+- Regression detection against baselines
+"""
+
+import sys
+from pathlib import Path
+
+import yaml
+
+# Add scripts and benchmarks directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'benchmarks'))
+
+from generators import generate_food_bank, generate_logs
+from harness import Measurement, find_regressions, record_baselines
+from food_bank_index import FoodBankIndex
+from merge_food_logs import validate_log_schema
+from validate_data_bank import REQUIRED_NUTRIENTS, check_block
+
+
+class TestGenerators:
+    """Test the synthetic data generators."""
+
+    def test_dishes_are_valid(self, tmp_path):
+        generate_food_bank(tmp_path / 'food-data-bank', 20)
+        index = FoodBankIndex(tmp_path / 'food-data-bank', use_cache=False)
+        assert len(index) == 20
+        for record in index.records:
+            result = check_block(record.data, record.path)
+            assert result['issues'] == [] and result['warnings'] == []
+            assert set(record.data['per_portion']) == set(REQUIRED_NUTRIENTS)
+
+    def test_logs_match_schema(self, tmp_path):
+        dishes = generate_food_bank(tmp_path / 'food-data-bank', 10)
+        paths = generate_logs(tmp_path / 'logs', 40, dishes)
+        assert [p.relative_to(tmp_path / 'logs').as_posix() for p in paths[:2]] == [
+            '2021-01/01.yaml', '2021-01/02.yaml'
+        ]
+        for path in paths:
+            assert validate_log_schema(yaml.safe_load(path.read_text(encoding='utf-8')), str(path)) == []
+
+    def test_same_seed_same_bytes(self, tmp_path):
+        dishes = generate_food_bank(tmp_path / 'a' / 'bank', 5)
+        generate_food_bank(tmp_path / 'b' / 'bank', 5)
+        a = generate_logs(tmp_path / 'a' / 'logs', 3, dishes)
+        b = generate_logs(tmp_path / 'b' / 'logs', 3, dishes)
+        assert [p.read_bytes() for p in a] == [p.read_bytes() for p in b]
+
+
+class TestRegressions:
+    """Test comparison against stored baselines."""
+
+    def test_slower_and_larger_cases_are_flagged(self):
+        baseline = record_baselines({}, 'small', [
+            Measurement('fast', 1.0, 1000),
+            Measurement('tiny', 0.01, 1000),
+        ])['small']
+        regressions = find_regressions([
+            Measurement('fast', 2.0, 1300),
+            Measurement('tiny', 0.03, 1000),  # 3x, but within the absolute slack
+            Measurement('new', 9.0, 9999),    # no baseline yet
+        ], baseline)
+        assert [(r.name, r.metric) for r in regressions] == [('fast', 'seconds'), ('fast', 'peak_kb')]
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scripts/check_log_vs_food_bank.py
+
+Tests cover:
+- Zero-value discrepancy detection against the food bank
+- Items without a food_bank_id
+- Parallel checking yields the same rows in the same order
+- Streaming JSON-lines output
+- Float fast path agrees with the exact Decimal engine
+"""
+
+import json
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+import yaml
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from food_bank_index import FoodBankIndex
+from check_log_vs_food_bank import (
+    check_entries,
+    find_discrepancies,
+    iter_discrepancies,
+    list_log_files,
+    stream_jsonl,
+)
+from helpers import write_dish, write_log
+
+
+@pytest.fixture
+def food_bank(tmp_path):
+    root = tmp_path / 'food-data-bank'
+    write_dish(root, 'generic/ingredients', 'Oats', 'oats_v1', portion={'est_weight_g': 40},
+               per_portion={'energy_kcal': 150, 'protein_g': 5, 'fiber_total_g': 4})
+    return FoodBankIndex(root, use_cache=False)
+
+
+@pytest.fixture
+def logs_dir(tmp_path):
+    logs = tmp_path / 'logs'
+    for day in range(1, 7):
+        write_log(logs, date(2025, 11, day), [('08:00', [
+            # Fiber missing from the log but present in the food bank
+            {'name': 'Oats', 'food_bank_id': 'oats_v1', 'quantity': 80, 'unit': 'g',
+             'nutrition': {'energy_kcal': 300, 'protein_g': 10}},
+            {'name': f'Snack {day}', 'quantity': 1, 'unit': 'portion',
+             'nutrition': {'energy_kcal': 100}},
+        ])])
+    return logs
+
+
+class TestFindDiscrepancies:
+    """Test discrepancy detection."""
+
+    def test_zero_fields_are_flagged(self, logs_dir, food_bank):
+        discrepancies, manual = find_discrepancies(logs_dir, food_bank)
+        assert len(discrepancies) == 6
+        row = discrepancies[0]
+        assert (row.name, row.nutrient, row.log_value, row.expected_value) == (
+            'Oats', 'fiber_total_g', 'missing', '8'
+        )
+        assert [item.name for item in manual] == [f'Snack {day}' for day in range(1, 7)]
+
+    def test_missing_food_bank_entry(self, logs_dir, food_bank):
+        path = logs_dir / '2025-11' / '07.yaml'
+        path.write_text(yaml.safe_dump({'entries': [{'timestamp': 't', 'items': [
+            {'name': 'Ghost', 'food_bank_id': 'ghost_v1', 'nutrition': {}}
+        ]}]}), encoding='utf-8')
+
+        discrepancies, _ = find_discrepancies(logs_dir, food_bank, [path])
+        assert discrepancies[0].nutrient == 'food_bank_lookup'
+
+
+class TestParallel:
+    """Test the process-pool mode."""
+
+    def test_parallel_matches_serial(self, logs_dir, food_bank):
+        serial = find_discrepancies(logs_dir, food_bank)
+        parallel = find_discrepancies(logs_dir, food_bank, jobs=2)
+        assert parallel == serial
+
+    def test_results_follow_file_order(self, logs_dir, food_bank):
+        log_files = list_log_files(logs_dir)
+        files = [manual[0].file for _, manual in iter_discrepancies(log_files, food_bank, jobs=3)]
+        assert files == log_files
+
+
+class TestStreaming:
+    """Test JSON-lines output."""
+
+    def test_one_json_object_per_row(self, logs_dir, food_bank, capsys):
+        stream_jsonl(iter_discrepancies(list_log_files(logs_dir), food_bank))
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert len(lines) == 12
+        assert lines[0]['kind'] == 'discrepancy'
+        assert lines[0]['file'].endswith('01.yaml')
+        assert lines[1]['kind'] == 'manual'
+
+
+class TestFloatFastPath:
+    """Test that the float engine reports exactly what the Decimal engine does."""
+
+    def test_matches_exact_on_real_logs(self, logs_dir, food_bank):
+        assert find_discrepancies(logs_dir, food_bank) == find_discrepancies(
+            logs_dir, food_bank, exact=True
+        )
+
+    @pytest.mark.parametrize('quantity, unit', [
+        (1, 'portion'), (0.5, 'portion'), (3, 'portion'), (0.333, 'portion'),
+        (1, 'g'), (7, 'g'), (123.4, 'g'), (0, 'g'),
+    ])
+    def test_matches_exact_across_scale_factors(self, tmp_path, food_bank, quantity, unit):
+        data = {'entries': [{'timestamp': 't', 'items': [
+            {'name': 'Oats', 'food_bank_id': 'oats_v1', 'quantity': quantity, 'unit': unit,
+             'nutrition': {'energy_kcal': 0}},
+        ]}]}
+        log = tmp_path / 'log.yaml'
+        assert check_entries(log, data, food_bank) == check_entries(log, data, food_bank, exact=True)
+
+    def test_values_at_threshold_are_reported(self, tmp_path):
+        bank = tmp_path / 'bank'
+        dish = write_dish(bank, 'generic/ingredients', 'Trace', 'trace_v1', portion={'est_weight_g': 7},
+                          per_portion={'selenium_ug': 0.0007, 'iodine_ug': 0.00069})
+        bank = FoodBankIndex(bank, use_cache=False)
+        # 1 g of a 7 g portion: selenium is exactly the threshold in Decimal but
+        # 9.999999999999999e-05 in binary floating point; iodine is just below
+        data = {'entries': [{'timestamp': 't', 'items': [
+            {'name': 'Trace', 'food_bank_id': 'trace_v1', 'quantity': 1, 'unit': 'g', 'nutrition': {}},
+        ]}]}
+        fast, _ = check_entries(dish, data, bank)
+        exact, _ = check_entries(dish, data, bank, exact=True)
+        assert [row.nutrient for row in fast] == [row.nutrient for row in exact] == ['selenium_ug']
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scripts/daily_rollup.py
+
+Tests cover:
+- Per-day totals of the recorded nutrients
+- Entry counts, first/last meal and meal outline
+- Incremental updates keyed by stat and content hash
+- Week/month/year partials and range aggregation
+- Handling of malformed logs
+"""
+
+import math
+import os
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from daily_rollup import Aggregate, DailyRollup, cover
+from helpers import write_log
+
+
+def bump_mtime(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def logs_dir(tmp_path):
+    logs = tmp_path / 'logs'
+    write_log(logs, date(2025, 10, 31), [
+        ('19:30', [('Pint of lager', {'energy_kcal': 180})]),
+        ('08:00', [('Eggs', {'energy_kcal': 150, 'protein_g': 12.5}),
+                   ('Toast', {'energy_kcal': 90, 'protein_g': 3})]),
+    ], day_type='training')
+    write_log(logs, date(2025, 11, 1), [
+        ('12:15', [('Soup', {'energy_kcal': 200, 'sodium_mg': 140})]),
+    ])
+    (logs / 'SCHEMA.md').write_text("# Schema\n", encoding='utf-8')
+    return logs
+
+
+class TestRecords:
+    """Test the per-day records."""
+
+    def test_totals_only_include_recorded_nutrients(self, logs_dir):
+        rollup = DailyRollup(logs_dir, use_cache=False)
+        assert rollup.days[0].totals == {'energy_kcal': 420, 'protein_g': 15.5}
+        assert rollup.days[1].totals == {'energy_kcal': 200, 'sodium_mg': 140}
+
+    def test_day_metadata(self, logs_dir):
+        day = DailyRollup(logs_dir).days[0]
+        assert (day.date, day.yaml_date, day.day_type) == (date(2025, 10, 31), date(2025, 10, 31), 'training')
+        assert (day.num_entries, day.num_items) == (2, 3)
+        assert day.first_meal == '2025-10-31T08:00:00+00:00'
+        assert day.last_meal == '2025-10-31T19:30:00+00:00'
+        assert day.meals[0] == ('2025-10-31T19:30:00+00:00', [('Pint of lager', 180)])
+
+    def test_between(self, logs_dir):
+        rollup = DailyRollup(logs_dir)
+        assert [day.date for day in rollup.between(date(2025, 11, 1))] == [date(2025, 11, 1)]
+        assert rollup.between(date(2026, 1, 1), date(2026, 1, 31)) == []
+
+
+class TestIncremental:
+    """Test that only changed log files are re-parsed."""
+
+    def test_unchanged_logs_are_reused(self, logs_dir):
+        assert len(DailyRollup(logs_dir).parsed) == 2
+        assert DailyRollup(logs_dir).parsed == []
+
+    def test_touched_log_is_not_reparsed(self, logs_dir):
+        DailyRollup(logs_dir)
+        bump_mtime(logs_dir / '2025-11' / '01.yaml')
+        assert DailyRollup(logs_dir).parsed == []
+
+    def test_changed_log_is_reparsed(self, logs_dir):
+        DailyRollup(logs_dir)
+        path = write_log(logs_dir, date(2025, 11, 1), [('12:15', [('Soup', {'energy_kcal': 250})])])
+        bump_mtime(path)
+
+        rollup = DailyRollup(logs_dir)
+        assert rollup.parsed == [path.resolve()]
+        assert rollup.days[1].totals == {'energy_kcal': 250}
+
+    def test_deleted_log_is_dropped(self, logs_dir):
+        DailyRollup(logs_dir)
+        (logs_dir / '2025-10' / '31.yaml').unlink()
+        assert [day.date for day in DailyRollup(logs_dir).days] == [date(2025, 11, 1)]
+
+
+class TestMalformedLogs:
+    """Test handling of unreadable log files."""
+
+    def test_invalid_yaml_is_reported(self, logs_dir):
+        bad = logs_dir / '2025-11' / '03.yaml'
+        bad.write_text("entries: [unclosed\n", encoding='utf-8')
+
+        rollup = DailyRollup(logs_dir)
+        assert [path.name for path, _ in rollup.errors] == ['03.yaml']
+        assert len(rollup) == 3
+
+    def test_log_deleted_after_discovery_is_reported(self, logs_dir, monkeypatch):
+        import daily_rollup
+        missing = logs_dir / '2025-11' / '03.yaml'
+        discover = daily_rollup.discover_log_files
+        monkeypatch.setattr(daily_rollup, 'discover_log_files',
+                            lambda root: discover(root) + [(date(2025, 11, 3), missing)])
+
+        rollup = DailyRollup(logs_dir)
+        [(path, error)] = rollup.errors
+        assert path == missing and error.startswith('Failed to parse')
+        monkeypatch.undo()
+        assert DailyRollup(logs_dir).errors == []
+
+
+@pytest.fixture
+def years_of_logs(tmp_path):
+    """Sparse logs across three calendar years, with zero-fiber days."""
+    logs = tmp_path / 'logs'
+    rng = random.Random(7)
+    day = date(2023, 12, 27)
+    while day <= date(2025, 2, 14):
+        if rng.random() < 0.3:
+            fiber = rng.choice([0, rng.uniform(5, 40)])
+            write_log(logs, day, [('09:00', [('Meal', {'energy_kcal': rng.uniform(1500, 3000),
+                                                      'fiber_total_g': fiber})])])
+        day += timedelta(days=1)
+    return logs
+
+
+def scan(rollup, start, end, nutrient):
+    values = [day.totals.get(nutrient, 0.0) for day in rollup.between(start, end) if not day.error]
+    return Aggregate.of(values), Aggregate.of([v for v in values if v > 0])
+
+
+def assert_close(actual, expected):
+    assert (actual.count, actual.min, actual.max) == (expected.count, expected.min, expected.max)
+    assert math.isclose(actual.total, expected.total, rel_tol=1e-12)
+    assert math.isclose(actual.stdev, expected.stdev, rel_tol=1e-9)
+
+
+class TestAggregates:
+    """Test the precomputed period partials."""
+
+    def test_cover_uses_whole_periods(self):
+        keys = list(cover(date(2023, 12, 30), date(2025, 2, 12)))
+        assert keys == [
+            ('D', date(2023, 12, 30)), ('D', date(2023, 12, 31)),
+            ('Y', 2024),
+            ('M', 2025, 1),
+            ('D', date(2025, 2, 1)), ('D', date(2025, 2, 2)),
+            ('W', 2025, 6),
+            ('D', date(2025, 2, 10)), ('D', date(2025, 2, 11)), ('D', date(2025, 2, 12)),
+        ]
+
+    @pytest.mark.parametrize('start, end', [
+        (date(2023, 12, 1), date(2025, 1, 31)),
+        (date(2024, 2, 7), date(2025, 1, 19)),
+        (date(2024, 5, 6), date(2024, 5, 12)),
+        (None, None),
+    ])
+    def test_range_matches_scan(self, years_of_logs, start, end):
+        rollup = DailyRollup(years_of_logs)
+        aggregates = rollup.aggregate(start, end)
+        for nutrient in ('energy_kcal', 'fiber_total_g'):
+            everyday, nonzero = scan(rollup, start, end, nutrient)
+            assert_close(aggregates[nutrient][0], everyday)
+            assert_close(aggregates[nutrient][1], nonzero)
+
+    def test_edited_day_updates_its_periods(self, years_of_logs):
+        DailyRollup(years_of_logs)
+        path = write_log(years_of_logs, date(2024, 6, 12), [('09:00', [('Feast', {'energy_kcal': 9000})])])
+        bump_mtime(path)
+
+        rollup = DailyRollup(years_of_logs)
+        assert rollup.parsed == [path.resolve()]
+        assert rollup.aggregate(date(2024, 1, 1), date(2024, 12, 31))['energy_kcal'][0].max == 9000
+        assert rollup.periods[('Y', 2024)] == DailyRollup(years_of_logs, use_cache=False).periods[('Y', 2024)]
+
+    def test_empty_range(self, years_of_logs):
+        aggregates = DailyRollup(years_of_logs).aggregate(date(2030, 1, 1), date(2030, 12, 31))
+        assert aggregates['energy_kcal'] == (Aggregate(), Aggregate())
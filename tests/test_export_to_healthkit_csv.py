@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scripts/export_to_healthkit_csv.py
+
+Tests cover:
+- Streamed CSVs match the in-memory per-day aggregation
+- Day totals are written sorted once the export finishes
+- Backdated entries are added to their day's total
+- A failed export leaves the previous files in place
+- Incremental exports only re-parse new or edited logs
+"""
+
+import csv
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from export_to_healthkit_csv import (
+    STATE_FILENAME,
+    StreamingExport,
+    create_per_day_totals,
+    export_log_files,
+    process_log_file,
+)
+from helpers import write_log
+
+
+def read_csv(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.fixture
+def log_files(tmp_path):
+    logs = tmp_path / 'logs'
+    return [
+        write_log(logs, date(2025, 11, 1), [('2025-11-01T08:00:00Z', [('Oats', {'energy_kcal': 300})])]),
+        # Snack after midnight lands on the next day's log
+        write_log(logs, date(2025, 11, 2), [('2025-11-01T23:30:00Z', [('Toast', {'energy_kcal': 120})]),
+                                            ('2025-11-02T12:00:00Z', [('Soup', {'energy_kcal': 250})])]),
+        write_log(logs, date(2025, 11, 4), [('2025-11-04T09:00:00Z', [('Eggs', {'energy_kcal': 180})])]),
+        write_log(logs, date(2025, 11, 5), [('2025-11-05T09:00:00Z', [('Eggs', {'energy_kcal': 180})])]),
+    ]
+
+
+def export(tmp_path, log_files):
+    per_item, per_day = tmp_path / 'items.csv', tmp_path / 'days.csv'
+    with StreamingExport(per_item, per_day) as stream:
+        for path in log_files:
+            stream.add_log(date(2025, 11, int(path.stem)), process_log_file(path))
+    return per_item, per_day
+
+
+class TestStreamingExport:
+    """Test the streaming CSV writer."""
+
+    def test_matches_in_memory_totals(self, tmp_path, log_files):
+        per_item, per_day = export(tmp_path, log_files)
+        items = [item for path in log_files for item in process_log_file(path)]
+        expected = create_per_day_totals(items)
+
+        assert [row['food name'] for row in read_csv(per_item)] == ['Oats', 'Toast', 'Soup', 'Eggs', 'Eggs']
+        days = read_csv(per_day)
+        assert [row['timestamp'] for row in days] == [total['timestamp'] for total in expected]
+        assert [float(row['energy consumed (kcal)']) for row in days] == [420, 250, 180, 180]
+
+    def test_day_totals_are_written_at_the_end(self, tmp_path, log_files):
+        with StreamingExport(tmp_path / 'items.csv', tmp_path / 'days.csv') as stream:
+            for path in log_files:
+                stream.add_log(date(2025, 11, int(path.stem)), process_log_file(path))
+            assert (stream.item_rows, stream.day_rows) == (5, 0)
+        assert stream.day_rows == 4
+
+    def test_backdated_entry_is_totalled(self, tmp_path):
+        logs = tmp_path / 'logs'
+        log_files = [
+            write_log(logs, date(2025, 10, day),
+                      [(f'2025-10-{day:02d}T12:00:00Z', [('Lunch', {'energy_kcal': 100})])])
+            for day in range(1, 5)
+        ]
+        log_files.append(write_log(logs, date(2025, 10, 5), [
+            ('2025-10-05T12:00:00Z', [('Lunch', {'energy_kcal': 100})]),
+            ('2025-10-01T20:00:00Z', [('late backfill', {'energy_kcal': 50})]),
+        ]))
+        per_item, per_day = tmp_path / 'items.csv', tmp_path / 'days.csv'
+        with StreamingExport(per_item, per_day) as stream:
+            for path in log_files:
+                stream.add_log(date(2025, 10, int(path.stem)), process_log_file(path))
+
+        days = read_csv(per_day)
+        assert [row['timestamp'] for row in days] == [f'2025-10-0{day}' for day in range(1, 6)]
+        assert [float(row['energy consumed (kcal)']) for row in days] == [150, 100, 100, 100, 100]
+        assert read_csv(per_item)[-1]['food name'] == 'late backfill'
+
+    def test_failed_export_keeps_previous_files(self, tmp_path, log_files):
+        per_item, per_day = export(tmp_path, log_files)
+        before = per_item.read_bytes(), per_day.read_bytes()
+
+        # A log added out of date order aborts the export
+        with pytest.raises(ValueError, match='added after'):
+            export(tmp_path, log_files + [log_files[0]])
+
+        assert (per_item.read_bytes(), per_day.read_bytes()) == before
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['days.csv', 'items.csv', 'logs']
+
+
+def csv_bytes(output_dir):
+    return [(output_dir / name).read_bytes() for name in ('per_item_nutrition.csv', 'per_day_nutrition.csv')]
+
+
+class TestIncrementalExport:
+    """Test re-exporting only the logs that changed."""
+
+    def test_unchanged_logs_write_nothing(self, tmp_path, log_files):
+        out = tmp_path / 'out'
+        out.mkdir()
+        export_log_files(log_files, out, incremental=True)
+        assert export_log_files(log_files, out, incremental=True) == (None, 0)
+
+    def test_edited_and_new_logs_match_full_export(self, tmp_path, log_files):
+        out, full = tmp_path / 'out', tmp_path / 'full'
+        out.mkdir()
+        full.mkdir()
+        export_log_files(log_files[:3], out, incremental=True)
+
+        # Edit a log that spills into the previous day, and append a new one
+        write_log(tmp_path / 'logs', date(2025, 11, 2), [('2025-11-01T23:45:00Z', [('Cake', {'energy_kcal': 410})])])
+        export, reprocessed = export_log_files(log_files, out, incremental=True)
+        assert reprocessed == 2
+        assert export.item_rows == 4
+
+        export_log_files(log_files, full)
+        assert csv_bytes(out) == csv_bytes(full)
+
+    def test_removed_log_is_dropped(self, tmp_path, log_files):
+        out, full = tmp_path / 'out', tmp_path / 'full'
+        out.mkdir()
+        full.mkdir()
+        export_log_files(log_files, out, incremental=True)
+
+        remaining = [log_files[0]] + log_files[2:]
+        assert export_log_files(remaining, out, incremental=True)[1] == 0
+        export_log_files(remaining, full)
+        assert csv_bytes(out) == csv_bytes(full)
+
+    def test_modified_csv_forces_full_export(self, tmp_path, log_files):
+        out = tmp_path / 'out'
+        out.mkdir()
+        export_log_files(log_files, out, incremental=True)
+        with open(out / 'per_item_nutrition.csv', 'a', encoding='utf-8') as f:
+            f.write('stray row\n')
+
+        assert export_log_files(log_files, out, incremental=True)[1] == len(log_files)
+        assert (out / STATE_FILENAME).exists()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scripts/food_bank_index.py
+
+Tests cover:
+- Dish markdown parsing
+- Id lookup and missing entries
+- Artifact reuse across runs
+- Incremental re-parse of changed files and eviction of deleted ones
+- Unreadable or vanished files reported as errors instead of raising
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from food_bank_index import (
+    FoodBankIndex,
+    default_cache_path,
+    parse_dish_file,
+    parse_dish_text,
+)
+from helpers import write_dish
+
+
+@pytest.fixture
+def bank(tmp_path):
+    root = tmp_path / 'food-data-bank'
+    write_dish(root, 'venues/cafe', 'Toast (Cafe)', 'toast_cafe_v1', per_portion={'energy_kcal': 100})
+    write_dish(root, 'generic/ingredients', 'Egg', 'egg_generic_v1', per_portion={'energy_kcal': 100})
+    (root / 'README.md').write_text("# Food bank\n", encoding='utf-8')
+    return root
+
+
+class TestParsing:
+    """Test parse_dish_text function."""
+
+    def test_header_and_yaml(self):
+        name, data, error = parse_dish_text("## Egg\n\n```yaml\nid: egg_v1\n```\n")
+        assert name == 'Egg'
+        assert data == {'id': 'egg_v1'}
+        assert error is None
+
+    def test_missing_yaml_block(self):
+        name, data, error = parse_dish_text("## Egg\n\nno block here\n")
+        assert name == 'Egg'
+        assert data is None
+        assert error == 'No YAML block found'
+
+    def test_invalid_yaml(self):
+        _, data, error = parse_dish_text("## Egg\n\n```yaml\nid: [unclosed\n```\n")
+        assert data is None
+        assert error.startswith('YAML parse error')
+
+
+class TestLookup:
+    """Test id lookup on a compiled index."""
+
+    def test_get_and_contains(self, bank):
+        index = FoodBankIndex(bank)
+        assert len(index) == 2
+        assert 'egg_generic_v1' in index
+        assert index.get('toast_cafe_v1')['per_portion']['energy_kcal'] == 100
+        assert index.path_for('egg_generic_v1').name == 'egg_generic_v1.md'
+
+    def test_skip_files_are_ignored(self, bank):
+        index = FoodBankIndex(bank)
+        assert all(record.path.name != 'README.md' for record in index.records)
+
+    def test_missing_entry_raises_key_error(self, bank):
+        index = FoodBankIndex(bank)
+        with pytest.raises(KeyError, match='not found'):
+            index.get('missing_v1')
+
+
+class TestArtifact:
+    """Test artifact reuse and invalidation."""
+
+    def test_artifact_written_next_to_bank(self, bank):
+        FoodBankIndex(bank)
+        assert default_cache_path(bank) == bank.parent / '.cache' / 'food-data-bank.pickle'
+        assert default_cache_path(bank).exists()
+
+    def test_second_run_reuses_artifact(self, bank):
+        assert FoodBankIndex(bank).from_cache is False
+        index = FoodBankIndex(bank)
+        assert index.from_cache is True
+        assert index.get('egg_generic_v1')['id'] == 'egg_generic_v1'
+
+    def test_modified_file_invalidates(self, bank):
+        FoodBankIndex(bank)
+        egg = write_dish(bank, 'generic/ingredients', 'Egg', 'egg_generic_v1', per_portion={'energy_kcal': 155})
+        stat = egg.stat()
+        os.utime(egg, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        index = FoodBankIndex(bank)
+        assert index.from_cache is False
+        assert index.get('egg_generic_v1')['per_portion']['energy_kcal'] == 155
+        assert index.changes.modified == [egg]
+        assert index.changes.added == []
+
+    def test_added_file_invalidates(self, bank):
+        FoodBankIndex(bank)
+        rice = write_dish(bank, 'generic/ingredients', 'Rice', 'rice_generic_v1')
+
+        index = FoodBankIndex(bank)
+        assert index.from_cache is False
+        assert 'rice_generic_v1' in index
+        assert index.changes.added == [rice]
+
+    def test_deleted_file_is_evicted(self, bank):
+        FoodBankIndex(bank)
+        toast = bank / 'venues' / 'cafe' / 'toast_cafe_v1.md'
+        toast.unlink()
+
+        index = FoodBankIndex(bank)
+        assert index.changes.removed == [toast]
+        assert 'toast_cafe_v1' not in index
+        assert FoodBankIndex(bank).from_cache is True
+
+    def test_touched_file_with_same_content_is_not_reparsed(self, bank, monkeypatch):
+        FoodBankIndex(bank)
+        egg = bank / 'generic' / 'ingredients' / 'egg_generic_v1.md'
+        stat = egg.stat()
+        os.utime(egg, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        import food_bank_index
+        monkeypatch.setattr(food_bank_index, 'parse_dish_text', lambda text: pytest.fail('re-parsed'))
+        index = FoodBankIndex(bank)
+        assert index.from_cache is True
+        assert not index.changes
+
+    def test_no_cache_skips_artifact(self, bank):
+        index = FoodBankIndex(bank, use_cache=False)
+        assert len(index) == 2
+        assert not default_cache_path(bank).exists()
+
+
+class TestUnreadableFiles:
+    """Test files that cannot be read."""
+
+    @pytest.fixture
+    def unreadable(self, monkeypatch):
+        read_bytes = Path.read_bytes
+
+        def fake_read_bytes(path):
+            if path.name == 'egg_generic_v1.md':
+                raise PermissionError(13, 'Permission denied', str(path))
+            return read_bytes(path)
+
+        monkeypatch.setattr(Path, 'read_bytes', fake_read_bytes)
+
+    def test_unreadable_file_is_an_error_record(self, bank, unreadable):
+        index = FoodBankIndex(bank)
+        assert 'toast_cafe_v1' in index
+        assert 'egg_generic_v1' not in index
+        [record] = [record for record in index.records if record.error]
+        assert record.path.name == 'egg_generic_v1.md'
+        assert 'Permission denied' in record.error
+
+    def test_unreadable_file_is_retried(self, bank, unreadable, monkeypatch):
+        FoodBankIndex(bank)
+        monkeypatch.undo()
+        index = FoodBankIndex(bank)
+        assert 'egg_generic_v1' in index
+        assert not any(record.error for record in index.records)
+
+    def test_file_deleted_after_discovery(self, bank, monkeypatch):
+        import food_bank_index
+        missing = bank / 'generic' / 'ingredients' / 'gone.md'
+        discover = food_bank_index.discover_dish_files
+        monkeypatch.setattr(food_bank_index, 'discover_dish_files', lambda root: discover(root) + [missing])
+
+        index = FoodBankIndex(bank)
+        assert len(index) == 2
+        assert index.records[-1].error.startswith('Read error')
+        assert parse_dish_file(missing).error.startswith('Read error')
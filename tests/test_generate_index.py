@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scripts/generate_index.py
+
+Tests cover:
+- Splitting a generated index into category sections
+- Incremental updates that rewrite only changed categories
+- Fallback to a full rebuild when no index exists
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+import generate_index
+from generate_index import (
+    changed_categories_for,
+    generate_index_file,
+    parse_dish_file,
+    split_index_sections,
+    update_index_file,
+)
+from helpers import write_dish
+
+
+@pytest.fixture(autouse=True)
+def no_git(monkeypatch):
+    # Keep the header deterministic and independent of the surrounding repo
+    monkeypatch.setattr(generate_index, 'get_git_metadata', lambda: None)
+
+
+def make_dish(root, category_path, name, dish_id):
+    return parse_dish_file(write_dish(root / 'food-data-bank', category_path, name, dish_id, category='main'))
+
+
+@pytest.fixture
+def dishes(tmp_path):
+    return [
+        make_dish(tmp_path, 'venues/cafe', 'Toast', 'toast_cafe_v1'),
+        make_dish(tmp_path, 'venues/deli', 'Bagel', 'bagel_deli_v1'),
+        make_dish(tmp_path, 'generic/ingredients', 'Egg', 'egg_generic_v1'),
+    ]
+
+
+def body(path):
+    """Index content without the timestamped front matter."""
+    return path.read_text(encoding='utf-8').split('\n---\n', 1)[1]
+
+
+class TestSplitSections:
+    """Test split_index_sections function."""
+
+    def test_sections_by_category(self, tmp_path, dishes):
+        output = tmp_path / 'index.md'
+        generate_index_file(dishes, output)
+
+        sections = split_index_sections(output.read_text(encoding='utf-8'))
+        assert list(sections) == ['venues/cafe', 'venues/deli', 'generic/ingredients']
+        assert sections['venues/cafe'].startswith('## Cafe\n')
+        assert '{#toast_cafe_v1}' in sections['venues/cafe']
+
+    def test_foreign_file_is_rejected(self):
+        assert split_index_sections("# Something else\n") is None
+
+
+class TestIncrementalUpdate:
+    """Test update_index_file against a full rebuild."""
+
+    def test_matches_full_rebuild(self, tmp_path, dishes):
+        output = tmp_path / 'index.md'
+        generate_index_file(dishes, output)
+
+        dishes[0]['name'] = 'Sourdough Toast'
+        dishes.append(make_dish(tmp_path, 'packaged/brand', 'Bar', 'bar_brand_v1'))
+        update_index_file(dishes, output, {'venues/cafe', 'packaged/brand'})
+        incremental = body(output)
+
+        generate_index_file(dishes, output)
+        assert incremental == body(output)
+
+    def test_unchanged_categories_are_copied(self, tmp_path, dishes):
+        output = tmp_path / 'index.md'
+        generate_index_file(dishes, output)
+
+        # Not flagged as changed, so the stale section is kept verbatim
+        dishes[1]['name'] = 'Renamed Bagel'
+        update_index_file(dishes, output, {'venues/cafe'})
+        assert '[Bagel]' in body(output)
+        assert 'Renamed Bagel' not in body(output)
+
+    def test_removed_category_is_dropped(self, tmp_path, dishes):
+        output = tmp_path / 'index.md'
+        generate_index_file(dishes, output)
+
+        update_index_file(dishes[1:], output, {'venues/cafe'})
+        assert 'venues/cafe' not in split_index_sections(output.read_text(encoding='utf-8'))
+
+    def test_missing_index_falls_back_to_full_rebuild(self, tmp_path, dishes):
+        output = tmp_path / 'index.md'
+        update_index_file(dishes, output, set())
+        assert set(split_index_sections(output.read_text(encoding='utf-8'))) == {
+            'venues/cafe', 'venues/deli', 'generic/ingredients'
+        }
+
+
+class TestChangedCategories:
+    """Test changed_categories_for function."""
+
+    def test_maps_paths_to_categories(self):
+        paths = [
+            'data/food-data-bank/venues/cafe/toast_cafe_v1.md',
+            Path('/abs/food-data-bank/generic/ingredients/egg.md'),
+            'too-shallow.md',
+        ]
+        assert changed_categories_for(paths) == {'venues/cafe', 'generic/ingredients'}
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scripts/log_store.py
+
+Tests cover:
+- One row per logged item
+- Incremental re-parse of changed log files
+- Handling of malformed logs
+- Reverse index from food_bank_id to log occurrences
+"""
+
+import os
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from helpers import write_log
+from log_store import LogStore, log_date_for
+
+
+@pytest.fixture
+def logs_dir(tmp_path):
+    logs = tmp_path / 'logs'
+    write_log(logs, date(2025, 10, 31), [('08:00', [
+        ('Eggs', {'energy_kcal': 150, 'protein_g': 12.5}, 'eggs_v1'),
+        ('Toast', {'energy_kcal': 90, 'protein_g': 3}),
+    ])], day_type='training')
+    write_log(logs, date(2025, 11, 1), [('08:00', [
+        ('Eggs', {'energy_kcal': 150, 'protein_g': 12.5, 'sodium_mg': 140}, 'eggs_v1'),
+    ])])
+    write_log(logs, date(2025, 11, 2), [('08:00', [
+        ('Soup', {'energy_kcal': 200}, 'soup_v1'),
+    ])])
+    (logs / 'SCHEMA.md').write_text("# Schema\n", encoding='utf-8')
+    return logs
+
+
+class TestLayout:
+    """Test the materialized rows."""
+
+    def test_one_row_per_item(self, logs_dir):
+        store = LogStore(logs_dir)
+        assert len(store) == 4
+        assert store.names == ['Eggs', 'Toast', 'Eggs', 'Soup']
+        assert store.food_bank_ids == ['eggs_v1', None, 'eggs_v1', 'soup_v1']
+        assert [segment.date for segment in store.segments][0] == date(2025, 10, 31)
+
+    def test_log_date_from_path(self):
+        assert log_date_for(Path('data/logs/2025-11/03.yaml')) == date(2025, 11, 3)
+        assert log_date_for(Path('data/logs/SCHEMA.yaml')) is None
+
+
+class TestIncremental:
+    """Test that only changed log files are re-parsed."""
+
+    def test_unchanged_logs_are_reused(self, logs_dir):
+        assert len(LogStore(logs_dir).parsed) == 3
+        assert LogStore(logs_dir).parsed == []
+
+    def test_changed_log_is_reparsed(self, logs_dir):
+        LogStore(logs_dir)
+        path = write_log(logs_dir, date(2025, 11, 2), [('08:00', [('Soup', {'energy_kcal': 250}, 'soup_v1')])])
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        store = LogStore(logs_dir)
+        assert store.parsed == [path.resolve()]
+        assert store.names[-1] == 'Soup'
+
+    def test_deleted_log_is_dropped(self, logs_dir):
+        LogStore(logs_dir)
+        (logs_dir / '2025-10' / '31.yaml').unlink()
+        assert LogStore(logs_dir).names == ['Eggs', 'Soup']
+
+
+class TestMalformedLogs:
+    """Test handling of unreadable log files."""
+
+    def test_invalid_yaml_is_reported(self, logs_dir):
+        bad = logs_dir / '2025-11' / '03.yaml'
+        bad.write_text("entries: [unclosed\n", encoding='utf-8')
+
+        store = LogStore(logs_dir)
+        assert [path.name for path, _ in store.errors] == ['03.yaml']
+        assert len(store) == 4
+
+    def test_log_deleted_after_discovery_is_reported(self, logs_dir, monkeypatch):
+        import log_store
+        missing = logs_dir / '2025-11' / '03.yaml'
+        discover = log_store.discover_log_files
+        monkeypatch.setattr(log_store, 'discover_log_files',
+                            lambda root: discover(root) + [(date(2025, 11, 3), missing)])
+
+        store = LogStore(logs_dir)
+        [(path, error)] = store.errors
+        assert path == missing and error.startswith('Failed to parse')
+        assert len(store) == 4
+
+
+class TestReverseIndex:
+    """Test food_bank_id -> log occurrence lookups."""
+
+    def test_occurrences(self, logs_dir):
+        store = LogStore(logs_dir)
+        occurrences = store.occurrences('eggs_v1')
+        assert [(path.name, entry, item) for path, entry, item in occurrences] == [
+            ('31.yaml', 0, 0),
+            ('01.yaml', 0, 0),
+        ]
+        assert store.occurrences('missing_v1') == []
+
+    def test_files_referencing(self, logs_dir):
+        store = LogStore(logs_dir)
+        files = store.files_referencing(['soup_v1', 'eggs_v1'])
+        assert [f"{path.parent.name}/{path.name}" for path in files] == [
+            '2025-10/31.yaml', '2025-11/01.yaml', '2025-11/02.yaml'
+        ]
+
+    def test_follows_rewritten_logs(self, logs_dir):
+        LogStore(logs_dir)
+        path = write_log(logs_dir, date(2025, 11, 2), [('08:00', [('Eggs', {'energy_kcal': 150}, 'eggs_v1')])])
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        store = LogStore(logs_dir)
+        assert store.files_referencing(['soup_v1']) == []
+        assert len(store.occurrences('eggs_v1')) == 3
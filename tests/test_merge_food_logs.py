@@ -10,9 +10,14 @@ Tests cover:
 - Conflicting metadata (date, day_type)
 - Invalid YAML handling
 - State tracking
+- Batched git object reads
+- Skipping blobs merged on a previous run
+- k-way timestamp merge and duplicate-entry detection
+- Concurrent branch reads and parsing merge in branch order
 """
 
 import pytest
+import subprocess
 import sys
 from pathlib import Path
 from datetime import datetime, timezone
@@ -31,6 +36,9 @@ from merge_food_logs import (
     load_processed_state,
     save_processed_state,
     load_existing_log,
+    GitObjectReader,
+    get_log_files_from_branch,
+    extract_file_content,
 )
 
 
@@ -483,6 +491,56 @@ class TestMergeLogFiles:
         # Should have only one instance of the note
         assert result['entries'][0]['notes'] == 'Same note'
 
+    def test_merge_unsorted_branches(self):
+        """Test that entries come out in timestamp order with ties in branch order."""
+        def log(*hours_and_names):
+            return {'date': '2024-01-15', 'day_type': 'rest', 'entries': [
+                {'timestamp': f'2024-01-15T{hour:02d}:00:00Z',
+                 'items': [{'name': name, 'quantity': 1, 'unit': 'g', 'nutrition': {}}]}
+                for hour, name in hours_and_names
+            ]}
+        files_by_branch = {
+            'claude/branch1': log((12, 'Lunch'), (8, 'Eggs')),
+            'claude/branch2': log((8, 'Toast'), (19, 'Dinner')),
+            'claude/branch3': log((10, 'Snack')),
+        }
+        result = merge_log_files(files_by_branch, 'test.yaml')
+        assert [[item['name'] for item in e['items']] for e in result['entries']] == [
+            ['Eggs', 'Toast'], ['Snack'], ['Lunch'], ['Dinner']
+        ]
+
+    def test_identical_entries_collapse_without_review(self, capsys):
+        """Test that copies of one entry (same items digest) are not flagged."""
+        entry = {'timestamp': '2024-01-15T08:00:00Z',
+                 'items': [{'name': 'Eggs', 'quantity': 2, 'unit': 'whole', 'nutrition': {'protein': 12}}]}
+        # Same items with keys in another order
+        copy = {'items': [{'nutrition': {'protein': 12}, 'unit': 'whole', 'quantity': 2, 'name': 'Eggs'}],
+                'timestamp': '2024-01-15T08:00:00Z', 'notes': 'Breakfast'}
+        files_by_branch = {
+            'claude/branch1': {'date': '2024-01-15', 'day_type': 'rest', 'entries': [entry]},
+            'working-tree': {'date': '2024-01-15', 'day_type': 'rest', 'entries': [copy]},
+        }
+        result = merge_log_files(files_by_branch, 'test.yaml')
+        assert result['entries'] == [dict(entry, notes='Breakfast')]
+        assert 'REVIEW NEEDED' not in capsys.readouterr().out
+
+    def test_nutrition_conflicts_are_reported(self):
+        """Test that differing nutrition for the same item lands in warnings."""
+        def log(protein, extra):
+            return {'date': '2024-01-15', 'day_type': 'rest', 'entries': [
+                {'timestamp': '2024-01-15T08:00:00Z', 'items': [
+                    {'name': 'Eggs', 'quantity': 2, 'unit': 'whole', 'nutrition': {'protein': protein}},
+                    {'name': extra, 'quantity': 1, 'unit': 'slice', 'nutrition': {}},
+                ]}
+            ]}
+        warnings = []
+        result = merge_log_files(
+            {'claude/branch1': log(12, 'Toast'), 'claude/branch2': log(13, 'Bacon')}, 'test.yaml', warnings
+        )
+        assert [item['name'] for item in result['entries'][0]['items']] == ['Eggs', 'Toast', 'Bacon']
+        assert result['entries'][0]['items'][0]['nutrition'] == {'protein': 12}
+        assert warnings == ["Same item 'Eggs' has different nutrition values"]
+
 
 class TestStateManagement:
     """Test state loading and saving."""
@@ -631,5 +689,152 @@ class TestWorkingTreeIntegration:
                 merge_food_logs.Path.cwd = original_cwd
 
 
+def git(repo, *args):
+    return subprocess.run(['git', *args], cwd=repo, check=True, capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def branch_repo(tmp_path, monkeypatch):
+    """A repo whose origin has one claude/* branch with two logs."""
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    git(repo, 'init', '-q', '-b', 'main')
+    git(repo, 'config', 'user.email', 'test@example.com')
+    git(repo, 'config', 'user.name', 'Test')
+    (repo / 'README.md').write_text('x\n')
+    git(repo, 'add', '.')
+    git(repo, 'commit', '-q', '-m', 'init')
+
+    git(repo, 'checkout', '-q', '-b', 'claude/log-day')
+    logs = repo / 'data' / 'logs'
+    (logs / '2024-01').mkdir(parents=True)
+    (logs / '2024-01' / '15.yaml').write_text("date: '2024-01-15'\nday_type: rest\nentries: []\n")
+    (logs / '2024-01' / 'my day.yaml').write_text("date: '2024-01-16'\n")
+    (logs / 'SCHEMA.md').write_text('# Schema\n')
+    git(repo, 'add', '.')
+    git(repo, 'commit', '-q', '-m', 'log')
+    git(repo, 'checkout', '-q', 'main')
+
+    git(repo, 'remote', 'add', 'origin', str(repo))
+    git(repo, 'fetch', '-q', 'origin')
+    monkeypatch.chdir(repo)
+    return repo
+
+
+class TestGitObjectReader:
+    """Test the `git cat-file --batch` reader against the per-call git commands."""
+
+    def test_tree_walk_matches_ls_tree(self, branch_repo):
+        with GitObjectReader() as reader:
+            batched = get_log_files_from_branch('claude/log-day', 'origin', reader)
+        assert batched == get_log_files_from_branch('claude/log-day', 'origin')
+        assert sorted(batched) == ['data/logs/2024-01/15.yaml', 'data/logs/2024-01/my day.yaml']
+
+    def test_blob_content_matches_git_show(self, branch_repo):
+        with GitObjectReader() as reader:
+            for path, sha in reader.log_files('origin/claude/log-day').items():
+                assert extract_file_content('claude/log-day', path, 'origin', reader, sha) == \
+                    extract_file_content('claude/log-day', path, 'origin')
+
+    def test_missing_objects(self, branch_repo):
+        with GitObjectReader() as reader:
+            assert reader.read('origin/claude/log-day:nope.yaml') is None
+            assert get_log_files_from_branch('main', 'origin', reader) == {}
+            with pytest.raises(KeyError):
+                extract_file_content('main', 'data/logs/x.yaml', 'origin', reader)
+
+
+class TestIncrementalMerge:
+    """Test that blobs merged on an earlier run are not extracted again."""
+
+    def run_main(self, monkeypatch):
+        import merge_food_logs
+        extracted = []
+        original = merge_food_logs.extract_file_content
+
+        def spy(branch, file_path, *args, **kwargs):
+            extracted.append(file_path)
+            return original(branch, file_path, *args, **kwargs)
+
+        monkeypatch.setattr(merge_food_logs, 'extract_file_content', spy)
+        monkeypatch.setattr(sys, 'argv', ['merge_food_logs.py'])
+        return merge_food_logs.main(), extracted
+
+    def test_only_new_blobs_are_extracted(self, branch_repo, monkeypatch):
+        exit_code, extracted = self.run_main(monkeypatch)
+        assert exit_code == 2  # 'my day.yaml' fails validation
+        assert sorted(extracted) == ['data/logs/2024-01/15.yaml', 'data/logs/2024-01/my day.yaml']
+
+        state = json.loads((branch_repo / '.github/workflows/processed-branches.json').read_text())
+        blobs = state['processed']['claude/log-day']['blobs']
+        assert list(blobs) == ['data/logs/2024-01/15.yaml']  # failed files are retried
+
+        # Fix the invalid log on the branch; 15.yaml keeps its blob
+        worktree = branch_repo.parent / 'worktree'
+        git(branch_repo, 'worktree', 'add', '-q', str(worktree), 'claude/log-day')
+        (worktree / 'data/logs/2024-01/my day.yaml').write_text(
+            "date: '2024-01-16'\nday_type: rest\nentries: []\n"
+        )
+        git(worktree, 'commit', '-q', '-am', 'fix')
+        git(branch_repo, 'fetch', '-q', 'origin')
+
+        exit_code, extracted = self.run_main(monkeypatch)
+        assert exit_code == 0
+        assert extracted == ['data/logs/2024-01/my day.yaml']
+
+
+class TestConcurrentMerge:
+    """Test that --jobs does not change what gets merged."""
+
+    def add_branch(self, repo, name, entries):
+        worktree = repo.parent / name.replace('/', '-')
+        git(repo, 'worktree', 'add', '-q', '-b', name, str(worktree), 'main')
+        log = worktree / 'data/logs/2024-01/15.yaml'
+        log.parent.mkdir(parents=True)
+        log.write_text(yaml.safe_dump(
+            {'date': '2024-01-15', 'day_type': 'rest', 'entries': entries}, sort_keys=False
+        ))
+        git(worktree, 'add', '.')
+        git(worktree, 'commit', '-q', '-m', name)
+
+    def run_main(self, repo, monkeypatch, capsys, jobs):
+        import merge_food_logs
+        monkeypatch.setattr(sys, 'argv', ['merge_food_logs.py', '--jobs', str(jobs)])
+        exit_code = merge_food_logs.main()
+        output = capsys.readouterr().out
+        merged = (repo / 'data/logs/2024-01/15.yaml').read_text()
+        # Reset for the next run
+        (repo / '.github/workflows/processed-branches.json').unlink()
+        (repo / 'data/logs/2024-01/15.yaml').unlink()
+        return exit_code, output, merged
+
+    def test_jobs_do_not_change_the_result(self, branch_repo, monkeypatch, capsys):
+        item = {'name': 'Oats', 'quantity': 40, 'unit': 'g', 'nutrition': {'energy_kcal': 150}}
+        for n, hour in enumerate([9, 7, 12]):
+            self.add_branch(branch_repo, f'claude/meal-{n}', [
+                {'timestamp': f'2024-01-15T{hour:02d}:00:00+00:00', 'items': [dict(item, name=f'Meal {n}')]},
+            ])
+        git(branch_repo, 'fetch', '-q', 'origin')
+
+        serial = self.run_main(branch_repo, monkeypatch, capsys, jobs=1)
+        concurrent = self.run_main(branch_repo, monkeypatch, capsys, jobs=3)
+        assert concurrent == serial
+        assert serial[0] == 2  # 'my day.yaml' is still invalid
+        merged = yaml.safe_load(serial[2])
+        assert [e['items'][0]['name'] for e in merged['entries']] == ['Meal 1', 'Meal 0', 'Meal 2']
+        assert serial[1].index('claude/log-day') < serial[1].index('claude/meal-0') < serial[1].index('claude/meal-2')
+
+    def test_parse_failures_come_back_from_workers(self):
+        from merge_food_logs import ProcessPoolExecutor, _parse_log_item, map_ordered
+        results = map_ordered(ProcessPoolExecutor, _parse_log_item, [
+            ('a.yaml', "date: '2024-01-15'\nday_type: rest\nentries: []\n"),
+            ('b.yaml', 'entries: [unclosed'),
+            ('c.yaml', "date: '2024-01-16'\n"),
+        ], jobs=2)
+        assert results[0] == ({'date': '2024-01-15', 'day_type': 'rest', 'entries': []}, [], None)
+        assert results[1][2][0] == 'YAML error'
+        assert results[2][1] == ['Missing required field: day_type', 'Missing required field: entries']
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -5,7 +5,7 @@ Tests core functions like meal classification, alcohol detection, statistics, an
 """
 import sys
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime
 
 # Add scripts directory to path
 scripts_dir = Path(__file__).parent.parent / "scripts"
@@ -18,7 +18,18 @@ from monthly_analysis import (
     generate_bar_chart,
     calculate_statistics,
     generate_compliance_indicator,
+    analyze_month,
+    analyze_range,
+    generate_markdown_report,
+    load_health_profile,
+    parse_period,
+    parse_sections,
+    REPORT_SECTIONS,
+    range_period,
+    rolling_period,
 )
+from daily_rollup import Aggregate, DailyRollup
+from helpers import write_log
 
 
 class TestClassifyMealTime:
@@ -258,6 +269,21 @@ class TestCalculateStatistics:
         assert stats['max'] == 20.0
         assert stats['stdev'] > 0
 
+    def test_precomputed_aggregate(self):
+        """Test that rollup partials give the same statistics as the values."""
+        values = [1850.0, 2210.5, 1975.25, 2630.0, 2101.0]
+        stats = calculate_statistics(values, Aggregate.of(values))
+        expected = calculate_statistics(values)
+        assert stats.keys() == expected.keys()
+        for key in expected:
+            assert stats[key] == pytest.approx(expected[key], rel=1e-12)
+
+    def test_aggregate_over_other_days_is_ignored(self):
+        """Test that a partial covering different days falls back to the values."""
+        stats = calculate_statistics([1.0, 2.0, 3.0], Aggregate.of([100.0, 200.0]))
+        assert stats['mean'] == 2.0
+        assert stats['max'] == 3.0
+
 
 class TestGenerateComplianceIndicator:
     """Tests for generate_compliance_indicator function."""
@@ -385,5 +411,122 @@ class TestIntegration:
         assert "IPA Beer" in alcoholic_items
 
 
+class TestPeriods:
+    """Tests for period parsing."""
+
+    def test_month(self):
+        period = parse_period("2025-02")
+        assert (period.start, period.end, period.label, period.slug) == (
+            date(2025, 2, 1), date(2025, 2, 28), "February 2025", "2025-02")
+
+    def test_quarter(self):
+        period = parse_period("2024-q1")
+        assert (period.start, period.end, period.kind, period.slug) == (
+            date(2024, 1, 1), date(2024, 3, 31), "quarter", "2024-Q1")
+
+    def test_year(self):
+        period = parse_period("2025")
+        assert (period.start, period.end, period.kind) == (date(2025, 1, 1), date(2025, 12, 31), "year")
+
+    def test_rolling_window_includes_end(self):
+        period = rolling_period(7, date(2025, 11, 3))
+        assert (period.start, period.end, period.slug) == (
+            date(2025, 10, 28), date(2025, 11, 3), "2025-10-28_2025-11-03")
+
+    @pytest.mark.parametrize("text", ["2025-13", "2025-Q5", "1800", "../2025-10", "2025-10-01"])
+    def test_invalid_periods_rejected(self, text):
+        with pytest.raises(ValueError):
+            parse_period(text)
+
+    def test_backwards_range_rejected(self):
+        with pytest.raises(ValueError):
+            range_period(date(2025, 11, 2), date(2025, 11, 1))
+
+
+def meal(kcal, *names):
+    """One noon entry with a fixed energy and sugar per item."""
+    return [("12:00", [(name, {"energy_kcal": kcal, "sugar_g": 10}) for name in names])]
+
+
+@pytest.fixture
+def rollup(tmp_path, monkeypatch):
+    logs = tmp_path / "logs"
+    write_log(logs, date(2025, 9, 30), meal(2100, "Oats"))
+    write_log(logs, date(2025, 10, 1), meal(2400, "Oats", "Pint of lager"), day_type="training")
+    write_log(logs, date(2025, 10, 15), meal(1900, "Soup"))
+    write_log(logs, date(2025, 11, 2), meal(2200, "Oats"))
+    monkeypatch.setattr("monthly_analysis.LOGS_DIR", logs)
+    return DailyRollup(logs, use_cache=False)
+
+
+class TestAnalyzeRange:
+    """Tests for analyzing arbitrary periods."""
+
+    def test_range_covers_only_its_days(self, rollup):
+        analysis = analyze_range(range_period(date(2025, 10, 1), date(2025, 11, 2)), rollup, load_health_profile())
+        assert [d['date'] for d in analysis['daily_data']] == [
+            date(2025, 10, 1), date(2025, 10, 15), date(2025, 11, 2)]
+        assert analysis['summary']['energy_kcal']['max'] == 4800
+        assert (analysis['rest_days'], analysis['training_days']) == (2, 1)
+        assert analysis['top_foods'][0] == ('Oats', 2)
+        assert analysis['alcohol']['days_with_alcohol'] == 1
+
+    def test_month_matches_equivalent_range(self, rollup):
+        profile = load_health_profile()
+        month = analyze_month(2025, 10, rollup, profile)
+        period = analyze_range(parse_period("2025-10"), rollup, profile)
+        assert (month['year'], month['month'], month['month_name']) == (2025, 10, 'October')
+        assert {k: v for k, v in month.items() if k not in ('year', 'month', 'month_name')} == period
+
+    def test_empty_period(self, rollup):
+        assert analyze_range(parse_period("2026-Q1"), rollup, load_health_profile()) is None
+
+    def test_report_header_names_the_period(self, rollup):
+        profile = load_health_profile()
+        quarter = generate_markdown_report(analyze_range(parse_period("2025-Q4"), rollup, profile))
+        assert quarter.startswith("# 📊 QUARTERLY NUTRITION ANALYSIS\n## Q4 2025\n")
+        month = generate_markdown_report(analyze_month(2025, 11, rollup, profile))
+        assert month.startswith("# 📊 MONTHLY NUTRITION ANALYSIS\n## November 2025\n")
+        assert "this month" not in quarter
+
+
+class TestReportSections:
+    """Tests for building only the requested report sections."""
+
+    def test_sections_in_report_order(self):
+        assert parse_sections("targets, executive") == ["executive", "targets"]
+
+    @pytest.mark.parametrize("text", ["", "executive,nope"])
+    def test_unknown_sections_rejected(self, text):
+        with pytest.raises(ValueError):
+            parse_sections(text)
+
+    def test_only_needed_parts_computed(self, rollup):
+        analysis = analyze_range(parse_period("2025-Q4"), rollup, load_health_profile(), ["sugar"])
+        assert 'sugar_analysis' in analysis
+        assert not {'summary', 'compliance', 'top_foods', 'timing', 'alcohol'} & analysis.keys()
+
+    def test_day_details_skipped_when_not_needed(self, rollup, monkeypatch):
+        import monthly_analysis
+        for name in ('is_alcoholic', 'classify_meal_time'):
+            monkeypatch.setattr(monthly_analysis, name, lambda *args, name=name: pytest.fail(f"{name} called"))
+        analysis = analyze_range(parse_period("2025-Q4"), rollup, load_health_profile(), ["executive", "targets"])
+        assert analysis['days_logged'] == 3
+        assert 'daily_data' not in analysis
+
+    @pytest.mark.parametrize("name", list(REPORT_SECTIONS))
+    def test_each_section_renders_from_its_parts(self, rollup, name):
+        analysis = analyze_range(parse_period("2025-Q4"), rollup, load_health_profile(), [name])
+        report = generate_markdown_report(analysis, [name])
+        assert report.count("\n## ") == 2  # period subheading and the section
+
+    def test_all_sections_match_full_report(self, rollup):
+        profile = load_health_profile()
+        full = analyze_range(parse_period("2025-Q4"), rollup, profile)
+        selected = analyze_range(parse_period("2025-Q4"), rollup, profile, list(REPORT_SECTIONS))
+        assert generate_markdown_report(full).split("*Report generated")[0] == \
+            generate_markdown_report(selected, list(REPORT_SECTIONS)).split("*Report generated")[0]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scripts/profiling.py
+
+Tests cover:
+- Hooks are no-ops until profiling is enabled
+- Exclusive per-phase timing for nested phases
+- File and byte counters
+- JSON report written to NUTRITION_PROFILE_OUTPUT
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+import profiling
+from profiling import PHASES, Profile
+
+
+@pytest.fixture
+def profile(monkeypatch):
+    fresh = Profile()
+    fresh.enabled = True
+    fresh.script = 'test'
+    monkeypatch.setattr(profiling, 'PROFILE', fresh)
+    return fresh
+
+
+class TestDisabled:
+    """Test that an inactive profile records nothing."""
+
+    def test_hooks_are_no_ops(self, monkeypatch):
+        fresh = Profile()
+        monkeypatch.setattr(profiling, 'PROFILE', fresh)
+        with profiling.phase('compute'):
+            pass
+        profiling.record_read('x.yaml', 10)
+        assert fresh.phases['compute'] == 0
+        assert fresh.bytes_read == 0
+
+    def test_env_flag_enables(self, monkeypatch):
+        monkeypatch.setattr(profiling, 'PROFILE', Profile())
+        monkeypatch.setattr(profiling.PROFILE, 'enable', lambda script: setattr(profiling.PROFILE, 'enabled', True))
+        monkeypatch.setenv('NUTRITION_PROFILE', '1')
+        assert profiling.setup('test') is True
+
+
+class TestPhases:
+    """Test phase timing."""
+
+    def test_nested_phases_are_exclusive(self, profile):
+        with profiling.phase('discovery'):
+            time.sleep(0.02)
+            with profiling.phase('yaml_parse'):
+                time.sleep(0.05)
+            time.sleep(0.02)
+        assert 0.035 <= profile.phases['discovery'] < 0.05
+        assert profile.phases['yaml_parse'] >= 0.05
+
+    def test_unknown_phase_is_rejected(self, profile):
+        with pytest.raises(ValueError):
+            profiling.phase('parse')
+
+
+class TestReport:
+    """Test counters and JSON output."""
+
+    def test_counters(self, profile, tmp_path):
+        log = tmp_path / 'log.yaml'
+        log.write_text('entries: []\n', encoding='utf-8')
+        profiling.record_read(log)
+        profiling.record_read(log)
+        profiling.record_write(tmp_path / 'out.csv', 100)
+
+        report = profile.report()
+        assert (report['files_read'], report['bytes_read']) == (1, 24)
+        assert (report['files_written'], report['bytes_written']) == (1, 100)
+        assert set(report['phases']) == set(PHASES)
+
+    def test_emit_appends_json_line(self, profile, tmp_path, monkeypatch):
+        output = tmp_path / 'profile.jsonl'
+        monkeypatch.setenv('NUTRITION_PROFILE_OUTPUT', str(output))
+        profile.emit()
+        profile.emit()
+        lines = output.read_text(encoding='utf-8').splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[0])['script'] == 'test'
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scripts/search_food_bank.py
+
+Tests cover:
+- Ranking by name, id, aliases, venue and category
+- Prefix and typo-tolerant matching
+- Exact name/id matches ranking first
+- Persisted index reuse and rebuild after dish edits
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from helpers import write_dish
+from search_food_bank import default_search_path, load_search_index, tokenize
+
+
+HOME = {'venue': 'Home-Cooked'}
+
+
+@pytest.fixture
+def food_bank(tmp_path):
+    root = tmp_path / 'food-data-bank'
+    decimo = {'venue': 'Decimo London'}
+    write_dish(root, 'venues/decimo-london', 'Crab Empanada (Decimo London)', 'crab_empanada_decimo_v1',
+               source=decimo, category='side')
+    write_dish(root, 'venues/decimo-london', 'Patatas Bravas (Decimo London)', 'patatas_bravas_decimo_v1',
+               source=decimo, category='side')
+    write_dish(root, 'generic/home-cooked', 'Chicken Quinoa Bowl (Home)', 'chicken_quinoa_bowl_home_v1',
+               source=HOME, category='main')
+    write_dish(root, 'generic/home-cooked', 'Chicken Stir-Fry', 'chicken_stir_fry_home_v1',
+               source=HOME, category='main')
+    write_dish(root, 'packaged/londons-chocolate-company', 'Chocolate Bar (half bar, 22g)',
+               'pistachio_praline_bar_half_v1', source={'venue': "London's Chocolate Company"},
+               aliases=["London's Chocolate Pistachio Praline half bar"], category='ingredient')
+    write_dish(root, 'generic/ingredients', 'Pistachios, 30 g', 'pistachios_30g_v1',
+               source=HOME, category='ingredient')
+    write_dish(root, 'generic/ingredients', 'Crème Fraîche, 30 g', 'creme_fraiche_30g_v1',
+               source=HOME, category='ingredient')
+    (root / 'README.md').write_text("# Food bank\n", encoding='utf-8')
+    return root
+
+
+def ids(index, query, limit=10):
+    return [result.id for result in index.search(query, limit=limit)]
+
+
+class TestRanking:
+    """Test which dishes a query finds and in what order."""
+
+    def test_name_words(self, food_bank):
+        index = load_search_index(food_bank)
+        assert len(index) == 7
+        assert ids(index, 'chicken bowl')[0] == 'chicken_quinoa_bowl_home_v1'
+        assert set(ids(index, 'chicken')) == {'chicken_quinoa_bowl_home_v1', 'chicken_stir_fry_home_v1'}
+
+    def test_aliases_and_venue(self, food_bank):
+        index = load_search_index(food_bank)
+        assert ids(index, 'pistachio praline')[0] == 'pistachio_praline_bar_half_v1'
+        assert set(ids(index, 'decimo')) == {'crab_empanada_decimo_v1', 'patatas_bravas_decimo_v1'}
+
+    def test_prefix_and_typo(self, food_bank):
+        index = load_search_index(food_bank)
+        assert ids(index, 'empan')[0] == 'crab_empanada_decimo_v1'
+        assert ids(index, 'chiken stirfry')[0] == 'chicken_stir_fry_home_v1'
+        assert ids(index, 'patatas bravs')[0] == 'patatas_bravas_decimo_v1'
+
+    def test_accents_are_ignored(self, food_bank):
+        assert tokenize('Crème Fraîche') == ['creme', 'fraiche']
+        assert ids(load_search_index(food_bank), 'creme fraiche')[0] == 'creme_fraiche_30g_v1'
+
+    def test_exact_id_ranks_first(self, food_bank):
+        index = load_search_index(food_bank)
+        results = index.search('pistachios_30g_v1', limit=3)
+        assert results[0].id == 'pistachios_30g_v1'
+        assert results[0].folder == 'generic/ingredients'
+        assert results[0].score > 100
+
+    def test_no_match(self, food_bank):
+        index = load_search_index(food_bank)
+        assert index.search('xylophone') == []
+        assert index.search('') == []
+
+
+class TestPersistence:
+    """Test the on-disk search index."""
+
+    def test_index_is_written_and_reused(self, food_bank):
+        load_search_index(food_bank)
+        cache = default_search_path(food_bank)
+        assert cache.exists()
+        before = cache.stat().st_mtime_ns
+
+        assert ids(load_search_index(food_bank), 'decimo')
+        assert cache.stat().st_mtime_ns == before
+
+    def test_edited_dish_rebuilds_index(self, food_bank):
+        load_search_index(food_bank)
+        write_dish(food_bank, 'generic/home-cooked', 'Lentil Soup', 'lentil_soup_home_v1', source=HOME)
+
+        index = load_search_index(food_bank)
+        assert ids(index, 'lentil') == ['lentil_soup_home_v1']
+
+    def test_no_refresh_uses_stale_index(self, food_bank):
+        load_search_index(food_bank)
+        write_dish(food_bank, 'generic/home-cooked', 'Lentil Soup', 'lentil_soup_home_v1', source=HOME)
+        assert ids(load_search_index(food_bank, refresh=False), 'lentil') == []
+
+    def test_without_cache(self, food_bank):
+        index = load_search_index(food_bank, use_cache=False)
+        assert len(index) == 7
+        assert not default_search_path(food_bank).exists()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scripts/update_logs_from_food_bank.py
+
+Tests cover:
+- Batched rescaling (one computation per dish and scale factor)
+- Refreshing stale nutrition in place
+- Leaving files untouched when nothing changed
+- Restricting a run to logs that reference changed dishes
+"""
+
+import sys
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+import yaml
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from food_bank_index import FoodBankIndex
+from helpers import write_dish, write_log
+from update_logs_from_food_bank import (
+    ScaledNutritionCache,
+    build_scaled_nutrition,
+    process_file,
+    referencing_logs,
+)
+
+
+@pytest.fixture
+def food_bank(tmp_path):
+    root = tmp_path / 'food-data-bank'
+    write_dish(root, 'generic/ingredients', 'Oats', 'oats_v1',
+               portion={'est_weight_g': 40}, per_portion={'energy_kcal': 150, 'protein_g': 5})
+    return FoodBankIndex(root, use_cache=False)
+
+
+class TestScaledNutritionCache:
+    """Test the batched rescaler."""
+
+    def test_same_dish_and_factor_is_computed_once(self, food_bank):
+        scaler = ScaledNutritionCache(food_bank)
+        first = scaler.scaled('oats_v1', Decimal('2'))
+        second = scaler.scaled('oats_v1', Decimal('2.0'))
+        assert (scaler.misses, scaler.hits) == (1, 1)
+        assert first == second
+        assert first is not second
+
+    def test_matches_unbatched_scaling(self, food_bank):
+        scaler = ScaledNutritionCache(food_bank)
+        factor = scaler.factor('oats_v1', Decimal('60'), 'g')
+        entry = food_bank.get('oats_v1')
+        assert scaler.scaled('oats_v1', factor) == build_scaled_nutrition(
+            entry['per_portion'], {}, factor
+        )
+        assert scaler.scaled('oats_v1', factor)['energy_kcal'] == 225
+
+    def test_missing_dish_raises_every_time(self, food_bank):
+        scaler = ScaledNutritionCache(food_bank)
+        errors = []
+        for _ in range(2):
+            with pytest.raises(KeyError, match='missing_v1') as excinfo:
+                scaler.factor('missing_v1', Decimal('1'), 'portion')
+            errors.append(excinfo.value)
+        assert errors[0] is not errors[1]
+
+
+class TestProcessFile:
+    """Test process_file with a shared rescaler."""
+
+    def test_stale_items_are_refreshed(self, tmp_path, food_bank):
+        item = {'name': 'Oats', 'food_bank_id': 'oats_v1', 'quantity': 1, 'unit': 'portion',
+                'nutrition': {'energy_kcal': 100}}
+        log = write_log(tmp_path / 'logs', date(2025, 11, 1), [('08:00', [item, dict(item)])])
+
+        scaler = ScaledNutritionCache(food_bank)
+        changes, _ = process_file(log, food_bank, apply_changes=True, create_backup=False, scaler=scaler)
+        assert len(changes) == 2
+        assert scaler.misses == 1
+
+        text = log.read_text(encoding='utf-8')
+        assert '&id' not in text  # no YAML aliases from shared dicts
+        items = yaml.safe_load(text)['entries'][0]['items']
+        assert [i['nutrition']['energy_kcal'] for i in items] == [150, 150]
+
+    def test_unresolvable_items_do_not_rewrite_file(self, tmp_path, food_bank):
+        log = write_log(tmp_path / 'logs', date(2025, 11, 1), [('08:00', [
+            {'name': 'Mystery', 'food_bank_id': 'missing_v1', 'quantity': 1, 'unit': 'portion', 'nutrition': {}},
+        ])])
+        before = log.stat().st_mtime_ns
+
+        changes, _ = process_file(log, food_bank, apply_changes=True, create_backup=False)
+        assert changes[0].fields_changed[0].startswith('lookup_failed')
+        assert log.stat().st_mtime_ns == before
+        assert not log.with_suffix('.yaml.bak').exists()
+
+
+class TestChangedDish:
+    """Test --changed-dish log selection."""
+
+    def test_only_referencing_logs_are_kept(self, tmp_path):
+        logs = tmp_path / 'logs'
+        oats = write_log(logs, date(2025, 11, 1), [('08:00', [('Oats', {}, 'oats_v1')])])
+        other = write_log(logs, date(2025, 11, 2), [('08:00', [('Tea', {}, 'tea_v1')])])
+
+        assert referencing_logs([oats, other], logs, ['oats_v1']) == [oats]
+        assert referencing_logs([oats, other], logs, ['unknown_v1']) == []
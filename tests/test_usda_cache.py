@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scripts/usda/cache.py
+
+Tests cover:
+- Hits, misses and normalized search keys
+- TTL expiry and LRU eviction at the size cap
+- Persistence across cache instances
+- Corrupt, unusable or locked cache files degrading to cache misses
+- UsdaApiClient only calling the API on cache misses
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from usda.cache import ResponseCache, food_key, search_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = ResponseCache(tmp_path / 'responses.sqlite', ttl=60, max_entries=3, clock=clock)
+    yield cache
+    cache.close()
+
+
+class TestResponseCache:
+    """Test the disk-backed cache."""
+
+    def test_hit_and_miss(self, cache):
+        assert cache.get('food:1') is None
+        cache.put('food:1', {'fdcId': 1, 'foodNutrients': []})
+        assert cache.get('food:1') == {'fdcId': 1, 'foodNutrients': []}
+        assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 0, 'entries': 1}
+
+    def test_search_key_is_normalized(self):
+        assert search_key('  Chicken   BREAST ', 25, ['SR Legacy', 'Foundation']) == \
+            search_key('chicken breast', 25, ['Foundation', 'SR Legacy'])
+        assert search_key('chicken breast', 5, ['Foundation']) != search_key('chicken breast', 25, ['Foundation'])
+        assert food_key('171477') == food_key(171477)
+
+    def test_expired_entry_is_a_miss(self, cache, clock):
+        cache.put('food:1', {'fdcId': 1})
+        clock.now += 61
+        assert cache.get('food:1') is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_is_evicted(self, cache, clock):
+        for fdc_id in (1, 2, 3):
+            cache.put(food_key(fdc_id), {'fdcId': fdc_id})
+            clock.now += 1
+        cache.get(food_key(1))
+        clock.now += 1
+        cache.put(food_key(4), {'fdcId': 4})
+
+        assert cache.get(food_key(2)) is None
+        assert [cache.get(food_key(fdc_id)) is not None for fdc_id in (1, 3, 4)] == [True, True, True]
+        assert cache.evictions == 1
+
+    def test_persists_across_instances(self, cache, tmp_path, clock):
+        cache.put('search:x', [{'fdcId': 1}])
+        reopened = ResponseCache(tmp_path / 'responses.sqlite', ttl=60, clock=clock)
+        try:
+            assert reopened.get('search:x') == [{'fdcId': 1}]
+        finally:
+            reopened.close()
+
+    def test_invalid_size_cap(self, tmp_path):
+        with pytest.raises(ValueError, match='max_entries'):
+            ResponseCache(tmp_path / 'responses.sqlite', max_entries=0)
+
+
+class LockedConnection:
+    """Stands in for a connection whose database another process holds locked."""
+
+    in_transaction = False
+
+    def execute(self, *args):
+        raise sqlite3.OperationalError('database is locked')
+
+    def close(self):
+        pass
+
+
+class TestUnusableCache:
+    """Test that cache problems never escape to the caller."""
+
+    def test_corrupt_file_is_recreated(self, tmp_path, capsys):
+        path = tmp_path / 'responses.sqlite'
+        path.write_bytes(b'not a database' * 100)
+        cache = ResponseCache(path)
+        try:
+            assert 'Recreating' in capsys.readouterr().err
+            cache.put('food:1', {'fdcId': 1})
+            assert cache.get('food:1') == {'fdcId': 1}
+        finally:
+            cache.close()
+
+    def test_unusable_path_disables_cache(self, tmp_path, capsys):
+        path = tmp_path / 'responses.sqlite'
+        path.mkdir()
+        cache = ResponseCache(path)
+        assert 'cache disabled' in capsys.readouterr().err
+        cache.put('food:1', {'fdcId': 1})
+        assert cache.get('food:1') is None
+        assert cache.stats() == {'hits': 0, 'misses': 1, 'evictions': 0, 'entries': 0}
+        assert path.is_dir()
+        cache.close()
+
+    def test_locked_database_is_a_miss(self, cache, capsys):
+        cache.put('food:1', {'fdcId': 1})
+        cache.conn.close()
+        cache.conn = LockedConnection()
+
+        cache.put('food:2', {'fdcId': 2})
+        assert cache.get('food:1') is None
+        assert len(cache) == 0
+        assert cache.misses == 1
+        assert capsys.readouterr().err.count('database is locked') == 1
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class TestCachedClient:
+    """Test UsdaApiClient with a response cache."""
+
+    @pytest.fixture
+    def api_calls(self, monkeypatch):
+        pytest.importorskip('requests')
+        from usda import client as client_module
+
+        calls = []
+
+        def fake_get(session, url, params=None, **kwargs):
+            calls.append(url)
+            if url.endswith('/foods/search'):
+                return FakeResponse({'foods': [{'fdcId': 171477, 'description': 'Chicken breast',
+                                                'dataType': 'SR Legacy'}]})
+            return FakeResponse({'fdcId': 171477, 'foodNutrients': [
+                {'nutrient': {'id': 1003}, 'amount': 31.0},
+            ]})
+
+        monkeypatch.setattr(client_module.requests.Session, 'get', fake_get)
+        return calls
+
+    def test_repeated_lookup_uses_cache(self, cache, api_calls):
+        from usda.client import UsdaApiClient
+
+        client = UsdaApiClient(api_key='test', cache=cache)
+        first = client.quick_lookup('200g chicken breast')
+        assert len(api_calls) == 2
+
+        second = client.quick_lookup('200g  Chicken Breast')
+        assert len(api_calls) == 2
+        assert second == first
+        assert second['per_portion']['protein_g'] == 62.0
+        assert (cache.hits, cache.misses) == (2, 2)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scripts/usda/client.py against a local stub FDC server
+
+Tests cover:
+- Batch lookups matching one-at-a-time quick_lookup results
+- Details for many foods fetched with POST /foods, 20 IDs per request
+- Bounded concurrency for batch searches
+- Retrying 429 responses after Retry-After
+- Cached foods skipping the network
+- Parsing all 52 schema fields, unit conversions and batch parsing
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+pytest.importorskip('requests')
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from usda.cache import ResponseCache
+from usda.client import UsdaApiClient
+
+FOODS = {
+    171477: ('Chicken, broilers or fryers, breast, meat only, cooked, roasted', {1003: 31.0, 1008: 165.0}),
+    173944: ('Bananas, raw', {1003: 1.09, 1005: 22.84, 1008: 89.0, 1079: 2.6}),
+    171413: ('Oil, olive, salad or cooking', {1004: 100.0, 1008: 884.0}),
+}
+
+
+class StubFdc:
+    """Minimal FoodData Central API: /foods/search, /food/{id} and POST /foods"""
+
+    def __init__(self, search_delay=0.0):
+        self.search_delay = search_delay
+        self.requests = []  # (method, path)
+        self.throttle = 0  # answer this many requests with 429 first
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def food(self, fdc_id):
+        description, nutrients = FOODS[fdc_id]
+        return {
+            'fdcId': fdc_id,
+            'description': description,
+            'dataType': 'SR Legacy',
+            'foodNutrients': [{'nutrient': {'id': nid}, 'amount': amount} for nid, amount in nutrients.items()],
+        }
+
+    def search(self, query):
+        words = query.lower().split()
+        return [
+            {'fdcId': fdc_id, 'description': description, 'dataType': 'SR Legacy'}
+            for fdc_id, (description, _) in FOODS.items()
+            if any(word.rstrip('s') in description.lower() for word in words)
+        ]
+
+    def handle(self, method, path, query, body):
+        with self.lock:
+            self.requests.append((method, path))
+            if self.throttle:
+                self.throttle -= 1
+                return 429, {'error': 'OVER_RATE_LIMIT'}
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if method == 'GET' and path == '/foods/search':
+                time.sleep(self.search_delay)
+                return 200, {'foods': self.search(query['query'][0])}
+            if method == 'GET' and path.startswith('/food/'):
+                fdc_id = int(path.rsplit('/', 1)[1])
+                return (200, self.food(fdc_id)) if fdc_id in FOODS else (404, {})
+            if method == 'POST' and path == '/foods':
+                ids = body['fdcIds']
+                if len(ids) > 20:
+                    return 400, {'error': 'too many ids'}
+                return 200, [self.food(fdc_id) for fdc_id in ids if fdc_id in FOODS]
+            return 404, {}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def stub():
+    state = StubFdc()
+
+    class Handler(BaseHTTPRequestHandler):
+        def respond(self, method):
+            url = urlparse(self.path)
+            length = int(self.headers.get('Content-Length') or 0)
+            body = json.loads(self.rfile.read(length)) if length else None
+            status, data = state.handle(method, url.path, parse_qs(url.query), body)
+            payload = json.dumps(data).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            if status == 429:
+                self.send_header('Retry-After', '0')
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            self.respond('GET')
+
+        def do_POST(self):
+            self.respond('POST')
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True)
+    thread.start()
+    state.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(stub, **kwargs):
+    return UsdaApiClient(api_key='test', base_url=stub.url, backoff=0, **kwargs)
+
+
+QUERIES = ['200g chicken breast', '1 banana', '15g olive oil', 'durian', '100g roasted chicken']
+
+
+class TestLookupMany:
+    """Test batch lookups."""
+
+    def test_matches_quick_lookup(self, stub):
+        client = make_client(stub)
+        expected = [client.quick_lookup(query) for query in QUERIES]
+        assert client.lookup_many(QUERIES) == expected
+        assert expected[3] is None
+        assert expected[0]['per_portion']['protein_g'] == 62.0
+
+    def test_details_fetched_in_one_request(self, stub):
+        make_client(stub).lookup_many(QUERIES)
+        assert [method for method, path in stub.requests if path == '/foods'] == ['POST']
+        assert not any(path.startswith('/food/') for _, path in stub.requests)
+
+    def test_more_than_twenty_ids_are_chunked(self, stub):
+        details = make_client(stub).get_foods_details(list(FOODS) + list(range(1, 40)))
+        assert sorted(details) == sorted(FOODS)
+        assert [path for _, path in stub.requests] == ['/foods', '/foods', '/foods']
+
+    def test_concurrency_is_bounded(self, stub):
+        stub.search_delay = 0.05
+        make_client(stub, max_workers=3).lookup_many(QUERIES * 2)
+        assert 1 < stub.max_in_flight <= 3
+
+
+class TestRetries:
+    """Test rate-limit-aware retries."""
+
+    def test_429_is_retried(self, stub):
+        stub.throttle = 2
+        result = make_client(stub).quick_lookup('1 banana')
+        assert result['fdc_id'] == 173944
+        assert len(stub.requests) == 4
+
+    def test_gives_up_after_retries(self, stub, capsys):
+        stub.throttle = 10
+        assert make_client(stub, retries=2).search_foods('banana') == []
+        assert len(stub.requests) == 3
+        assert '429' in capsys.readouterr().err
+
+
+class TestCachedBatch:
+    """Test batch lookups with a response cache."""
+
+    def test_second_batch_skips_network(self, stub, tmp_path):
+        cache = ResponseCache(tmp_path / 'responses.sqlite')
+        try:
+            client = make_client(stub, cache=cache)
+            first = client.lookup_many(QUERIES)
+            requests_made = len(stub.requests)
+
+            assert client.lookup_many(QUERIES) == first
+            assert len(stub.requests) == requests_made
+        finally:
+            cache.close()
+
+
+def fdc_food(amounts):
+    return {'foodNutrients': [{'nutrient': {'id': nid}, 'amount': amount} for nid, amount in amounts.items()]}
+
+
+class TestParseNutrition:
+    """Test the nutrient vector and serving scaling."""
+
+    SALMON = fdc_food({1008: 208, 1003: 20.4, 1005: 0, 1079: 0, 1103: 24.0,
+                       1278: 0.862, 1272: 1.1, 1404: 0.107, 1094: 200.0, 1051: 64.9})
+
+    def test_all_fields(self):
+        client = UsdaApiClient(api_key='test')
+        nutrition = client.parse_nutrition(self.SALMON, serving_grams=150)
+        assert list(nutrition) == client.REQUIRED_FIELDS
+        assert len(nutrition) == 52
+        assert (nutrition['energy_kcal'], nutrition['selenium_ug']) == (312.0, 36.0)
+        assert nutrition['boron_mg'] == 0
+
+    def test_units_are_converted(self):
+        nutrition = UsdaApiClient(api_key='test').parse_nutrition(self.SALMON)
+        assert (nutrition['omega3_epa_mg'], nutrition['omega3_dha_mg']) == (862.0, 1100.0)
+        assert nutrition['omega3_ala_g'] == 0.11
+        assert nutrition['sulfur_g'] == 0.2
+
+    def test_carbs_available_is_derived(self):
+        nutrition = UsdaApiClient(api_key='test').parse_nutrition(
+            fdc_food({1005: 22.84, 1079: 2.6, 1018: 0.5}), serving_grams=50)
+        assert nutrition['carbs_available_g'] == 9.87
+
+    def test_batch_matches_single(self):
+        client = UsdaApiClient(api_key='test')
+        foods = [self.SALMON, fdc_food({1008: 89, 1162: 8.7})]
+        assert client.parse_nutrition_many(foods, [150, 120]) == [
+            client.parse_nutrition(self.SALMON, 150), client.parse_nutrition(foods[1], 120)]
+        assert client.parse_nutrition_many(foods) == [client.parse_nutrition(food) for food in foods]
+        with pytest.raises(ValueError, match='serving sizes'):
+            client.parse_nutrition_many(foods, [100])
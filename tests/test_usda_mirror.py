@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Unit tests for scripts/usda/mirror.py
+
+Tests cover:
+- Importing the JSON and CSV bulk downloads (plain, zipped and extracted)
+- Full-text search ranking, data type filtering and unit words
+- Food details in the API's response shape
+- Offline quick_lookup through UsdaApiClient without an API key
+"""
+
+import csv
+import json
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from usda.mirror import FdcMirror, fts_query, import_bulk
+
+NUTRIENTS = {
+    1003: ('Protein', 'G', '203'),
+    1004: ('Total lipid (fat)', 'G', '204'),
+    1005: ('Carbohydrate, by difference', 'G', '205'),
+    1008: ('Energy', 'KCAL', '208'),
+    1079: ('Fiber, total dietary', 'G', '291'),
+}
+
+# fdc_id, description, data_type, {nutrient_id: amount per 100 g}
+FOODS = [
+    (171477, 'Chicken, broilers or fryers, breast, meat only, cooked, roasted', 'SR Legacy',
+     {1003: 31.0, 1004: 3.57, 1005: 0.0, 1008: 165.0}),
+    (171116, 'Chicken, broilers or fryers, thigh, meat only, raw', 'SR Legacy',
+     {1003: 19.7, 1004: 3.9, 1008: 119.0}),
+    (2646170, 'Chicken, breast, boneless, skinless, raw', 'Foundation',
+     {1003: 22.5, 1004: 1.93, 1008: 120.0}),
+    (173944, 'Bananas, raw', 'SR Legacy',
+     {1003: 1.09, 1005: 22.84, 1008: 89.0, 1079: 2.6}),
+]
+
+
+def json_download(path, data_type):
+    key = 'FoundationFoods' if data_type == 'Foundation' else 'SRLegacyFoods'
+    foods = [
+        {
+            'fdcId': fdc_id,
+            'description': description,
+            'dataType': data_type,
+            'publicationDate': '4/1/2019',
+            'foodNutrients': [
+                {'nutrient': {'id': nid, 'number': NUTRIENTS[nid][2], 'name': NUTRIENTS[nid][0],
+                              'unitName': NUTRIENTS[nid][1]}, 'amount': amount}
+                for nid, amount in nutrients.items()
+            ] + [{'nutrient': {'id': 1051, 'name': 'Water', 'unitName': 'G'}}],  # no amount
+        }
+        for fdc_id, description, kind, nutrients in FOODS if kind == data_type
+    ]
+    path.write_text(json.dumps({key: foods}), encoding='utf-8')
+    return path
+
+
+def csv_download(directory):
+    directory.mkdir()
+    csv_types = {'Foundation': 'foundation_food', 'SR Legacy': 'sr_legacy_food'}
+
+    def write(name, header, rows):
+        with open(directory / name, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+
+    write('nutrient.csv', ['id', 'name', 'unit_name', 'nutrient_nbr', 'rank'],
+          [(nid, name, unit, number, '') for nid, (name, unit, number) in NUTRIENTS.items()])
+    write('food.csv', ['fdc_id', 'data_type', 'description', 'food_category_id', 'publication_date'],
+          [(fdc_id, csv_types[kind], description, '', '2019-04-01') for fdc_id, description, kind, _ in FOODS]
+          + [(9999, 'sub_sample_food', 'Chicken, breast, sample 3', '', '2019-04-01')])
+    write('food_nutrient.csv', ['id', 'fdc_id', 'nutrient_id', 'amount'],
+          [(i, fdc_id, nid, amount) for i, (fdc_id, nid, amount) in enumerate(
+              (fdc_id, nid, amount) for fdc_id, _, _, nutrients in FOODS for nid, amount in nutrients.items()
+          )] + [(0, 9999, 1003, 20.0)])
+    return directory
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    db = tmp_path / 'fdc.sqlite'
+    import_bulk([json_download(tmp_path / 'foundation.json', 'Foundation'),
+                 json_download(tmp_path / 'sr_legacy.json', 'SR Legacy')], db)
+    mirror = FdcMirror(db)
+    yield mirror
+    mirror.close()
+
+
+class TestImport:
+    """Test building the mirror from bulk downloads."""
+
+    def test_json_counts(self, tmp_path):
+        counts = import_bulk([json_download(tmp_path / 'foundation.json', 'Foundation'),
+                              json_download(tmp_path / 'sr_legacy.json', 'SR Legacy')], tmp_path / 'fdc.sqlite')
+        assert counts == {'foods': 4, 'nutrients': 5, 'amounts': 14}
+
+    def test_csv_matches_json(self, tmp_path, mirror):
+        db = tmp_path / 'csv.sqlite'
+        import_bulk([csv_download(tmp_path / 'csv')], db)
+        from_csv = FdcMirror(db)
+        try:
+            assert len(from_csv) == 4  # the sub-sample row is skipped
+            for fdc_id, _, _, _ in FOODS:
+                expected, actual = mirror.food(fdc_id), from_csv.food(fdc_id)
+                assert actual['foodNutrients'] == expected['foodNutrients']
+                assert (actual['description'], actual['dataType']) == (expected['description'], expected['dataType'])
+        finally:
+            from_csv.close()
+
+    def test_zipped_downloads(self, tmp_path):
+        json_zip = tmp_path / 'sr_legacy_json.zip'
+        with zipfile.ZipFile(json_zip, 'w') as archive:
+            archive.write(json_download(tmp_path / 'sr_legacy.json', 'SR Legacy'), 'sr_legacy.json')
+        csv_zip = tmp_path / 'foundation_csv.zip'
+        csv_dir = csv_download(tmp_path / 'csv')
+        with zipfile.ZipFile(csv_zip, 'w') as archive:
+            for path in csv_dir.iterdir():
+                archive.write(path, f'FoodData_Central_csv/{path.name}')
+
+        assert import_bulk([json_zip], tmp_path / 'a.sqlite')['foods'] == 3
+        assert import_bulk([csv_zip], tmp_path / 'b.sqlite')['foods'] == 4
+
+    def test_reimport_replaces_database(self, tmp_path):
+        db = tmp_path / 'fdc.sqlite'
+        import_bulk([json_download(tmp_path / 'sr_legacy.json', 'SR Legacy')], db)
+        import_bulk([json_download(tmp_path / 'foundation.json', 'Foundation')], db)
+        mirror = FdcMirror(db)
+        try:
+            assert len(mirror) == 1
+        finally:
+            mirror.close()
+        assert [p.name for p in tmp_path.iterdir() if p.suffix == '.tmp'] == []
+
+    def test_missing_database(self, tmp_path):
+        with pytest.raises(ValueError, match='mirror.py import'):
+            FdcMirror(tmp_path / 'missing.sqlite')
+
+
+class TestSearch:
+    """Test full-text search over descriptions."""
+
+    def test_query_drops_numbers_and_units(self):
+        assert fts_query('200g grilled chicken breast') == '"grilled" OR "chicken" OR "breast"'
+        assert fts_query('200 g') is None
+
+    def test_best_match_first(self, mirror):
+        results = mirror.search('chicken breast')
+        assert [food['fdcId'] for food in results][:2] == [2646170, 171477]
+        assert results[-1]['fdcId'] == 171116  # thigh matches "chicken" only
+
+    def test_stemming(self, mirror):
+        assert [food['fdcId'] for food in mirror.search('banana')] == [173944]
+
+    def test_data_type_filter_and_page_size(self, mirror):
+        assert [food['dataType'] for food in mirror.search('chicken', data_types=['Foundation'])] == ['Foundation']
+        assert len(mirror.search('chicken', page_size=1)) == 1
+
+    def test_no_match(self, mirror):
+        assert mirror.search('durian') == []
+        assert mirror.search('"; DROP TABLE food; --') == []
+
+
+class TestDetails:
+    """Test food details in the API's shape."""
+
+    def test_food(self, mirror):
+        food = mirror.food(173944)
+        assert food['description'] == 'Bananas, raw'
+        assert food['foodNutrients'][0] == {
+            'nutrient': {'id': 1003, 'number': '203', 'name': 'Protein', 'unitName': 'G'}, 'amount': 1.09,
+        }
+        assert len(food['foodNutrients']) == 4
+
+    def test_unknown_food(self, mirror):
+        assert mirror.food(1) is None
+
+
+class TestOfflineClient:
+    """Test UsdaApiClient served from the mirror."""
+
+    def test_quick_lookup_without_api_key(self, mirror, monkeypatch):
+        pytest.importorskip('requests')
+        from usda.client import UsdaApiClient
+
+        monkeypatch.delenv('USDA_API_KEY', raising=False)
+        client = UsdaApiClient(mirror=mirror)
+        result = client.quick_lookup('200g roasted chicken breast')
+
+        assert (result['fdc_id'], result['serving_grams']) == (171477, 200.0)
+        assert result['per_portion']['protein_g'] == 62.0
+        assert result['per_portion']['energy_kcal'] == 330.0